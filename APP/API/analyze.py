@@ -4,12 +4,20 @@
 수정사항:
 - parse_document 호출 시 인자 개수 오류(2개->1개) 수정
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
-from typing import Optional
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
+from APP.config import settings
 from APP.schemas.analyze import AnalyzeRequest, AnalyzeResponse, ActionItem
 from APP.db.mock_db import mock_db
+from APP.utils.hash import generate_fast_text_hash
+from APP.utils.http_cache import is_not_modified
 
 # 서비스 import
 from APP.services.llm_service import is_available as llm_available, generate_json
@@ -19,7 +27,7 @@ from APP.services.prompts import (
     DocumentType
 )
 from APP.services.rag_service import get_rag_system
-from APP.services.chunker import SmartChunker, ChunkingConfig
+from APP.workers.rag_worker import enqueue_index_job
 
 # 파서 import
 from APP.services.document_parser import parse_document
@@ -28,24 +36,219 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# 청커 인스턴스
-_chunker = SmartChunker(ChunkingConfig(
-    chunk_size=800,
-    chunk_overlap=150,
-    preserve_tables=True
-))
+# LLM 호출 전용 스레드 풀 (이벤트 루프 블로킹 방지)
+_executor = ThreadPoolExecutor(
+    max_workers=settings.LLM_CONCURRENCY,
+    thread_name_prefix="analyze"
+)
+
+
+# 백그라운드 분석 재시도 (횟수, 기본 대기 초 - 시도마다 선형 증가)
+ANALYSIS_MAX_ATTEMPTS = 3
+ANALYSIS_RETRY_DELAY = 2.0
+
+# 문서 유형 감지 캐시: {(text_hash, filename): DocumentType}
+_DOC_TYPE_CACHE_SIZE = 4096
+_doc_type_cache: "OrderedDict[Tuple[str, str], DocumentType]" = OrderedDict()
+
+
+async def _run_blocking(func, *args):
+    """동기 함수를 스레드 풀에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, func, *args)
+
+
+async def _detect_document_type_cached(
+    text: str,
+    text_hash: str,
+    filename: str
+) -> DocumentType:
+    """
+    문서 유형 감지 (텍스트 해시 기준 LRU 캐시)
+    
+    같은 문서의 재분석 시 키워드 스캔을 건너뜀
+    """
+    key = (text_hash, filename)
+    doc_type = _doc_type_cache.get(key)
+    
+    if doc_type is not None:
+        _doc_type_cache.move_to_end(key)
+        return doc_type
+    
+    doc_type = await _run_blocking(detect_document_type, text, filename)
+    
+    _doc_type_cache[key] = doc_type
+    if len(_doc_type_cache) > _DOC_TYPE_CACHE_SIZE:
+        _doc_type_cache.popitem(last=False)
+    
+    return doc_type
+
+
+async def _ensure_extracted_text(document_id: str, document) -> str:
+    """
+    파싱된 텍스트 반환 (없으면 즉시 파싱 후 저장)
+    
+    Raises:
+        HTTPException: 파싱 실패
+    """
+    extracted_text = await asyncio.to_thread(mock_db.get_extracted_text, document_id)
+    if extracted_text:
+        return extracted_text
+    
+    logger.info(f"⚙️ 텍스트 미발견. 즉시 파싱 시작: {document.get('filename')}")
+    try:
+        # ⭐ [수정됨] 인자를 2개에서 1개(file_path)만 보내도록 수정
+        parsing_result = await parse_document(document["file_path"])
+        
+        extracted_text = parsing_result.get("text", "")
+        
+        if not extracted_text:
+            raise ValueError("문서에서 텍스트를 추출할 수 없습니다.")
+
+        # 추출된 텍스트는 디스크에 저장, DB에는 해시/메타데이터만
+        mock_db.set_extracted_text(document_id, extracted_text)
+        mock_db.update_document(
+            document_id, 
+            {
+                "text_hash": generate_fast_text_hash(extracted_text),
+                "page_count": parsing_result.get("pages", 1)
+            }
+        )
+        return extracted_text
+    except Exception as e:
+        logger.error(f"❌ 파싱 실패: {str(e)}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"문서 파싱 실패: {str(e)}"
+        )
+
+
+async def _run_analysis(
+    document_id: str,
+    document,
+    extracted_text: str,
+    force_refresh: bool = False
+) -> dict:
+    """
+    문서 유형 감지 → LLM 분석 → DB 저장 → RAG 인덱싱 큐잉
+    
+    동기 엔드포인트와 백그라운드 작업이 함께 사용합니다.
+    같은 텍스트로 다시 실행해도 결과를 덮어쓸 뿐이라 재시도에 안전합니다.
+    
+    Args:
+        force_refresh: True면 LLM 응답 캐시를 무시하고 새로 분석 (재분석용)
+    
+    Returns:
+        분석 결과 (AnalyzeResponse 필드)
+    """
+    filename = document.get("filename", "")
+    
+    # 텍스트 해시 (한 번 계산하면 DB에 저장해 재사용)
+    text_hash = document.get("text_hash")
+    if not text_hash:
+        text_hash = generate_fast_text_hash(extracted_text)
+        mock_db.update_document(document_id, {"text_hash": text_hash})
+    
+    logger.info(f"🤖 AI 분석 시작: {filename}")
+    
+    # 4. 문서 유형 감지
+    doc_type = await _detect_document_type_cached(extracted_text, text_hash, filename)
+    logger.info(f"📋 감지된 문서 유형: {doc_type.value}")
+    
+    # 5. 유형별 맞춤 프롬프트로 분석
+    prompt = await _run_blocking(get_analysis_prompt, extracted_text, doc_type, filename)
+    llm_result = await _run_blocking(partial(generate_json, prompt, force_refresh=force_refresh))
+    
+    if not llm_result:
+        raise ValueError("LLM 분석 결과가 비어있습니다")
+    
+    # 6. 분석 결과 구조화
+    analysis_result = {
+        "document_id": document_id,
+        "summary": llm_result.get("summary", "요약 생성 실패"),
+        "document_type": llm_result.get("document_type", doc_type.value),
+        "importance": llm_result.get("importance", "medium"),
+        "key_points": llm_result.get("key_points", []),
+        "actions": [
+            ActionItem(
+                action=action.get("action", ""),
+                deadline=action.get("deadline"),
+                amount=action.get("amount"),
+                method=action.get("method")
+            )
+            for action in llm_result.get("actions", [])
+        ]
+    }
+    
+    # 7. 추가 세부 정보 (문서 유형별)
+    extra_details = {}
+    for key in ["tax_details", "prescription_details", "contract_details", 
+                "notice_details", "insurance_details"]:
+        if key in llm_result:
+            extra_details[key] = llm_result[key]
+    
+    if extra_details:
+        analysis_result["details"] = extra_details
+    
+    # 8. DB에 분석 결과 저장
+    mock_db.update_document(
+        document_id,
+        {
+            "status": "analyzed",
+            "analysis_result": analysis_result,
+            "analysis_text_hash": text_hash,
+            "document_type": doc_type.value
+        }
+    )
+    
+    # 9. RAG 인덱싱은 워커 큐로 넘기고 바로 응답
+    await enqueue_index_job(document_id, extracted_text, doc_type.value)
+    
+    logger.info(f"✅ AI 분석 완료: {document_id}")
+    return analysis_result
+
+
+async def _analysis_job(document_id: str):
+    """
+    백그라운드 분석 작업 (실패 시 ANALYSIS_MAX_ATTEMPTS까지 재시도)
+    
+    상태 전이: analyzing → analyzed | analysis_failed
+    """
+    last_error: Optional[Exception] = None
+    
+    for attempt in range(1, ANALYSIS_MAX_ATTEMPTS + 1):
+        document = mock_db.get_document(document_id)
+        if not document:
+            logger.warning(f"⚠️ 분석 대기 중 문서 삭제됨: {document_id}")
+            return
+        
+        try:
+            extracted_text = await _ensure_extracted_text(document_id, document)
+            await _run_analysis(document_id, document, extracted_text)
+            return
+        except Exception as e:
+            last_error = e
+            logger.warning(f"⚠️ 백그라운드 분석 실패 ({attempt}/{ANALYSIS_MAX_ATTEMPTS}): {document_id} - {e}")
+            if attempt < ANALYSIS_MAX_ATTEMPTS:
+                await asyncio.sleep(ANALYSIS_RETRY_DELAY * attempt)
+    
+    logger.error(f"❌ 백그라운드 분석 최종 실패: {document_id}")
+    mock_db.update_document(
+        document_id,
+        {"status": "analysis_failed", "error": str(last_error)}
+    )
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_document(
-    request: AnalyzeRequest,
-    background_tasks: BackgroundTasks
-):
+async def analyze_document(request: AnalyzeRequest):
     """
     문서 분석 (AI 분석 + RAG 인덱싱)
     """
-    document_id = request.document_id
-    
+    return await _analyze_now(request.document_id)
+
+
+async def _analyze_now(document_id: str, force_refresh: bool = False) -> AnalyzeResponse:
+    """동기 분석 본체 (/analyze, /reanalyze 공용)"""
     # 1. 문서 존재 확인
     document = mock_db.get_document(document_id)
     
@@ -56,33 +259,7 @@ async def analyze_document(
         )
     
     # 2. 파싱된 텍스트 확인 및 자동 파싱
-    extracted_text = document.get("extracted_text")
-    
-    if not extracted_text:
-        logger.info(f"⚙️ 텍스트 미발견. 즉시 파싱 시작: {document.get('filename')}")
-        try:
-            # ⭐ [수정됨] 인자를 2개에서 1개(file_path)만 보내도록 수정
-            parsing_result = await parse_document(document["file_path"])
-            
-            extracted_text = parsing_result.get("text", "")
-            
-            if not extracted_text:
-                raise ValueError("문서에서 텍스트를 추출할 수 없습니다.")
-
-            # DB에 추출된 텍스트 저장
-            mock_db.update_document(
-                document_id, 
-                {
-                    "extracted_text": extracted_text,
-                    "page_count": parsing_result.get("pages", 1)
-                }
-            )
-        except Exception as e:
-            logger.error(f"❌ 파싱 실패: {str(e)}")
-            raise HTTPException(
-                status_code=500, 
-                detail=f"문서 파싱 실패: {str(e)}"
-            )
+    extracted_text = await _ensure_extracted_text(document_id, document)
     
     # 3. LLM 서비스 확인
     if not llm_available():
@@ -91,70 +268,10 @@ async def analyze_document(
             detail="AI 서비스를 사용할 수 없습니다. API 키를 확인해주세요."
         )
     
-    filename = document.get("filename", "")
-    
     try:
-        logger.info(f"🤖 AI 분석 시작: {filename}")
-        
-        # 4. 문서 유형 감지
-        doc_type = detect_document_type(extracted_text, filename)
-        logger.info(f"📋 감지된 문서 유형: {doc_type.value}")
-        
-        # 5. 유형별 맞춤 프롬프트로 분석
-        prompt = get_analysis_prompt(extracted_text, doc_type, filename)
-        llm_result = generate_json(prompt)
-        
-        if not llm_result:
-            raise ValueError("LLM 분석 결과가 비어있습니다")
-        
-        # 6. 분석 결과 구조화
-        analysis_result = {
-            "document_id": document_id,
-            "summary": llm_result.get("summary", "요약 생성 실패"),
-            "document_type": llm_result.get("document_type", doc_type.value),
-            "importance": llm_result.get("importance", "medium"),
-            "key_points": llm_result.get("key_points", []),
-            "actions": [
-                ActionItem(
-                    action=action.get("action", ""),
-                    deadline=action.get("deadline"),
-                    amount=action.get("amount"),
-                    method=action.get("method")
-                )
-                for action in llm_result.get("actions", [])
-            ]
-        }
-        
-        # 7. 추가 세부 정보 (문서 유형별)
-        extra_details = {}
-        for key in ["tax_details", "prescription_details", "contract_details", 
-                    "notice_details", "insurance_details"]:
-            if key in llm_result:
-                extra_details[key] = llm_result[key]
-        
-        if extra_details:
-            analysis_result["details"] = extra_details
-        
-        # 8. DB에 분석 결과 저장
-        mock_db.update_document(
-            document_id,
-            {
-                "status": "analyzed",
-                "analysis_result": analysis_result,
-                "document_type": doc_type.value
-            }
-        )
-        
-        # 9. 백그라운드에서 RAG 인덱싱
-        background_tasks.add_task(
-            _index_document_for_rag,
-            document_id,
-            extracted_text,
-            doc_type.value
+        analysis_result = await _run_analysis(
+            document_id, document, extracted_text, force_refresh=force_refresh
         )
-        
-        logger.info(f"✅ AI 분석 완료: {document_id}")
-        
         return AnalyzeResponse(**analysis_result)
         
     except ValueError as e:
@@ -179,45 +296,48 @@ async def analyze_document(
         )
 
 
-async def _index_document_for_rag(document_id: str, text: str, doc_type: str):
+@router.post("/analyze/background", status_code=202)
+async def analyze_document_background(
+    request: AnalyzeRequest,
+    background_tasks: BackgroundTasks
+):
     """
-    백그라운드 RAG 인덱싱
+    문서 분석 요청 (백그라운드)
+    
+    분석을 큐에 넣고 바로 202를 반환합니다.
+    진행 상황은 /status/{document_id} 폴링으로 확인합니다.
     """
-    try:
-        logger.info(f"📚 RAG 인덱싱 시작: {document_id}")
-        
-        rag = get_rag_system()
-        
-        if rag.has_document(document_id):
-            logger.info(f"⏭️ 이미 인덱싱됨: {document_id}")
-            return
-        
-        chunks = _chunker.chunk(text, document_id)
-        
-        chunk_count = rag.add_document(
-            document_id,
-            text,
-            metadata={"document_type": doc_type}
+    document_id = request.document_id
+    document = mock_db.get_document(document_id)
+    
+    if not document:
+        raise HTTPException(
+            status_code=404,
+            detail=f"문서를 찾을 수 없습니다: {document_id}"
         )
-        
-        mock_db.update_document(
-            document_id,
-            {
-                "rag_indexed": True,
-                "chunk_count": chunk_count
-            }
+    
+    if not llm_available():
+        raise HTTPException(
+            status_code=503,
+            detail="AI 서비스를 사용할 수 없습니다. API 키를 확인해주세요."
         )
-        
-        logger.info(f"✅ RAG 인덱싱 완료: {chunk_count}개 청크")
-        
-    except Exception as e:
-        logger.error(f"❌ RAG 인덱싱 실패: {e}")
+    
+    # 이미 진행 중이면 중복 큐잉하지 않음
+    if document.get("status") != "analyzing":
+        mock_db.update_document(document_id, {"status": "analyzing", "error": None})
+        background_tasks.add_task(_analysis_job, document_id)
+        logger.info(f"📥 백그라운드 분석 등록: {document_id}")
+    
+    return {"document_id": document_id, "status": "analyzing"}
 
 
 @router.get("/status/{document_id}")
-async def get_analysis_status(document_id: str):
+async def get_analysis_status(document_id: str, request: Request):
     """
     분석 상태 조회
+    
+    폴링용: 문서가 바뀌지 않았으면 304 Not Modified (ETag / If-None-Match)
+    값이 모두 기본 타입이라 jsonable_encoder를 거치지 않고 바로 직렬화
     """
     document = mock_db.get_document(document_id)
     
@@ -230,22 +350,28 @@ async def get_analysis_status(document_id: str):
     rag = get_rag_system()
     rag_indexed = rag.has_document(document_id)
     
-    return {
-        "document_id": document_id,
-        "filename": document.get("filename"),
-        "status": document["status"],
-        "document_type": document.get("document_type"),
-        "has_analysis": document.get("analysis_result") is not None,
-        "has_text": document.get("extracted_text") is not None,
-        "rag_indexed": rag_indexed,
-        "chunk_count": document.get("chunk_count", 0)
-    }
+    etag = f'W/"{document_id}-{document.get("version", 0)}-{int(rag_indexed)}"'
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return ORJSONResponse(
+        {
+            "document_id": document_id,
+            "filename": document.get("filename"),
+            "status": document["status"],
+            "document_type": document.get("document_type"),
+            "has_analysis": document.get("analysis_result") is not None,
+            "has_text": document.get("text_path") is not None,
+            "rag_indexed": rag_indexed,
+            "chunk_count": document.get("chunk_count", 0)
+        },
+        headers={"ETag": etag}
+    )
 
 
 @router.post("/reanalyze/{document_id}")
 async def reanalyze_document(
     document_id: str,
-    background_tasks: BackgroundTasks,
     force_type: Optional[str] = None
 ):
     """
@@ -259,21 +385,29 @@ async def reanalyze_document(
             detail=f"문서를 찾을 수 없습니다: {document_id}"
         )
     
-    extracted_text = document.get("extracted_text")
-    
-    if not extracted_text:
+    if not document.get("text_len"):
         raise HTTPException(
             status_code=400,
             detail="문서 텍스트가 없습니다."
         )
     
+    # 분석 당시와 텍스트가 같으면 LLM 재호출/재인덱싱 생략
+    if (
+        force_type is None
+        and document.get("analysis_result")
+        and document.get("text_hash")
+        and document.get("text_hash") == document.get("analysis_text_hash")
+    ):
+        logger.info(f"⏭️ 텍스트 변경 없음, 기존 분석 결과 반환: {document_id}")
+        return AnalyzeResponse(**document["analysis_result"])
+    
     mock_db.update_document(document_id, {"status": "reanalyzing"})
     
     rag = get_rag_system()
     rag.remove_document(document_id)
     
-    request = AnalyzeRequest(document_id=document_id)
-    return await analyze_document(request, background_tasks)
+    # 재분석은 캐시된 LLM 응답을 재사용하지 않음
+    return await _analyze_now(document_id, force_refresh=True)
 
 
 @router.get("/types")
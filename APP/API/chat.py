@@ -8,8 +8,11 @@
 - 대화 히스토리 관리
 """
 from fastapi import APIRouter, HTTPException
+import asyncio
 import logging
-from typing import Optional, List, Dict
+import time
+from collections import OrderedDict, deque
+from typing import Optional, List, Dict, Tuple
 
 from APP.schemas.chat import ChatRequest, ChatResponse  # ✅ 추가!
 from APP.db.mock_db import mock_db
@@ -20,8 +23,75 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# 대화 히스토리 저장 (메모리)
-_chat_history: Dict[str, List[Dict]] = {}
+# 텍스트 세탁 테이블 (한 번의 패스로 특수문자 제거/치환)
+_CLEAN_TABLE = str.maketrans({"\u200b": None, "\xa0": " "})
+
+# 문서당 최대 메시지 수 / 최대 보관 대화 수
+MAX_HISTORY_MESSAGES = 30
+MAX_CONVERSATIONS = 10000
+
+# 대화 히스토리 저장 (메모리, 오래된 대화부터 LRU 제거)
+_chat_history: "OrderedDict[str, deque]" = OrderedDict()
+
+# 전체 보관 메시지 수 (통계용, 추가/초과분 제거/LRU 제거/삭제 시 갱신)
+_total_messages = 0
+
+# 문서별 히스토리 잠금 (동시 채팅 시 순서 보장)
+_history_locks: Dict[str, asyncio.Lock] = {}
+
+# 통계 캐시 (대시보드 폴링 시 매번 전체 순회 방지)
+STATS_CACHE_TTL = 2.0
+_stats_cache: Optional[Tuple[float, Dict]] = None
+
+
+def _get_history(document_id: str) -> deque:
+    """문서별 히스토리 반환 (없으면 생성)"""
+    global _total_messages
+    history = _chat_history.get(document_id)
+    
+    if history is None:
+        history = deque(maxlen=MAX_HISTORY_MESSAGES)
+        _chat_history[document_id] = history
+        
+        if len(_chat_history) > MAX_CONVERSATIONS:
+            evicted_id, evicted = _chat_history.popitem(last=False)
+            _total_messages -= len(evicted)
+            _discard_history_lock(evicted_id)
+    else:
+        _chat_history.move_to_end(document_id)
+    
+    return history
+
+
+def _get_history_lock(document_id: str) -> asyncio.Lock:
+    """문서별 히스토리 잠금 반환"""
+    lock = _history_locks.get(document_id)
+    if lock is None:
+        lock = _history_locks[document_id] = asyncio.Lock()
+    return lock
+
+
+def _append_history(document_id: str, history: deque, role: str, content: str) -> None:
+    """
+    히스토리에 메시지 추가 (가득 차면 deque가 가장 오래된 메시지를 밀어냄)
+    
+    질의 중에 삭제/LRU 제거된 히스토리는 이미 집계에서 빠졌으므로 세지 않음
+    """
+    global _total_messages
+    if len(history) < MAX_HISTORY_MESSAGES and _chat_history.get(document_id) is history:
+        _total_messages += 1
+    history.append({"role": role, "content": content})
+
+
+def _discard_history_lock(document_id: str) -> None:
+    """
+    히스토리 잠금 제거 (사용 중인 잠금은 유지)
+    
+    잡힌 잠금을 지우면 다음 요청이 새 잠금을 만들어 진행 중인 질의와 동시에 실행될 수 있음
+    """
+    lock = _history_locks.get(document_id)
+    if lock is not None and not lock.locked():
+        del _history_locks[document_id]
 
 
 @router.post("/chat", response_model=ChatResponse)
@@ -56,11 +126,11 @@ async def chat_with_document(request: ChatRequest):
     # 3. 인덱싱 확인 및 텍스트 세탁 (핵심 수정 부분! ✨)
     if not rag.has_document(document_id):
         print(f"📥 [Chat] 문서 인덱싱 시작: {document_id}")
-        extracted_text = document.get("extracted_text")
+        extracted_text = await asyncio.to_thread(mock_db.get_extracted_text, document_id)
         
         if extracted_text:
             # ✅ [Fix] 특수문자(\u200b 등) 제거하여 AI가 텍스트를 잘 읽도록 수정
-            cleaned_text = extracted_text.replace("\u200b", "").replace("\xa0", " ").strip()
+            cleaned_text = extracted_text.translate(_CLEAN_TABLE).strip()
             print(f"✨ [Chat] 텍스트 세탁 완료: {len(extracted_text)}자 -> {len(cleaned_text)}자")
             
             # 깨끗해진 텍스트로 저장
@@ -68,41 +138,35 @@ async def chat_with_document(request: ChatRequest):
         else:
             raise HTTPException(status_code=400, detail="문서 텍스트가 없습니다.")
     
-    # 4. 히스토리 가져오기
-    history = _chat_history.get(document_id, [])
-    
-    # 5. RAG 질의
-    try:
-        logger.info(f"💬 질의: {question[:50]}...")
-        
-        result = rag.query(
-            document_id=document_id,
-            question=question,
-            history=history
-        )
-        
-        answer = result["answer"]
-        confidence = result.get("confidence", 0.0)
+    async with _get_history_lock(document_id):
+        # 4. 히스토리 가져오기
+        history = _get_history(document_id)
         
-        logger.info(f"✅ 답변 생성 완료 (신뢰도: {confidence})")
+        # 5. RAG 질의
+        try:
+            logger.info(f"💬 질의: {question[:50]}...")
+            
+            # 임베딩/LLM 호출이 블로킹이라 스레드에서 실행 (잠금 대기 중인 다른 요청도 진행되도록)
+            result = await asyncio.to_thread(
+                rag.query,
+                document_id=document_id,
+                question=question,
+                history=list(history)
+            )
+            
+            answer = result["answer"]
+            confidence = result.get("confidence", 0.0)
+            
+            logger.info(f"✅ 답변 생성 완료 (신뢰도: {confidence})")
+            
+        except Exception as e:
+            # 스택 트레이스는 로깅 핸들러를 통해 출력
+            logger.exception(f"❌ 질의 실패: {e}")
+            raise HTTPException(status_code=500, detail=f"답변 생성 실패: {str(e)}")
         
-    except Exception as e:
-        logger.error(f"❌ 질의 실패: {e}")
-        # 디버깅을 위해 상세 에러 출력
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"답변 생성 실패: {str(e)}")
-    
-    # 6. 히스토리 업데이트
-    if document_id not in _chat_history:
-        _chat_history[document_id] = []
-    
-    _chat_history[document_id].append({"role": "user", "content": question})
-    _chat_history[document_id].append({"role": "assistant", "content": answer})
-    
-    # 최대 30개 메시지 유지
-    if len(_chat_history[document_id]) > 30:
-        _chat_history[document_id] = _chat_history[document_id][-30:]
+        # 6. 히스토리 업데이트 (최대 30개 메시지 유지 - 초과분은 deque가 자동 제거)
+        _append_history(document_id, history, "user", question)
+        _append_history(document_id, history, "assistant", answer)
     
     # 7. 응답
     return ChatResponse(
@@ -133,29 +197,29 @@ async def chat_with_document_extended(request: ChatRequest):
     
     # 인덱싱 확인
     if not rag.has_document(document_id):
-        extracted_text = document.get("extracted_text")
+        extracted_text = await asyncio.to_thread(mock_db.get_extracted_text, document_id)
         if extracted_text:
             add_document(document_id, extracted_text)
     
-    history = _chat_history.get(document_id, [])
-    
-    result = rag.query(
-        document_id=document_id,
-        question=question,
-        history=history
-    )
-    
-    # 히스토리 업데이트
-    if document_id not in _chat_history:
-        _chat_history[document_id] = []
-    _chat_history[document_id].append({"role": "user", "content": question})
-    _chat_history[document_id].append({"role": "assistant", "content": result["answer"]})
+    async with _get_history_lock(document_id):
+        history = _get_history(document_id)
+        
+        result = await asyncio.to_thread(
+            rag.query,
+            document_id=document_id,
+            question=question,
+            history=list(history)
+        )
+        
+        # 히스토리 업데이트
+        _append_history(document_id, history, "user", question)
+        _append_history(document_id, history, "assistant", result["answer"])
     
     return {
         "answer": result["answer"],
         "confidence": result["confidence"],
         "sources": result.get("sources", []),
-        "history_length": len(_chat_history.get(document_id, []))
+        "history_length": len(history)
     }
 
 
@@ -166,7 +230,7 @@ async def get_chat_history(document_id: str, limit: int = 20):
     if not document:
         raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
     
-    history = _chat_history.get(document_id, [])
+    history = list(_chat_history.get(document_id, ()))
     
     return {
         "document_id": document_id,
@@ -178,30 +242,44 @@ async def get_chat_history(document_id: str, limit: int = 20):
 @router.delete("/chat/history/{document_id}")
 async def clear_chat_history(document_id: str):
     """대화 히스토리 삭제"""
-    if document_id in _chat_history:
-        del _chat_history[document_id]
+    global _total_messages
+    _discard_history_lock(document_id)
+    history = _chat_history.pop(document_id, None)
+    if history is not None:
+        _total_messages -= len(history)
         logger.info(f"🗑️ 히스토리 삭제: {document_id}")
     
     return {"message": "대화 히스토리가 삭제되었습니다.", "document_id": document_id}
 
 
-@router.get("/chat/stats")
-async def get_chat_stats():
-    """채팅 통계"""
+def _compute_chat_stats() -> Dict:
+    """채팅/RAG 통계 집계"""
     rag = get_rag_system()
     rag_stats = rag.get_stats()
     
-    total_messages = sum(len(h) for h in _chat_history.values())
-    
     return {
         "rag": rag_stats,
         "chat": {
             "active_conversations": len(_chat_history),
-            "total_messages": total_messages
+            "total_messages": _total_messages
         }
     }
 
 
+@router.get("/chat/stats")
+async def get_chat_stats():
+    """채팅 통계 (STATS_CACHE_TTL초 동안 캐시)"""
+    global _stats_cache
+    
+    now = time.monotonic()
+    if _stats_cache is not None and now - _stats_cache[0] < STATS_CACHE_TTL:
+        return _stats_cache[1]
+    
+    stats = _compute_chat_stats()
+    _stats_cache = (now, stats)
+    return stats
+
+
 @router.post("/chat/feedback")
 async def submit_chat_feedback(
     document_id: str,
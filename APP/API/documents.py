@@ -2,18 +2,41 @@
 문서 업로드/조회/삭제 API
 ⭐ 수정: 중복 방지 + 전체 삭제(초기화) 기능 추가
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
 from typing import List
+import asyncio
 import logging
+import uuid
 
 from APP.schemas.document import DocumentUploadResponse, DocumentResponse
 from APP.utils.file_handler import file_handler
 from APP.db.mock_db import mock_db
+from APP.utils.http_cache import is_not_modified
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 전체 삭제 시 동시에 처리할 최대 문서 수 (fd 고갈 방지)
+CLEAR_ALL_CONCURRENCY = 32
+
+# 목록 ETag용 부팅 식별자 (mock_db.version은 재시작마다 0부터 다시 세므로
+# 재시작 전 ETag와 우연히 같아져 오래된 목록에 304를 주는 일을 막음)
+_BOOT_ID = uuid.uuid4().hex[:12]
+
+
+def _trusted_response(model: BaseModel) -> Response:
+    """
+    DB에서 온(이미 검증된) 데이터로 만든 모델을 재검증 없이 JSON 응답으로 변환
+    
+    model_construct()로 만든 모델을 그대로 반환하면 FastAPI가 response_model로
+    다시 검증하므로, Response로 감싸 검증 파이프라인을 건너뜁니다.
+    (response_model은 OpenAPI 문서용으로 유지)
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
 # ---------------------------------------------------------
 # 1. 파일 업로드 (중복 방지 적용)
 # ---------------------------------------------------------
@@ -22,38 +45,40 @@ async def upload_document(
     file: UploadFile = File(..., description="업로드할 문서 파일")
 ):
     try:
-        # [중복 체크] 이미 같은 이름의 파일이 있는지 확인
-        existing_docs = mock_db.list_documents()
-        for doc in existing_docs:
-            if doc["filename"] == file.filename:
-                logger.info(f"♻️ 중복 파일 감지됨: {file.filename} (기존 ID 반환)")
-                # 새로 저장 안 하고 기존 정보 리턴
-                return DocumentUploadResponse(
-                    document_id=doc["document_id"],
-                    filename=doc["filename"],
-                    file_size=doc["file_size"],
-                    file_type=doc["file_type"],
-                    status=doc["status"],
-                    created_at=doc["created_at"],
-                    parsed_result=None
-                )
-
-        # 파일 저장
+        # 파일 저장 (저장하면서 내용 해시 계산)
         logger.info(f"📤 파일 업로드 시작: {file.filename}")
-        document_id, file_path, file_size = await file_handler.save_file(file)
+        document_id, file_path, file_size, sha256 = await file_handler.save_file(file)
         
         file_type = "." + file.filename.split(".")[-1].lower() if "." in file.filename else ""
         
+        # [중복 체크] 같은 내용의 파일이 이미 있는지 확인 (파일명이 달라도 재사용)
+        existing_id = mock_db.get_by_sha256(sha256)
+        doc = mock_db.get_document(existing_id) if existing_id else None
+        if doc:
+            logger.info(f"♻️ 중복 파일 감지됨: {file.filename} -> {doc['filename']} (기존 ID 반환)")
+            # 방금 저장한 사본은 삭제하고 기존 정보 리턴 (분석/RAG 인덱스 재사용)
+            file_handler.delete_file(document_id, file_type)
+            return _trusted_response(DocumentUploadResponse.model_construct(
+                document_id=doc["document_id"],
+                filename=doc["filename"],
+                file_size=doc["file_size"],
+                file_type=doc["file_type"],
+                status=doc["status"],
+                created_at=doc["created_at"],
+                parsed_result=None
+            ))
+        
         # DB 저장
         document = mock_db.create_document(
             document_id=document_id,
             filename=file.filename,
             file_path=file_path,
             file_size=file_size,
-            file_type=file_type
+            file_type=file_type,
+            sha256=sha256
         )
         
-        return DocumentUploadResponse(
+        return _trusted_response(DocumentUploadResponse.model_construct(
             document_id=document["document_id"],
             filename=document["filename"],
             file_size=document["file_size"],
@@ -61,7 +86,7 @@ async def upload_document(
             status="uploaded",
             created_at=document["created_at"],
             parsed_result=None
-        )
+        ))
         
     except Exception as e:
         logger.error(f"❌ 업로드 오류: {str(e)}")
@@ -72,9 +97,16 @@ async def upload_document(
 # 2. 문서 목록 조회
 # ---------------------------------------------------------
 @router.get("/", response_model=dict)
-async def list_documents():
+async def list_documents(request: Request):
+    # 목록이 바뀌지 않았으면 직렬화 없이 304 반환
+    etag = f'W/"documents-{_BOOT_ID}-{mock_db.version}"'
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    # 폴링이 잦은 엔드포인트: dict를 반환하면 jsonable_encoder가 전체 목록을
+    # 한 번 더 순회하므로 orjson으로 바로 직렬화 (datetime도 네이티브 처리)
     documents = mock_db.list_documents()
-    return {
+    return ORJSONResponse({
         "total": len(documents),
         "documents": [
             {
@@ -87,7 +119,7 @@ async def list_documents():
             }
             for doc in documents
         ]
-    }
+    }, headers={"ETag": etag})
 
 
 # ---------------------------------------------------------
@@ -99,17 +131,19 @@ async def get_document(document_id: str):
     if not document:
         raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
     
-    return DocumentResponse(
+    extracted_text = await asyncio.to_thread(mock_db.get_extracted_text, document_id)
+    
+    return _trusted_response(DocumentResponse.model_construct(
         document_id=document["document_id"],
         filename=document["filename"],
         file_size=document["file_size"],
         file_type=document["file_type"],
         status=document["status"],
         created_at=document["created_at"],
-        extracted_text=document.get("extracted_text"),
+        extracted_text=extracted_text,
         page_count=document.get("page_count"), 
         analysis_result=document.get("analysis_result")
-    )
+    ))
 
 
 # ---------------------------------------------------------
@@ -136,16 +170,24 @@ async def clear_all_documents():
     모든 문서와 DB 데이터를 강제로 삭제합니다.
     """
     documents = mock_db.list_documents()
-    count = 0
-    for doc in documents:
+    semaphore = asyncio.Semaphore(CLEAR_ALL_CONCURRENCY)
+    
+    def _delete_one(doc: dict):
         # 파일 삭제
         try:
             file_handler.delete_file(doc["document_id"], doc["file_type"])
-        except:
+        except Exception:
             pass
-        # DB 삭제
+        # DB 삭제 (추출 텍스트 파일 포함)
         mock_db.delete_document(doc["document_id"])
-        count += 1
-        
+    
+    async def _delete_limited(doc: dict):
+        async with semaphore:
+            await asyncio.to_thread(_delete_one, doc)
+    
+    # 디스크 I/O는 스레드 풀에서 병렬 처리 (이벤트 루프 블로킹 방지)
+    await asyncio.gather(*(_delete_limited(doc) for doc in documents))
+    count = len(documents)
+    
     logger.info(f"🧹 전체 초기화 완료: {count}개 삭제됨")
     return {"message": f"전체 초기화 완료. {count}개의 문서가 삭제되었습니다."}
\ No newline at end of file
@@ -1,5 +1,5 @@
 from typing import List
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
@@ -17,6 +17,18 @@ class Settings(BaseSettings):
     OPENAI_MODEL_PREMIUM: str = "gpt-4o"
 
     GOOGLE_API_KEY: str = ""
+    LLM_CONCURRENCY: int = 8
+    BLOCKING_IO_WORKERS: int = 8  # 기본 스레드 풀 크기 (파싱 등 asyncio.to_thread 작업)
+    EMBED_BATCH_SIZE: int = 64
+    RAG_WORKER_CONCURRENCY: int = 2
+    RAG_QUEUE_MAX_SIZE: int = 1000
+    RAG_QUANTIZE_EMBEDDINGS: bool = True
+    RAG_QUANTIZATION_MODE: str = "int8"  # int8(벡터별 대칭) | uint8(차원별 min/max)
+    RAG_BINARY_PREFILTER_MIN_CHUNKS: int = 1000  # 이 이상이면 부호 비트 해밍 거리로 후보를 먼저 추림
+    RAG_ANSWER_CACHE_SIZE: int = 256  # 문서별 유사 질문 답변 캐시 개수 (0이면 사용 안 함)
+    RAG_ANSWER_CACHE_THRESHOLD: float = 0.97  # 질의 임베딩 코사인 유사도가 이 이상이면 같은 질문으로 봄
+    RAG_ANSWER_CACHE_TTL: int = 3600
+    RAG_STORAGE_MAX_MB: int = 512  # 문서 벡터 저장소 메모리 상한 (넘으면 가장 오래 검색 안 된 문서부터 제거, 채팅 시 재인덱싱)
 
     UPLOAD_DIR: str = "./tmp/uploads"
     MAX_FILE_SIZE: int = 10485760
@@ -25,12 +37,21 @@ class Settings(BaseSettings):
     )
     
     CACHE_TTL: int = 86400
+    ANALYSIS_CACHE_SIZE: int = 512  # 내용 해시 기준 LLM 분석 결과 캐시 개수
+    PARSE_CACHE_DIR: str = "./cache/parser"  # 파싱 결과 디스크 캐시 (diskcache 설치 시)
+    PARSE_CACHE_TTL: int = 30 * 86400
+    LLM_CACHE_DIR: str = "./cache/llm"  # LLM 응답/임베딩 디스크 캐시 (diskcache 설치 시)
+    LLM_CACHE_TTL: int = 7 * 86400
+    REDIS_URL: str = ""  # 설정 시 Rate Limit 카운터를 Redis에 공유
     LOG_LEVEL: str = "INFO"
     SENTRY_DSN: str = ""
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # 런타임 변경 금지 (설정은 시작 시 한 번만 로드)
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        frozen=True
+    )
 
 
 settings = Settings()
@@ -3,21 +3,24 @@
 모든 예외를 일관된 JSON 형식으로 응답
 """
 import logging
+import time
 import traceback
+from functools import lru_cache
 from typing import Union
 
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from APP.config import settings
 from APP.core.exceptions import APIException
 
 
 logger = logging.getLogger(__name__)
 
 
-async def api_exception_handler(request: Request, exc: APIException) -> JSONResponse:
+async def api_exception_handler(request: Request, exc: APIException) -> ORJSONResponse:
     """
     커스텀 APIException 핸들러
     
@@ -31,7 +34,7 @@ async def api_exception_handler(request: Request, exc: APIException) -> JSONResp
         f"Detail: {exc.detail}"
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.error_code,
@@ -46,7 +49,7 @@ async def api_exception_handler(request: Request, exc: APIException) -> JSONResp
 async def http_exception_handler(
     request: Request,
     exc: StarletteHTTPException
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     일반 HTTPException 핸들러
     
@@ -59,7 +62,7 @@ async def http_exception_handler(
         f"Detail: {exc.detail}"
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": f"HTTP_{exc.status_code}",
@@ -74,7 +77,7 @@ async def http_exception_handler(
 async def validation_exception_handler(
     request: Request,
     exc: RequestValidationError
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Pydantic Validation 에러 핸들러
     
@@ -96,7 +99,7 @@ async def validation_exception_handler(
         f"Errors: {len(errors)}"
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": "VALIDATION_ERROR",
@@ -108,7 +111,7 @@ async def validation_exception_handler(
     )
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """
     예상치 못한 일반 예외 핸들러
     
@@ -122,9 +125,6 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         exc_info=True
     )
     
-    # 디버그 모드에서는 스택 트레이스 포함
-    from APP.config import settings
-    
     content = {
         "error": "INTERNAL_SERVER_ERROR",
         "detail": "서버 내부 오류가 발생했습니다.",
@@ -140,16 +140,23 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
             "traceback": traceback.format_exc()
         }
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=content
     )
 
 
+@lru_cache(maxsize=2)
+def _format_second(epoch_second: int) -> str:
+    """초 단위 ISO 문자열 (같은 초 안에서는 캐시 재사용)"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(epoch_second))
+
+
 def _get_timestamp() -> str:
     """현재 시간 ISO 형식으로 반환"""
-    from datetime import datetime
-    return datetime.now().isoformat()
+    now = time.time()
+    second = int(now)
+    return f"{_format_second(second)}.{int((now - second) * 1_000_000):06d}"
 
 
 def register_exception_handlers(app):
@@ -193,8 +200,6 @@ def init_sentry():
         from sentry_sdk.integrations.fastapi import FastApiIntegration
         from sentry_sdk.integrations.starlette import StarletteIntegration
         
-        from APP.config import settings
-        
         if settings.SENTRY_DSN:
             sentry_sdk.init(
                 dsn=settings.SENTRY_DSN,
@@ -4,80 +4,109 @@
 - RateLimitMiddleware: IP별 Rate Limiting (메모리 관리 개선)
 """
 import time
+import uuid
+import asyncio
 import logging
-from typing import Callable, Dict
-from collections import defaultdict
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from datetime import datetime
 
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from APP.core.exceptions import RateLimitExceededException
+from APP.utils.logger import request_id_var, ACCESS_LOGGER_NAME
 
 
 # 로거 설정
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+# ============================================
+# 모든 미들웨어는 순수 ASGI 클래스
+# (BaseHTTPMiddleware의 요청별 태스크/스트림 래핑 없이 send만 가로챔)
+# ============================================
+
+def _client_ip(scope: Scope) -> str:
+    """ASGI scope에서 클라이언트 IP 추출"""
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class LoggingMiddleware:
     """
     요청/응답 로깅 미들웨어
     
     기능:
-    - 요청 정보 로깅 (메서드, 경로, IP, User-Agent)
-    - 응답 시간 측정
-    - 응답 상태 코드 로깅
+    - 요청당 한 줄의 구조화 접근 로그 (access, JSON)
+      메서드, 경로, IP, User-Agent, 상태 코드, 처리 시간
+    - 응답 시간 측정 (X-Process-Time 헤더)
     - 에러 발생 시 상세 로깅
+    
+    헬스체크/문서/정적 경로는 DEBUG 레벨로 기록 (QUIET_PATHS, QUIET_PREFIXES)
+    DEBUG가 꺼져 있으면 해당 경로는 시간 측정도 하지 않고 그대로 통과
+    출력은 QueueListener 스레드에서 처리 (setup_queue_logging)
     """
     
-    async def dispatch(self, request: Request, call_next: Callable):
+    QUIET_PATHS = frozenset({"/", "/health", "/openapi.json"})
+    QUIET_PREFIXES = ("/docs", "/redoc", "/static")
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """요청 처리 및 로깅"""
-        # 요청 시작 시간
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # 클라이언트 정보
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
+        path = scope["path"]
+        quiet = path in self.QUIET_PATHS or path.startswith(self.QUIET_PREFIXES)
+        level = logging.DEBUG if quiet else logging.INFO
         
-        # 요청 정보 로깅
-        logger.info(
-            f"📥 REQUEST | "
-            f"Method: {request.method} | "
-            f"Path: {request.url.path} | "
-            f"IP: {client_ip} | "
-            f"User-Agent: {user_agent[:50]}"
-        )
+        # 조용한 경로 + 기록 안 함 → 측정/래핑 없이 바로 통과
+        if quiet and not access_logger.isEnabledFor(level):
+            await self.app(scope, receive, send)
+            return
+        
+        # 요청 시작 시간
+        start_time = time.perf_counter()
+        
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # 처리 시간 계산
+                process_time = time.perf_counter() - start_time
+                
+                # 접근 로그 (기록할 때만 필드 구성)
+                if access_logger.isEnabledFor(level):
+                    user_agent = Headers(scope=scope).get("user-agent", "unknown")
+                    access_logger.log(level, "request", extra={"fields": {
+                        "method": scope["method"],
+                        "path": path,
+                        "ip": _client_ip(scope),
+                        "user_agent": user_agent[:50],
+                        "status": message["status"],
+                        "duration_ms": round(process_time * 1000, 2),
+                    }})
+                
+                # 응답 헤더에 처리 시간 추가
+                MutableHeaders(scope=message)["X-Process-Time"] = str(process_time)
+            
+            await send(message)
         
         try:
             # 요청 처리
-            response = await call_next(request)
-            
-            # 처리 시간 계산
-            process_time = time.time() - start_time
-            
-            # 응답 정보 로깅
-            logger.info(
-                f"📤 RESPONSE | "
-                f"Status: {response.status_code} | "
-                f"Time: {process_time:.3f}s | "
-                f"Path: {request.url.path}"
-            )
-            
-            # 응답 헤더에 처리 시간 추가
-            response.headers["X-Process-Time"] = str(process_time)
-            
-            return response
+            await self.app(scope, receive, send_wrapper)
             
         except Exception as e:
             # 에러 발생 시 로깅
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
             
             logger.error(
-                f"❌ ERROR | "
-                f"Path: {request.url.path} | "
-                f"Error: {str(e)} | "
-                f"Time: {process_time:.3f}s",
+                "❌ ERROR | Path: %s | Error: %s | Time: %.3fs",
+                path, e, process_time,
                 exc_info=True
             )
             
@@ -85,74 +114,138 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             raise
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
-    Rate Limiting 미들웨어 (메모리 관리 개선)
+    Rate Limiting 미들웨어
     
     기능:
-    - IP별 요청 횟수 제한
-    - 시간 윈도우 기반 제한 (Sliding Window)
+    - IP별 요청 횟수 제한 (요청당 O(1), IP당 고정 크기 상태)
     - 특정 경로 제외 가능
     - 자동 메모리 정리 (메모리 누수 방지)
     
+    알고리즘 (strategy):
+    - "token_bucket": window_seconds 동안 max_requests개 토큰이 균등하게 충전
+      IP당 (남은 토큰, 마지막 충전 시각) 저장
+    - "sliding_window": 이전/현재 고정 윈도우 카운트를 경과 비율로 보간
+      IP당 (윈도우 번호, 이전 카운트, 현재 카운트) 저장
+    
     설정:
     - max_requests: 최대 요청 수 (기본: 100)
     - window_seconds: 시간 윈도우 (기본: 3600초 = 1시간)
-    - exclude_paths: Rate Limit 제외 경로
+    - exclude_paths: Rate Limit 제외 경로 ("/static/*"처럼 끝이 /*이면 접두사 매칭)
     - cleanup_interval: 메모리 정리 주기 (기본: 600초 = 10분)
+    - strategy: "token_bucket" (기본) 또는 "sliding_window"
+    - storage: "memory" (기본, 워커별 카운트) 또는 "redis" (워커 간 공유)
+    - redis_url: storage="redis"일 때 접속 주소
+    - max_tracked_ips: 메모리 저장소가 추적하는 최대 IP 수 (기본: 16384)
+      초과 시 가장 오래 사용되지 않은 IP부터 제거 → 해당 IP는 카운트가 초기화됨
+    
+    Redis 저장소는 고정 윈도우 카운터 (INCR + EXPIRE)로 동작하며,
+    redis 패키지가 없거나 접속 실패 시 요청을 막지 않음 (fail-open)
     """
     
+    STRATEGIES = ("token_bucket", "sliding_window")
+    
+    # 정리 중 이벤트 루프 양보 간격 (삭제 수)
+    CLEANUP_YIELD_EVERY = 1000
+    
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         max_requests: int = 100,
         window_seconds: int = 3600,
         exclude_paths: list = None,
-        cleanup_interval: int = 600  # 10분마다 정리
+        cleanup_interval: int = 600,  # 10분마다 정리
+        strategy: str = "token_bucket",
+        storage: str = "memory",
+        redis_url: str = "",
+        max_tracked_ips: int = 16384
     ):
-        super().__init__(app)
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"지원하지 않는 rate limit 방식: {strategy}")
+        if storage not in ("memory", "redis"):
+            raise ValueError(f"지원하지 않는 rate limit 저장소: {storage}")
+        
+        self.app = app
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.exclude_paths = exclude_paths or ["/health", "/docs", "/openapi.json"]
+        self.exclude_paths = frozenset(exclude_paths or ["/health", "/docs", "/openapi.json"])
+        
+        # 정확히 일치 → set 조회, "/*" 접두사 → startswith 한 번
+        self._exact_excludes = frozenset(p for p in self.exclude_paths if not p.endswith("/*"))
+        self._prefix_excludes = tuple(p[:-1] for p in self.exclude_paths if p.endswith("/*"))
         self.cleanup_interval = cleanup_interval
+        self.strategy = strategy
+        self.max_tracked_ips = max_tracked_ips
+        
+        # 초당 충전되는 토큰 수
+        self.refill_rate = max_requests / window_seconds
+        
+        # 매 요청 고정값인 헤더 문자열은 미리 생성
+        self._limit_header = str(max_requests)
+        self._window_header = str(window_seconds)
+        
+        # IP별 버킷: {ip: (tokens, last_refill)}  (time.monotonic 기준)
+        # (LRU 순서 유지, max_tracked_ips 초과 시 오래된 IP 제거)
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
         
-        # IP별 요청 기록: {ip: [timestamp1, timestamp2, ...]}
-        self.request_counts: Dict[str, list] = defaultdict(list)
+        # IP별 윈도우 카운터: {ip: (window_index, prev_count, curr_count)}
+        self.windows: "OrderedDict[str, Tuple[int, int, int]]" = OrderedDict()
+        
+        # Redis 클라이언트 (storage="redis"일 때만)
+        self._redis = self._create_redis(redis_url) if storage == "redis" else None
+        self.storage = "redis" if self._redis is not None else "memory"
+        
+        # 백그라운드 정리 태스크 (앱 lifespan 시작/종료에 맞춰 실행)
+        self._cleanup_task: Optional[asyncio.Task] = None
         
         # 마지막 정리 시간
-        self.last_cleanup = datetime.now()
+        self.last_cleanup = time.time()  # 통계 표시용 (epoch 초)
         
         # 총 정리 횟수 (통계용)
         self.cleanup_count = 0
         
         logger.info(
             f"⚙️ RateLimitMiddleware initialized: "
-            f"{max_requests} requests per {window_seconds}s, "
+            f"{max_requests} requests per {window_seconds}s "
+            f"({strategy}, {self.storage}), "
             f"cleanup every {cleanup_interval}s"
         )
     
-    async def dispatch(self, request: Request, call_next: Callable):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Rate Limit 체크 및 요청 처리"""
-        # 주기적 메모리 정리 (10분마다)
-        await self._periodic_cleanup()
+        if scope["type"] != "http":
+            if scope["type"] == "lifespan":
+                # 앱 시작/종료 이벤트를 엿봐서 정리 태스크 시작/중지
+                receive = self._lifespan_receive(receive)
+            await self.app(scope, receive, send)
+            return
         
-        # 제외 경로는 Rate Limit 적용 안 함
-        if request.url.path in self.exclude_paths:
-            return await call_next(request)
+        # 제외 경로는 가장 먼저 확인 → 헬스체크 등은 래핑/IP 조회 없이 바로 통과
+        path = scope["path"]
+        if path in self._exact_excludes or (
+            self._prefix_excludes and path.startswith(self._prefix_excludes)
+        ):
+            await self.app(scope, receive, send)
+            return
         
         # 클라이언트 IP
-        client_ip = request.client.host if request.client else "unknown"
+        client_ip = _client_ip(scope)
+        
+        # Rate Limit 체크 (허용 시 토큰 1개 소비)
+        if self._redis is not None:
+            remaining = await self._consume_redis(client_ip)
+        else:
+            remaining = self._consume(client_ip)
         
-        # Rate Limit 체크
-        if not self._is_allowed(client_ip):
+        if remaining is None:
             logger.warning(
-                f"🚫 RATE LIMIT EXCEEDED | "
-                f"IP: {client_ip} | "
-                f"Path: {request.url.path}"
+                "🚫 RATE LIMIT EXCEEDED | IP: %s | Path: %s",
+                client_ip, path
             )
             
-            # Rate Limit 초과 응답
-            return JSONResponse(
+            # Rate Limit 초과 응답 (앱을 거치지 않고 바로 전송)
+            response = ORJSONResponse(
                 status_code=429,
                 content={
                     "error": "Rate Limit Exceeded",
@@ -160,91 +253,203 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "max_requests": self.max_requests,
                     "window_seconds": self.window_seconds
                 },
-                headers={"Retry-After": str(self.window_seconds)}
+                headers={"Retry-After": self._window_header}
             )
+            await response(scope, receive, send)
+            return
         
-        # 요청 기록
-        self._record_request(client_ip)
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # 남은 요청 횟수를 헤더에 추가
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = self._limit_header
+                headers["X-RateLimit-Remaining"] = str(remaining)
+                headers["X-RateLimit-Window"] = self._window_header
+            await send(message)
         
         # 요청 처리
-        response = await call_next(request)
+        await self.app(scope, receive, send_wrapper)
+    
+    def _consume(self, ip: str) -> Optional[int]:
+        """
+        요청 1회 소비
         
-        # 남은 요청 횟수를 헤더에 추가
-        remaining = self._get_remaining(client_ip)
-        response.headers["X-RateLimit-Limit"] = str(self.max_requests)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Window"] = str(self.window_seconds)
+        Returns:
+            남은 요청 횟수 (거부되면 None)
+        """
+        if self.strategy == "sliding_window":
+            return self._consume_window(ip)
+        return self._consume_bucket(ip)
+    
+    def _consume_bucket(self, ip: str) -> Optional[int]:
+        """토큰 충전 후 1개 소비"""
+        now = time.monotonic()
+        tokens, last = self.buckets.get(ip, (self.max_requests, now))
+        
+        # 경과 시간만큼 충전 (용량 초과 불가)
+        tokens = min(self.max_requests, tokens + (now - last) * self.refill_rate)
         
-        return response
+        # 거부 시에는 기록하지 않음 (저장된 상태로 다시 계산해도 결과 동일)
+        if tokens < 1:
+            return None
+        
+        tokens -= 1
+        self._store(self.buckets, ip, (tokens, now))
+        return int(tokens)
     
-    def _is_allowed(self, ip: str) -> bool:
-        """IP의 Rate Limit 허용 여부 확인"""
-        now = datetime.now()
-        cutoff_time = now - timedelta(seconds=self.window_seconds)
+    def _consume_window(self, ip: str) -> Optional[int]:
+        """
+        슬라이딩 윈도우 카운터 (이전 윈도우 가중 보간)
+        
+        추정치 = prev * (현재 윈도우의 남은 비율) + curr
+        """
+        now = time.time()
+        window = int(now // self.window_seconds)
+        start, prev, curr = self.windows.get(ip, (window, 0, 0))
+        
+        if start == window - 1:
+            prev, curr = curr, 0
+        elif start != window:
+            prev, curr = 0, 0
+        
+        weight = (self.window_seconds - (now % self.window_seconds)) / self.window_seconds
+        estimated = prev * weight + curr
         
-        # 오래된 요청 기록 제거 (Sliding Window)
-        self.request_counts[ip] = [
-            timestamp for timestamp in self.request_counts[ip]
-            if timestamp > cutoff_time
-        ]
+        # 거부 시에는 기록하지 않음 (저장된 상태로 다시 계산해도 결과 동일)
+        if estimated >= self.max_requests:
+            return None
         
-        # 현재 윈도우 내 요청 수 확인
-        return len(self.request_counts[ip]) < self.max_requests
+        self._store(self.windows, ip, (window, prev, curr + 1))
+        return max(0, int(self.max_requests - estimated - 1))
     
-    def _record_request(self, ip: str):
-        """요청 기록"""
-        now = datetime.now()
-        self.request_counts[ip].append(now)
+    def _store(self, table: OrderedDict, ip: str, value: tuple):
+        """상태 저장 + LRU 갱신, 용량 초과 시 가장 오래된 IP 제거"""
+        table[ip] = value
+        table.move_to_end(ip)
+        if len(table) > self.max_tracked_ips:
+            table.popitem(last=False)
     
-    def _get_remaining(self, ip: str) -> int:
-        """남은 요청 횟수 계산"""
-        now = datetime.now()
-        cutoff_time = now - timedelta(seconds=self.window_seconds)
+    @staticmethod
+    def _create_redis(redis_url: str):
+        """Redis 클라이언트 생성 (실패 시 None → 메모리 저장소 사용)"""
+        if not redis_url:
+            logger.warning("⚠️ redis_url이 없어 메모리 저장소를 사용합니다")
+            return None
         
-        # 현재 윈도우 내 요청 수
-        current_count = len([
-            timestamp for timestamp in self.request_counts[ip]
-            if timestamp > cutoff_time
-        ])
+        try:
+            import redis.asyncio as redis_asyncio
+            return redis_asyncio.from_url(redis_url)
+        except ImportError:
+            logger.warning("⚠️ redis not installed, 메모리 저장소를 사용합니다")
+        except Exception as e:
+            logger.error(f"❌ Redis 클라이언트 생성 실패: {e}")
+        return None
+    
+    async def _consume_redis(self, ip: str) -> Optional[int]:
+        """
+        Redis 고정 윈도우 카운터 (모든 워커가 같은 키 공유)
+        
+        키: ratelimit:{ip}:{window_index}, 윈도우 길이만큼 만료
+        """
+        window = int(time.time() // self.window_seconds)
+        key = f"ratelimit:{ip}:{window}"
+        
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.incr(key)
+                pipe.expire(key, self.window_seconds)
+                count, _ = await pipe.execute()
+        except Exception as e:
+            # 저장소 장애로 서비스 전체를 막지 않음
+            logger.warning("⚠️ Redis rate limit 확인 실패 (허용 처리): %s", e)
+            return self.max_requests
         
-        return max(0, self.max_requests - current_count)
+        if count > self.max_requests:
+            return None
+        return self.max_requests - count
+    
+    def _lifespan_receive(self, receive: Receive) -> Receive:
+        """lifespan 메시지를 가로채 정리 태스크를 관리하는 receive 래퍼"""
+        async def wrapped() -> Message:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._start_cleanup_task()
+            elif message["type"] == "lifespan.shutdown":
+                await self._stop_cleanup_task()
+            return message
+        return wrapped
+    
+    def _start_cleanup_task(self):
+        """정리 루프 시작 (Redis는 키 만료로 정리되므로 생략)"""
+        if self._redis is None and self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+    
+    async def _stop_cleanup_task(self):
+        """정리 루프 중지"""
+        if self._cleanup_task:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
+    
+    async def _cleanup_loop(self):
+        """cleanup_interval마다 정리 (요청 처리 경로에서는 정리 확인 안 함)"""
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            try:
+                await self._periodic_cleanup()
+            except Exception as e:
+                logger.error(f"❌ Rate Limit 정리 중 오류: {e}")
     
     async def _periodic_cleanup(self):
         """
-        주기적 메모리 정리 (메모리 누수 방지)
+        메모리 정리 (메모리 누수 방지, _cleanup_loop에서 주기적으로 호출)
         
-        - cleanup_interval 시간마다 실행
-        - 오래된 IP 기록 삭제
-        - 빈 리스트 제거
+        - 윈도우 이상 요청이 없던 IP(버킷이 가득 찬 상태)는 삭제
+        - 두 윈도우 이전의 카운터는 삭제
+        - CLEANUP_YIELD_EVERY개 삭제마다 이벤트 루프에 양보 (긴 정지 방지)
         """
-        now = datetime.now()
-        
-        # 정리 주기 확인
-        if (now - self.last_cleanup).total_seconds() < self.cleanup_interval:
-            return
+        now = time.monotonic()
         
         # 정리 시작
         logger.info("🧹 Rate Limit 메모리 정리 시작...")
         
-        old_count = len(self.request_counts)
-        cutoff_time = now - timedelta(seconds=self.window_seconds * 2)  # 윈도우의 2배
-        
-        # 오래된 기록 삭제
-        for ip in list(self.request_counts.keys()):
-            # 오래된 타임스탬프 제거
-            self.request_counts[ip] = [
-                ts for ts in self.request_counts[ip] if ts > cutoff_time
-            ]
-            
-            # 빈 리스트는 삭제
-            if not self.request_counts[ip]:
-                del self.request_counts[ip]
+        old_count = len(self.buckets) + len(self.windows)
+        
+        # LRU 순서 = 마지막 기록 시각 순서이므로 앞쪽부터 만료된 항목만 제거
+        # (전체를 훑어 새 dict를 만들지 않음)
+        
+        # (양보 후에도 매번 현재 맨 앞 항목을 다시 확인하므로 동시 갱신에 안전)
+        removed_so_far = 0
+        
+        # 충분히 오래 지나 다시 가득 찼을 버킷은 기본값과 같으므로 삭제
+        while self.buckets:
+            ip, (_, last) = next(iter(self.buckets.items()))
+            if now - last < self.window_seconds:
+                break
+            self.buckets.popitem(last=False)
+            removed_so_far += 1
+            if removed_so_far % self.CLEANUP_YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+        
+        # 이전 윈도우보다 오래된 카운터는 더 이상 영향이 없으므로 삭제
+        current_window = int(time.time() // self.window_seconds)
+        while self.windows:
+            ip, (window, _, _) = next(iter(self.windows.items()))
+            if window >= current_window - 1:
+                break
+            self.windows.popitem(last=False)
+            removed_so_far += 1
+            if removed_so_far % self.CLEANUP_YIELD_EVERY == 0:
+                await asyncio.sleep(0)
         
         # 정리 완료
-        new_count = len(self.request_counts)
+        new_count = len(self.buckets) + len(self.windows)
         removed = old_count - new_count
         
-        self.last_cleanup = now
+        self.last_cleanup = time.time()
         self.cleanup_count += 1
         
         logger.info(
@@ -260,63 +465,90 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         
         Returns:
             {
+                "strategy": str,
+                "storage": str,
                 "tracked_ips": int,
-                "total_requests": int,
                 "cleanup_count": int,
                 "last_cleanup": str
             }
         """
-        total_requests = sum(len(timestamps) for timestamps in self.request_counts.values())
-        
         return {
-            "tracked_ips": len(self.request_counts),
-            "total_requests": total_requests,
+            "strategy": self.strategy,
+            "storage": self.storage,
+            "tracked_ips": len(self.buckets) + len(self.windows),
             "cleanup_count": self.cleanup_count,
-            "last_cleanup": self.last_cleanup.isoformat()
+            "last_cleanup": datetime.fromtimestamp(self.last_cleanup).isoformat()
         }
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """
     요청 ID 추가 미들웨어 (선택사항)
     
     각 요청에 고유 ID를 부여하여 추적 가능하게 함
+    ID는 request_id_var(ContextVar)에도 설정 → 이후 모든 로그에 자동 포함
     """
     
-    async def dispatch(self, request: Request, call_next: Callable):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """요청 ID 생성 및 추가"""
-        import uuid
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # 요청 ID 생성 (이미 있으면 사용)
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        # 요청 ID 생성 (이미 있으면 사용, 새 ID는 대시 없는 32자 hex)
+        request_id = Headers(scope=scope).get("X-Request-ID") or uuid.uuid4().hex
         
-        # 요청에 ID 추가 (로깅에서 사용 가능)
-        request.state.request_id = request_id
+        # 요청에 ID 추가 (request.state.request_id로 조회 가능)
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_var.set(request_id)
         
-        # 요청 처리
-        response = await call_next(request)
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # 응답 헤더에 요청 ID 추가
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
         
-        # 응답 헤더에 요청 ID 추가
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
+        # 요청 처리
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     보안 헤더 추가 미들웨어 (선택사항)
     
     기본 보안 헤더를 응답에 추가
     """
     
-    async def dispatch(self, request: Request, call_next: Callable):
+    # 고정 헤더는 미리 인코딩해 두고 그대로 추가
+    SECURITY_HEADERS = [
+        (b"x-content-type-options", b"nosniff"),
+        (b"x-frame-options", b"DENY"),
+        (b"x-xss-protection", b"1; mode=block"),
+        (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    ]
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """보안 헤더 추가"""
-        response = await call_next(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # 보안 헤더 추가
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # 문자열 인코딩 없이 캐시된 bytes 쌍을 그대로 이어 붙임
+                headers = message.get("headers")
+                if not isinstance(headers, list):
+                    headers = message["headers"] = list(headers or ())
+                headers.extend(self.SECURITY_HEADERS)
+            await send(message)
         
-        return response
\ No newline at end of file
+        await self.app(scope, receive, send_wrapper)
@@ -2,16 +2,99 @@
 Mock 데이터베이스
 실제 DB가 없으므로 메모리에 데이터 저장
 """
-from typing import Dict, Optional
+import os
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
 from datetime import datetime
 
+from APP.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentRecord:
+    """
+    문서 레코드
+    
+    __slots__ 고정 필드로 문서당 dict(해시 테이블) 오버헤드 제거
+    기존 코드와 호환되도록 dict처럼 조회/수정 가능 (doc["status"], doc.get(...))
+    값을 설정하지 않은 필드는 "없는 키"로 취급 → get()의 기본값 반환
+    """
+    
+    FIELDS = (
+        "document_id", "filename", "file_path", "file_size", "file_type",
+        "sha256", "status", "created_at", "updated_at", "version",
+        "analysis_result", "analysis_text_hash", "document_type", "error",
+        "text_path", "text_len", "text_hash", "page_count",
+        "rag_indexed", "chunk_count",
+    )
+    _FIELD_SET = frozenset(FIELDS)
+    __slots__ = FIELDS + ("_extra",)
+    
+    def __init__(self, **fields):
+        self._extra: Optional[Dict[str, Any]] = None
+        self.update(fields)
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            if key in self._FIELD_SET:
+                return getattr(self, key)
+            if self._extra is not None:
+                return self._extra[key]
+        except (AttributeError, KeyError):
+            pass
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any):
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        else:
+            # 정의되지 않은 필드는 별도 dict에 (필요할 때만 생성)
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+    
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def update(self, updates: Dict[str, Any]):
+        for key, value in updates.items():
+            self[key] = value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """일반 dict로 변환 (디버깅/직렬화용)"""
+        data = {key: getattr(self, key) for key in self.FIELDS if hasattr(self, key)}
+        if self._extra:
+            data.update(self._extra)
+        return data
+
 
 class MockDatabase:
     """메모리 기반 Mock 데이터베이스"""
     
     def __init__(self):
-        # 문서 저장소: {document_id: document_data}
-        self.documents: Dict[str, dict] = {}
+        # 문서 저장소: {document_id: DocumentRecord}
+        self.documents: Dict[str, DocumentRecord] = {}
+        
+        # 파일명 인덱스: {filename: document_id} (중복 체크 O(1))
+        self._by_filename: Dict[str, str] = {}
+        
+        # 내용 해시 인덱스: {sha256: document_id} (같은 내용의 재업로드 감지)
+        self._by_sha256: Dict[str, str] = {}
+        
+        # 전체 변경 버전 (생성/수정/삭제 시 증가, 목록 ETag용)
+        self.version = 0
     
     def create_document(
         self,
@@ -19,32 +102,42 @@ class MockDatabase:
         filename: str,
         file_path: str,
         file_size: int,
-        file_type: str
-    ) -> dict:
+        file_type: str,
+        sha256: Optional[str] = None
+    ) -> DocumentRecord:
         """
         문서 생성
         
         Returns:
             생성된 문서 정보
         """
-        document = {
-            "document_id": document_id,
-            "filename": filename,
-            "file_path": file_path,
-            "file_size": file_size,
-            "file_type": file_type,
-            "status": "uploaded",
-            "created_at": datetime.now(),
-            "analysis_result": None,
-            "extracted_text": None
-        }
+        now = datetime.now()
+        document = DocumentRecord(
+            document_id=document_id,
+            filename=filename,
+            file_path=file_path,
+            file_size=file_size,
+            file_type=file_type,
+            sha256=sha256,
+            status="uploaded",
+            created_at=now,
+            updated_at=now,
+            version=1,
+            analysis_result=None,
+            text_path=None,
+            text_len=0
+        )
         
         self.documents[document_id] = document
-        print(f"📝 Mock DB: 문서 생성 - {document_id}")
+        self.version += 1
+        self._by_filename[filename] = document_id
+        if sha256:
+            self._by_sha256[sha256] = document_id
+        logger.debug("📝 Mock DB: 문서 생성 - %s", document_id)
         
         return document
     
-    def get_document(self, document_id: str) -> Optional[dict]:
+    def get_document(self, document_id: str) -> Optional[DocumentRecord]:
         """
         문서 조회
         
@@ -63,8 +156,15 @@ class MockDatabase:
         if document_id not in self.documents:
             return False
         
-        self.documents[document_id].update(updates)
-        print(f"📝 Mock DB: 문서 업데이트 - {document_id}")
+        document = self.documents[document_id]
+        document.update(updates)
+        
+        # 문서별 버전 증가 (상태 조회 ETag용)
+        document["version"] = document.get("version", 0) + 1
+        document["updated_at"] = datetime.now()
+        self.version += 1
+        
+        logger.debug("📝 Mock DB: 문서 업데이트 - %s", document_id)
         return True
     
     def delete_document(self, document_id: str) -> bool:
@@ -75,11 +175,95 @@ class MockDatabase:
             삭제 성공 여부
         """
         if document_id in self.documents:
-            del self.documents[document_id]
-            print(f"📝 Mock DB: 문서 삭제 - {document_id}")
+            document = self.documents.pop(document_id)
+            self.version += 1
+            self._remove_text_file(document)
+            
+            # 인덱스가 이 문서를 가리킬 때만 제거
+            if self._by_filename.get(document["filename"]) == document_id:
+                del self._by_filename[document["filename"]]
+            if document.get("sha256") and self._by_sha256.get(document["sha256"]) == document_id:
+                del self._by_sha256[document["sha256"]]
+            
+            logger.debug("📝 Mock DB: 문서 삭제 - %s", document_id)
             return True
         return False
     
+    def set_extracted_text(self, document_id: str, text: str) -> bool:
+        """
+        추출된 텍스트를 디스크에 저장 ({UPLOAD_DIR}/{document_id}.txt)
+        
+        큰 문자열을 메모리에 계속 들고 있지 않도록 경로와 길이만 보관
+        
+        Returns:
+            저장 성공 여부
+        """
+        if document_id not in self.documents:
+            return False
+        
+        text_path = Path(settings.UPLOAD_DIR) / f"{document_id}.txt"
+        text_path.parent.mkdir(parents=True, exist_ok=True)
+        text_path.write_text(text, encoding="utf-8")
+        
+        return self.update_document(
+            document_id,
+            {"text_path": str(text_path), "text_len": len(text)}
+        )
+    
+    def get_extracted_text(self, document_id: str) -> Optional[str]:
+        """
+        추출된 텍스트 조회 (디스크에서 읽음)
+        
+        블로킹 파일 I/O이므로 async 핸들러에서는 asyncio.to_thread로 호출하세요.
+        
+        Returns:
+            텍스트 or None (없거나 파일이 사라진 경우)
+        """
+        document = self.documents.get(document_id)
+        if not document or not document.get("text_path"):
+            return None
+        
+        try:
+            return Path(document["text_path"]).read_text(encoding="utf-8")
+        except OSError:
+            return None
+    
+    def _remove_text_file(self, document: DocumentRecord):
+        """문서의 텍스트 파일 삭제 (실패는 무시)"""
+        text_path = document.get("text_path")
+        if text_path:
+            try:
+                os.remove(text_path)
+            except OSError:
+                pass
+    
+    def get_by_filename(self, filename: str) -> Optional[str]:
+        """
+        파일명으로 문서 ID 조회
+        
+        Returns:
+            문서 ID or None
+        """
+        return self._by_filename.get(filename)
+    
+    def get_by_sha256(self, sha256: str) -> Optional[str]:
+        """
+        내용 해시(SHA-256)로 문서 ID 조회
+        
+        Returns:
+            문서 ID or None
+        """
+        return self._by_sha256.get(sha256)
+    
+    def list_ids(self) -> frozenset:
+        """
+        모든 문서 ID 스냅샷 (일괄 존재 확인용)
+        
+        Returns:
+            문서 ID 집합
+        """
+        return frozenset(self.documents)
+    
     def list_documents(self) -> list:
         """
         모든 문서 조회
@@ -3,13 +3,22 @@ FastAPI 애플리케이션 진입점 (Phase 4: 미들웨어 추가)
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import os
 import sys
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 # ===== 파일 자동 정리 =====
 from APP.utils.file_cleaner import start_file_cleaner, stop_file_cleaner, get_file_cleaner
+# ===== RAG 인덱싱 워커 =====
+from APP.workers.rag_worker import start_rag_worker, stop_rag_worker
+# ===== PDF OCR 렌더링 프로세스 풀 =====
+from APP.utils.pdf_render import shutdown_render_pool
+from APP.services.document_parser import warmup_ocr
 
 # 프로젝트 루트를 Python 경로에 추가
 ROOT_DIR = Path(__file__).parent.parent
@@ -28,12 +37,13 @@ from APP.core.middleware import (
     SecurityHeadersMiddleware,
 )
 from APP.core.error_handler import register_exception_handlers, init_sentry
+from APP.utils.logger import setup_queue_logging
 
 
-# ===== 로깅 설정 =====
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format='%(asctime)s | %(levelname)s | %(name)s | %(message)s',
+# ===== 로깅 설정 (출력은 백그라운드 스레드에서) =====
+_log_listener = setup_queue_logging(
+    level=settings.LOG_LEVEL,
+    fmt='%(asctime)s | %(levelname)s | %(request_id)s | %(name)s | %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
@@ -64,6 +74,11 @@ async def lifespan(app: FastAPI):
     if settings.SENTRY_DSN:
         init_sentry()
     
+    # ===== 기본 스레드 풀 (문서 파싱 등 asyncio.to_thread 작업) =====
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.BLOCKING_IO_WORKERS, thread_name_prefix="blocking")
+    )
+    
     # ===== 파일 자동 정리 시작 =====
     await start_file_cleaner(
         interval_seconds=600,  # 10분마다 정리
@@ -71,6 +86,14 @@ async def lifespan(app: FastAPI):
     )
     logger.info("✅ 파일 자동 정리 시작 (10분 주기, 1시간 TTL)")
     
+    # ===== RAG 인덱싱 워커 시작 =====
+    await start_rag_worker()
+    logger.info(f"✅ RAG 인덱싱 워커 시작 ({settings.RAG_WORKER_CONCURRENCY}개)")
+    
+    # ===== OCR 모델 워밍업 (백그라운드 스레드, 시작을 막지 않음) =====
+    threading.Thread(target=warmup_ocr, name="ocr-warmup", daemon=True).start()
+    logger.info("✅ OCR 워밍업 시작")
+    
     print("=" * 60)
     print(f"✅ {settings.PROJECT_NAME} 시작 완료!")
     print(f"📍 API 문서: http://localhost:8000/docs")
@@ -88,7 +111,17 @@ async def lifespan(app: FastAPI):
     await stop_file_cleaner()
     logger.info("✅ 파일 자동 정리 중지")
     
+    # ===== RAG 인덱싱 워커 중지 =====
+    await stop_rag_worker()
+    logger.info("✅ RAG 인덱싱 워커 중지")
+    
+    # ===== PDF 렌더링 프로세스 풀 종료 =====
+    shutdown_render_pool()
+    
     logger.info("✅ 종료 완료")
+    
+    # 남은 로그 출력 후 리스너 종료
+    _log_listener.stop()
 
 # ===== FastAPI 앱 생성 =====
 app = FastAPI(
@@ -100,6 +133,7 @@ app = FastAPI(
     redoc_url="/redoc",
     lifespan=lifespan,
     debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,  # 빠른 JSON 직렬화 (orjson)
 )
 
 
@@ -121,17 +155,16 @@ app.add_middleware(
 # 2. Security Headers
 app.add_middleware(SecurityHeadersMiddleware)
 
-# 3. Request ID
-app.add_middleware(RequestIDMiddleware)
-
-# 4. Logging (요청/응답 로깅)
+# 3. Logging (요청/응답 로깅)
 app.add_middleware(LoggingMiddleware)
 
-# 5. Rate Limiting (마지막 - 실제 요청 처리 직전)
+# 4. Rate Limiting
 app.add_middleware(
     RateLimitMiddleware,
     max_requests=100,          # IP당 100회
     window_seconds=3600,       # 1시간 윈도우
+    storage="redis" if settings.REDIS_URL else "memory",
+    redis_url=settings.REDIS_URL,
     exclude_paths=[            # Rate Limit 제외 경로
         "/health",
         "/docs",
@@ -141,6 +174,9 @@ app.add_middleware(
     ]
 )
 
+# 5. Request ID (가장 바깥 - 이후 모든 미들웨어/핸들러 로그에 요청 ID 포함)
+app.add_middleware(RequestIDMiddleware)
+
 logger.info("✅ 모든 미들웨어 등록 완료")
 
 
@@ -192,25 +228,28 @@ async def root():
     }
 
 
+_HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "service": settings.PROJECT_NAME,
+    "version": "1.0.0",
+    "phase": "Phase 4",
+    "middleware": {
+        "logging": True,
+        "rate_limiting": True,
+        "request_id": True,
+        "security_headers": True,
+        "error_handling": True
+    }
+}
+
+
 @app.get("/health")
 async def health_check():
     """
     헬스 체크 엔드포인트
-    서버 상태 확인용
+    서버 상태 확인용 (고정 응답이라 Response 직접 반환)
     """
-    return {
-        "status": "healthy",
-        "service": settings.PROJECT_NAME,
-        "version": "1.0.0",
-        "phase": "Phase 4",
-        "middleware": {
-            "logging": True,
-            "rate_limiting": True,
-            "request_id": True,
-            "security_headers": True,
-            "error_handling": True
-        }
-    }
+    return ORJSONResponse(_HEALTH_PAYLOAD)
 
 
 # ===== 개발 서버 실행 =====
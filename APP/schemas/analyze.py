@@ -6,22 +6,29 @@
 - RAG 인덱싱 상태
 - 분석 메타데이터
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 
 
+# 응답/세부 정보 모델 공통 설정 (불변, 모르는 필드는 무시)
+_FROZEN = ConfigDict(frozen=True, extra="ignore")
+
+
 class AnalyzeRequest(BaseModel):
     """분석 요청"""
     document_id: str = Field(..., description="분석할 문서 ID")
     force_type: Optional[str] = Field(None, description="강제 지정할 문서 유형")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "document_id": "abc-123-def",
                 "force_type": None
             }
         }
+    )
 
 
 class ActionItem(BaseModel):
@@ -31,8 +38,10 @@ class ActionItem(BaseModel):
     amount: Optional[int] = Field(None, description="금액")
     method: Optional[str] = Field(None, description="방법")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "action": "지방세입계좌로 납부하세요",
                 "deadline": "2025-10-20",
@@ -40,10 +49,13 @@ class ActionItem(BaseModel):
                 "method": "위택스 또는 은행"
             }
         }
+    )
 
 
 class TaxDetails(BaseModel):
     """세금 고지서 세부 정보"""
+    model_config = _FROZEN
+    
     tax_type: Optional[str] = Field(None, description="세금 종류")
     principal: Optional[int] = Field(None, description="원금")
     penalty: Optional[int] = Field(None, description="가산금")
@@ -52,6 +64,8 @@ class TaxDetails(BaseModel):
 
 class PrescriptionMedication(BaseModel):
     """처방 약품 정보"""
+    model_config = _FROZEN
+    
     name: str = Field(..., description="약품명")
     dosage: Optional[str] = Field(None, description="용량")
     frequency: Optional[str] = Field(None, description="복용 횟수")
@@ -60,6 +74,8 @@ class PrescriptionMedication(BaseModel):
 
 class PrescriptionDetails(BaseModel):
     """처방전 세부 정보"""
+    model_config = _FROZEN
+    
     hospital: Optional[str] = Field(None, description="처방 병원")
     doctor: Optional[str] = Field(None, description="처방 의사")
     medications: List[PrescriptionMedication] = Field(default_factory=list, description="처방 약품 목록")
@@ -68,6 +84,8 @@ class PrescriptionDetails(BaseModel):
 
 class ContractDetails(BaseModel):
     """계약서 세부 정보"""
+    model_config = _FROZEN
+    
     parties: List[str] = Field(default_factory=list, description="계약 당사자")
     subject: Optional[str] = Field(None, description="계약 대상")
     period: Optional[str] = Field(None, description="계약 기간")
@@ -77,6 +95,8 @@ class ContractDetails(BaseModel):
 
 class NoticeDetails(BaseModel):
     """통지서 세부 정보"""
+    model_config = _FROZEN
+    
     issuer: Optional[str] = Field(None, description="발송 기관")
     purpose: Optional[str] = Field(None, description="통지 목적")
     contact: Optional[str] = Field(None, description="연락처")
@@ -84,6 +104,8 @@ class NoticeDetails(BaseModel):
 
 class InsuranceDetails(BaseModel):
     """보험 서류 세부 정보"""
+    model_config = _FROZEN
+    
     type: Optional[str] = Field(None, description="보험 종류")
     coverage: Optional[str] = Field(None, description="보장 내용")
     premium: Optional[int] = Field(None, description="보험료")
@@ -92,6 +114,8 @@ class InsuranceDetails(BaseModel):
 
 class DocumentDetails(BaseModel):
     """문서 유형별 세부 정보 (통합)"""
+    model_config = _FROZEN
+    
     tax_details: Optional[TaxDetails] = None
     prescription_details: Optional[PrescriptionDetails] = None
     contract_details: Optional[ContractDetails] = None
@@ -113,8 +137,10 @@ class AnalyzeResponse(BaseModel):
     rag_indexed: Optional[bool] = Field(None, description="RAG 인덱싱 여부")
     chunk_count: Optional[int] = Field(None, description="청크 수")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "document_id": "abc-123-def",
                 "summary": "2025년 지방세 납부 고지서입니다. 3월 31일까지 250,000원을 납부해야 합니다.",
@@ -145,10 +171,13 @@ class AnalyzeResponse(BaseModel):
                 "chunk_count": 5
             }
         }
+    )
 
 
 class AnalysisStatusResponse(BaseModel):
     """분석 상태 응답"""
+    model_config = _FROZEN
+    
     document_id: str
     filename: Optional[str] = None
     status: str
@@ -1,7 +1,7 @@
 """
 문서 관련 스키마
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
@@ -16,8 +16,9 @@ class DocumentUploadResponse(BaseModel):
     created_at: datetime = Field(..., description="업로드 시간")
     parsed_result: Optional[dict] = Field(None, description="파싱 결과 (텍스트, 페이지 수 등)")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "document_id": "abc-123-def",
                 "filename": "세금고지서.pdf",
@@ -32,6 +33,7 @@ class DocumentUploadResponse(BaseModel):
                 }
             }
         }
+    )
 
 
 class DocumentResponse(BaseModel):
@@ -40,14 +42,15 @@ class DocumentResponse(BaseModel):
     filename: str
     file_size: int
     file_type: str
-    status: str
+    status: str = Field(..., description="상태 (uploaded → analyzing → analyzed | analysis_failed)")
     created_at: datetime
     analysis_result: Optional[dict] = None
     extracted_text: Optional[str] = Field(None, description="추출된 텍스트")
     page_count: Optional[int] = Field(None, description="페이지 수")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "document_id": "abc-123-def",
                 "filename": "세금고지서.pdf",
@@ -63,3 +66,4 @@ class DocumentResponse(BaseModel):
                 }
             }
         }
+    )
@@ -17,6 +17,7 @@ from APP.services.llm_service import (
     generate_json,
     generate_embedding,
     generate_embeddings,
+    embed_async,
     analyze_document as llm_analyze_document,
     chat_with_context,
 )
@@ -33,6 +34,7 @@ from APP.services.rag_service import (
 from APP.services.analysis_service import (
     analyze_document_with_llm,
     analyze_and_index,
+    analyze_and_index_async,
     extract_key_info,
 )
 
@@ -49,6 +51,7 @@ __all__ = [
     "generate_json",
     "generate_embedding",
     "generate_embeddings",
+    "embed_async",
     "llm_analyze_document",
     "chat_with_context",
     
@@ -61,6 +64,7 @@ __all__ = [
     # Analysis
     "analyze_document_with_llm",
     "analyze_and_index",
+    "analyze_and_index_async",
     "extract_key_info",
     
     # Parser
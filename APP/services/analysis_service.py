@@ -10,31 +10,80 @@
 - llm_service.py: LLM API 호출
 - rag_service.py: RAG 시스템 (채팅용)
 """
-import re
+import asyncio
+import copy
 import logging
-from typing import Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from APP.services.llm_service import (
     analyze_document as llm_analyze,
     is_available as llm_available
 )
+from APP.config import settings
 from APP.services.rag_service import add_document, get_rag_system
+from APP.utils.hash import generate_fast_text_hash
+from APP.utils.keyword_matcher import KeywordMatcher
+from APP.utils.regex_engine import compile_pattern
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================
+# LLM 분석 결과 캐시 (내용 해시 기준)
+# ============================================
+
+# {텍스트 해시: (저장 시각, 분석 결과)} - LRU 순서
+_analysis_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()  # 분석은 스레드풀에서 실행됨
+
+
+def _analysis_cache_key(text: str) -> str:
+    """공백 차이를 무시한 내용 해시 (같은 문서 재업로드/재분석 시 적중)"""
+    return generate_fast_text_hash(" ".join(text.split()))
+
+
+def _get_cached_analysis(key: str) -> Optional[Dict]:
+    """캐시 조회 (TTL 만료 시 제거, 호출자가 수정해도 안전하도록 복사본 반환)"""
+    with _analysis_cache_lock:
+        entry = _analysis_cache.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, result = entry
+        if time.monotonic() - stored_at > settings.CACHE_TTL:
+            del _analysis_cache[key]
+            return None
+        
+        _analysis_cache.move_to_end(key)
+    return copy.deepcopy(result)
+
+
+def _store_analysis(key: str, result: Dict) -> None:
+    """캐시 저장 (최대 개수 초과 시 가장 오래된 항목 제거)"""
+    with _analysis_cache_lock:
+        _analysis_cache[key] = (time.monotonic(), copy.deepcopy(result))
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > settings.ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+
 # ============================================
 # 메인 분석 함수
 # ============================================
 
-def analyze_document_with_llm(text: str, filename: str) -> Dict:
+def analyze_document_with_llm(text: str, filename: str, force_refresh: bool = False) -> Dict:
     """
     LLM을 사용한 문서 분석
     
     Args:
         text: 파싱된 문서 텍스트
         filename: 파일명
+        force_refresh: True면 분석 캐시와 LLM 응답 캐시를 모두 무시
         
     Returns:
         구조화된 분석 결과:
@@ -50,14 +99,24 @@ def analyze_document_with_llm(text: str, filename: str) -> Dict:
         logger.warning("⚠️ LLM 서비스 불가 - 기본 분석 사용")
         return _fallback_analysis(text, filename)
     
+    # 같은 내용을 최근에 분석했다면 LLM 호출 생략
+    cache_key = _analysis_cache_key(text)
+    cached = None if force_refresh else _get_cached_analysis(cache_key)
+    if cached is not None:
+        logger.info(f"♻️ 분석 캐시 적중: {filename}")
+        return cached
+    
     try:
         # LLM 분석 실행
-        result = llm_analyze(text, filename)
+        result = llm_analyze(text, filename, force_refresh=force_refresh)
         
         # 정규식으로 추가 정보 보강
         extracted = extract_key_info(text)
         result["extracted_entities"] = extracted
         
+        # 성공한 LLM 결과만 캐시 (폴백 결과는 다음 요청에서 재시도)
+        _store_analysis(cache_key, result)
+        
         logger.info(f"✅ 문서 분석 완료: {filename}")
         return result
         
@@ -66,12 +125,27 @@ def analyze_document_with_llm(text: str, filename: str) -> Dict:
         return _fallback_analysis(text, filename)
 
 
+# 분석과 동시에 돌릴 RAG 인덱싱 전용 스레드풀 (둘 다 외부 API 대기 위주)
+_index_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="analyze-index")
+
+
+def _index_for_rag(document_id: str, text: str) -> Dict:
+    """RAG 인덱싱 (실패해도 분석 결과는 반환되도록 예외를 결과로 변환)"""
+    try:
+        chunk_count = add_document(document_id, text)
+        logger.info(f"✅ RAG 인덱싱 완료: {chunk_count}개 청크")
+        return {"rag_indexed": True, "chunk_count": chunk_count}
+    except Exception as e:
+        logger.warning(f"⚠️ RAG 인덱싱 실패: {e}")
+        return {"rag_indexed": False, "chunk_count": 0}
+
+
 def analyze_and_index(document_id: str, text: str, filename: str) -> Dict:
     """
     문서 분석 + RAG 인덱싱
     
-    분석과 동시에 RAG 시스템에 문서를 추가하여
-    이후 채팅에서 사용할 수 있도록 합니다.
+    분석(LLM)과 RAG 인덱싱(임베딩)은 같은 텍스트만 필요하므로
+    동시에 실행합니다. 소요 시간: 합 → 둘 중 긴 쪽
     
     Args:
         document_id: 문서 ID
@@ -81,20 +155,27 @@ def analyze_and_index(document_id: str, text: str, filename: str) -> Dict:
     Returns:
         분석 결과 (+ chunk_count 포함)
     """
-    # 1. 문서 분석
+    # 1. RAG 인덱싱은 별도 스레드에서 시작
+    index_future = _index_executor.submit(_index_for_rag, document_id, text)
+    
+    # 2. 문서 분석은 현재 스레드에서
     result = analyze_document_with_llm(text, filename)
     
-    # 2. RAG 인덱싱 (비동기 가능)
-    try:
-        chunk_count = add_document(document_id, text)
-        result["rag_indexed"] = True
-        result["chunk_count"] = chunk_count
-        logger.info(f"✅ RAG 인덱싱 완료: {chunk_count}개 청크")
-    except Exception as e:
-        logger.warning(f"⚠️ RAG 인덱싱 실패: {e}")
-        result["rag_indexed"] = False
-        result["chunk_count"] = 0
+    result.update(index_future.result())
+    return result
+
+
+async def analyze_and_index_async(document_id: str, text: str, filename: str) -> Dict:
+    """
+    문서 분석 + RAG 인덱싱 (async 버전)
     
+    이벤트 루프를 막지 않도록 두 작업을 스레드에서 동시에 실행합니다.
+    """
+    result, index_info = await asyncio.gather(
+        asyncio.to_thread(analyze_document_with_llm, text, filename),
+        asyncio.to_thread(_index_for_rag, document_id, text),
+    )
+    result.update(index_info)
     return result
 
 
@@ -102,6 +183,23 @@ def analyze_and_index(document_id: str, text: str, filename: str) -> Dict:
 # 정규식 기반 정보 추출
 # ============================================
 
+# 날짜: 한글 형식(2025년 3월 15일) | 구분자 형식(2025.03.15, 2025-03-15) 한 번에 스캔
+_DATE_RE = compile_pattern(
+    r'(?P<y1>\d{4})년\s*(?P<m1>\d{1,2})월\s*(?P<d1>\d{1,2})일'
+    r'|(?P<y2>\d{4})[./-](?P<m2>\d{1,2})[./-](?P<d2>\d{1,2})'
+)
+
+# 금액: 1,000,000원 | 10000원
+_AMOUNT_RE = compile_pattern(r'(\d{1,3}(?:,\d{3})+|\d+)\s*원')
+
+# 전화번호 / 계좌번호 (서로 겹칠 수 있어 따로 스캔)
+_PHONE_RE = compile_pattern(r'(\d{2,3})-(\d{3,4})-(\d{4})')
+_ACCOUNT_RE = compile_pattern(r'(\d{3,4})-(\d{2,4})-(\d{4,6})')
+
+# 긴급 키워드 (세 번의 substring 검색 대신 한 번에 스캔)
+_URGENT_RE = compile_pattern(r'긴급|즉시|마감')
+
+
 def extract_key_info(text: str) -> Dict:
     """
     정규식으로 주요 정보 추출
@@ -117,93 +215,95 @@ def extract_key_info(text: str) -> Dict:
             "accounts": [...]
         }
     """
-    info = {
-        "dates": [],
-        "amounts": [],
-        "phone_numbers": [],
-        "accounts": []
-    }
+    # 중복 제거는 dict 키로 (set처럼 O(1)이면서 삽입 순서 유지)
+    # 각 패턴에 반드시 필요한 문자가 없으면 해당 정규식 스캔 자체를 생략
+    has_hyphen = '-' in text
+    
+    # 날짜 추출 (한글 형식을 앞에)
+    korean_dates: Dict[str, None] = {}
+    other_dates: Dict[str, None] = {}
+    has_date_marker = '년' in text or has_hyphen or '.' in text or '/' in text
+    for match in (_DATE_RE.finditer(text) if has_date_marker else ()):
+        if match.group("y1"):
+            year, month, day = match.group("y1", "m1", "d1")
+            target = korean_dates
+        else:
+            year, month, day = match.group("y2", "m2", "d2")
+            target = other_dates
+        target[f"{int(year):04d}-{int(month):02d}-{int(day):02d}"] = None
+    
+    # dict 합집합: 키 순서(한글 형식 우선)를 유지하며 O(n) 병합
+    dates = list(korean_dates | other_dates)
+    
+    # 금액 추출 (100원 이상만, 천 단위 구분 형식 우선 - 납부 금액은 amounts[0])
+    grouped_amounts: Dict[int, None] = {}
+    plain_amounts: Dict[int, None] = {}
+    for match in (_AMOUNT_RE.finditer(text) if '원' in text else ()):
+        raw = match.group(1)
+        amount = int(raw.replace(',', ''))
+        if amount >= 100:
+            (grouped_amounts if ',' in raw else plain_amounts)[amount] = None
+    amounts = grouped_amounts | plain_amounts
+    
+    # 전화번호 / 계좌번호는 '-' 구분자가 필수
+    if has_hyphen:
+        # 전화번호 추출
+        phone_numbers = list(dict.fromkeys(
+            f"{m[0]}-{m[1]}-{m[2]}" for m in _PHONE_RE.findall(text)
+        ))
+        
+        # 계좌번호 추출 (전화번호와 구분: 숫자 10자리 이상)
+        accounts = list(dict.fromkeys(
+            f"{m[0]}-{m[1]}-{m[2]}" for m in _ACCOUNT_RE.findall(text)
+            if len(m[0]) + len(m[1]) + len(m[2]) >= 10
+        ))
+    else:
+        phone_numbers = []
+        accounts = []
     
-    # 날짜 추출
-    date_patterns = [
-        r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일',  # 2025년 3월 15일
-        r'(\d{4})[./-](\d{1,2})[./-](\d{1,2})',     # 2025.03.15, 2025-03-15
-    ]
-    
-    for pattern in date_patterns:
-        matches = re.findall(pattern, text)
-        for match in matches:
-            try:
-                year, month, day = int(match[0]), int(match[1]), int(match[2])
-                date_str = f"{year:04d}-{month:02d}-{day:02d}"
-                if date_str not in info["dates"]:
-                    info["dates"].append(date_str)
-            except (ValueError, IndexError):
-                continue
-    
-    # 금액 추출
-    amount_patterns = [
-        r'(\d{1,3}(?:,\d{3})+)\s*원',  # 1,000,000원
-        r'(\d+)\s*원',                   # 10000원
-    ]
-    
-    for pattern in amount_patterns:
-        matches = re.findall(pattern, text)
-        for match in matches:
-            amount_str = match.replace(',', '')
-            if amount_str.isdigit():
-                amount = int(amount_str)
-                if amount not in info["amounts"] and amount >= 100:  # 100원 이상만
-                    info["amounts"].append(amount)
-    
-    # 전화번호 추출
-    phone_pattern = r'(\d{2,3})-(\d{3,4})-(\d{4})'
-    matches = re.findall(phone_pattern, text)
-    for match in matches:
-        phone = f"{match[0]}-{match[1]}-{match[2]}"
-        if phone not in info["phone_numbers"]:
-            info["phone_numbers"].append(phone)
-    
-    # 계좌번호 추출 (간단한 패턴)
-    account_pattern = r'(\d{3,4})-(\d{2,4})-(\d{4,6})'
-    matches = re.findall(account_pattern, text)
-    for match in matches:
-        account = f"{match[0]}-{match[1]}-{match[2]}"
-        # 전화번호와 구분 (자릿수로)
-        if len(account.replace('-', '')) >= 10 and account not in info["accounts"]:
-            info["accounts"].append(account)
-    
-    return info
-
-
-def extract_action_items(text: str) -> List[Dict]:
+    return {
+        "dates": dates,
+        "amounts": list(amounts),
+        "phone_numbers": phone_numbers,
+        "accounts": accounts
+    }
+
+
+# 납부/제출 관련 키워드 (한 번의 스캔으로 모든 유형 탐지)
+_ACTION_MATCHER = KeywordMatcher({
+    "납부": ["납부", "지불", "송금", "입금"],
+    "제출": ["제출", "신청", "접수", "등록"],
+    "방문": ["방문", "출석", "참석"],
+    "연락": ["연락", "문의", "전화"],
+})
+
+
+def extract_action_items(text: str, info: Optional[Dict] = None) -> List[Dict]:
     """
     행동 항목 추출 (정규식 기반)
     
     LLM 분석 실패 시 폴백으로 사용
+    
+    Args:
+        text: 문서 텍스트
+        info: extract_key_info(text) 결과 (이미 추출했다면 전달해 재스캔 방지)
     """
     actions = []
-    info = extract_key_info(text)
-    
-    # 납부/제출 관련 키워드 탐지
-    action_keywords = {
-        "납부": ["납부", "지불", "송금", "입금"],
-        "제출": ["제출", "신청", "접수", "등록"],
-        "방문": ["방문", "출석", "참석"],
-        "연락": ["연락", "문의", "전화"],
-    }
-    
-    for action_type, keywords in action_keywords.items():
-        for keyword in keywords:
-            if keyword in text:
-                action = {
-                    "action": f"{action_type} 필요",
-                    "deadline": info["dates"][0] if info["dates"] else None,
-                    "amount": info["amounts"][0] if info["amounts"] and action_type == "납부" else None,
-                    "method": None
-                }
-                actions.append(action)
-                break  # 한 유형당 하나만
+    if info is None:
+        info = extract_key_info(text)
+    
+    found = _ACTION_MATCHER.find_labels(text)
+    
+    # 한 유형당 하나만, 키워드 정의 순서대로
+    for action_type in _ACTION_MATCHER.labels:
+        if action_type in found:
+            action = {
+                "action": f"{action_type} 필요",
+                "deadline": info["dates"][0] if info["dates"] else None,
+                "amount": info["amounts"][0] if info["amounts"] and action_type == "납부" else None,
+                "method": None
+            }
+            actions.append(action)
     
     return actions
 
@@ -215,7 +315,7 @@ def extract_action_items(text: str) -> List[Dict]:
 def _fallback_analysis(text: str, filename: str) -> Dict:
     """LLM 없이 기본 분석"""
     info = extract_key_info(text)
-    actions = extract_action_items(text)
+    actions = extract_action_items(text, info=info)
     
     # 문서 유형 추측
     doc_type = _guess_document_type(filename, text)
@@ -229,7 +329,7 @@ def _fallback_analysis(text: str, filename: str) -> Dict:
     importance = "medium"
     if info["amounts"] and max(info["amounts"]) > 100000:
         importance = "high"
-    if any(keyword in text for keyword in ["긴급", "즉시", "마감"]):
+    elif _URGENT_RE.search(text):
         importance = "high"
     
     return {
@@ -246,25 +346,23 @@ def _fallback_analysis(text: str, filename: str) -> Dict:
     }
 
 
+# 문서 유형별 키워드 (정의 순서 = 우선순위)
+_DOC_TYPE_MATCHER = KeywordMatcher({
+    "세금고지서": ["세금", "납세", "과세", "지방세", "국세", "고지"],
+    "전자처방전": ["처방", "의약품", "조제", "약국", "복용"],
+    "통지서": ["통지", "안내", "알림", "공고"],
+    "계약서": ["계약", "약정", "합의", "동의"],
+    "증명서": ["증명", "확인서", "발급"],
+    "신청서": ["신청", "접수", "등록"],
+    "청구서": ["청구", "요금", "이용료"],
+})
+
+
 def _guess_document_type(filename: str, text: str = "") -> str:
     """파일명과 내용으로 문서 유형 추측"""
     combined = (filename + " " + text[:1000]).lower()
     
-    type_keywords = {
-        "세금고지서": ["세금", "납세", "과세", "지방세", "국세", "고지"],
-        "전자처방전": ["처방", "의약품", "조제", "약국", "복용"],
-        "통지서": ["통지", "안내", "알림", "공고"],
-        "계약서": ["계약", "약정", "합의", "동의"],
-        "증명서": ["증명", "확인서", "발급"],
-        "신청서": ["신청", "접수", "등록"],
-        "청구서": ["청구", "요금", "이용료"],
-    }
-    
-    for doc_type, keywords in type_keywords.items():
-        if any(kw in combined for kw in keywords):
-            return doc_type
-    
-    return "공공문서"
+    return _DOC_TYPE_MATCHER.first_label(combined) or "공공문서"
 
 
 # ============================================
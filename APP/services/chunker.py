@@ -10,12 +10,85 @@
 """
 import re
 import logging
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
+from APP.utils.regex_engine import compile_pattern
+
 logger = logging.getLogger(__name__)
 
+# 정규화용 패턴 (모듈 로드 시 1회 컴파일)
+_SPACES_RE = compile_pattern(r'[ \t]+')
+_MULTI_NEWLINE_RE = compile_pattern(r'\n{3,}')
+
+# 문장 종결 패턴 (한국어 + 영어, lookbehind라 표준 re 사용)
+_SENTENCE_ENDINGS_RE = re.compile(
+    r'(?<=[.!?。！？])\s+|'  # 마침표/물음표/느낌표 + 공백
+    r'(?<=다\.)\s+|'        # ~다. 형태
+    r'(?<=요\.)\s+|'        # ~요. 형태
+    r'(?<=음\.)\s+|'        # ~음. 형태
+    r'(?<=습니다\.)\s+'     # ~습니다. 형태
+)
+
+# 라인 패턴은 전체 텍스트에 MULTILINE으로 적용됨
+# 줄을 넘지 않도록 \s 대신 [ \t] 사용 (앞 공백은 분류기에서 허용)
+# 줄 끝 고정 패턴은 CRLF 텍스트의 '\r'도 공백으로 취급 (줄마다 strip()하던 것과 동일)
+
+# 제목 패턴 (줄 시작 고정)
+_TITLE_PATTERNS: Tuple[str, ...] = (
+    r'#{1,6}[ \t]+\S',                   # 마크다운 제목
+    r'[0-9]+\.[ \t]+\S',                 # 숫자. 제목
+    r'[가-힣]\.[ \t]+\S',                # 가. 나. 다. 형태
+    r'[一二三四五六七八九十]+\.[ \t]+\S',  # 한자 숫자
+    r'【.+】[ \t\r]*$',                  # 【제목】
+    r'\[.+\][ \t\r]*$',                  # [제목]
+    r'<.+>[ \t\r]*$',                    # <제목>
+    r'제[0-9]+조',                       # 제1조, 제2조
+    r'[0-9]+\)',                         # 1) 2) 형태
+)
+
+# 테이블 패턴 (줄 어디든)
+_TABLE_PATTERNS: Tuple[str, ...] = (
+    r'\|.+\|',                           # 마크다운 테이블
+    r'┌.*┐',                             # 박스 테이블 시작
+    r'─{3,}',                            # 가로선
+    r'\t.+\t',                           # 탭 구분 데이터
+)
+
+# 리스트 패턴 (줄 시작 고정)
+_LIST_PATTERNS: Tuple[str, ...] = (
+    r'[-•●○◆◇▶▷][ \t]+\S',              # 불릿 리스트
+    r'\d+[\.\)][ \t]+\S',                # 번호 리스트
+    r'[가-힣][\.\)][ \t]+\S',            # 가) 나) 형태
+)
+
+
+def _build_line_classifier():
+    """
+    라인 유형 분류기 생성
+    
+    모든 패턴을 named group 하나의 정규식으로 묶습니다.
+    alternation 순서(빈 줄 → 테이블 → 제목 → 리스트)가 곧 우선순위입니다.
+    """
+    def union(patterns):
+        return '|'.join(f'(?:{p})' for p in patterns)
+    
+    return compile_pattern(
+        r'(?m)^[ \t\r]*(?:'
+        r'(?P<empty>$)'
+        rf'|(?P<table>.*?(?:{union(_TABLE_PATTERNS)}))'
+        rf'|(?P<title>{union(_TITLE_PATTERNS)})'
+        rf'|(?P<list>{union(_LIST_PATTERNS)})'
+        r')'
+    )
+
+
+# 라인 유형 분류기 (모든 SmartChunker 인스턴스가 공유)
+_LINE_CLASSIFIER_RE = _build_line_classifier()
+
 
 class ChunkType(Enum):
     """청크 유형"""
@@ -26,9 +99,9 @@ class ChunkType(Enum):
     MIXED = "mixed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Chunk:
-    """청크 데이터 클래스"""
+    """청크 데이터 클래스 (slots: 문서당 수천 개 생성되므로 __dict__ 제거)"""
     text: str
     index: int
     chunk_type: ChunkType = ChunkType.PARAGRAPH
@@ -41,7 +114,65 @@ class Chunk:
         return len(self.text)
 
 
-@dataclass
+# ChunkBatch.types의 uint8 코드 ↔ ChunkType
+_CHUNK_TYPES: Tuple[ChunkType, ...] = tuple(ChunkType)
+_CHUNK_TYPE_CODES: Dict[ChunkType, int] = {t: i for i, t in enumerate(_CHUNK_TYPES)}
+
+
+@dataclass(slots=True)
+class ChunkBatch:
+    """
+    청크 묶음 (열 단위 표현)
+    
+    임베딩/저장 경로에서 청크 객체를 하나씩 훑지 않도록
+    텍스트와 위치/유형을 평행 배열로 보관합니다. i번째 원소가 인덱스 i 청크입니다.
+    """
+    texts: List[str]
+    starts: np.ndarray              # int32
+    ends: np.ndarray                # int32
+    types: np.ndarray               # uint8 (ChunkType 정의 순서)
+    metadata: List[Dict]
+    
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Chunk]) -> "ChunkBatch":
+        """청크 목록을 열 단위로 변환 (인덱스는 순서대로 다시 매김)"""
+        texts: List[str] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        types: List[int] = []
+        metadata: List[Dict] = []
+        
+        for chunk in chunks:
+            texts.append(chunk.text)
+            starts.append(chunk.start_char)
+            ends.append(chunk.end_char)
+            types.append(_CHUNK_TYPE_CODES[chunk.chunk_type])
+            metadata.append(chunk.metadata)
+        
+        return cls(
+            texts=texts,
+            starts=np.asarray(starts, dtype=np.int32),
+            ends=np.asarray(ends, dtype=np.int32),
+            types=np.asarray(types, dtype=np.uint8),
+            metadata=metadata
+        )
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def __getitem__(self, idx: int) -> Chunk:
+        """i번째 청크를 Chunk 객체로 복원 (검색 결과 등 필요할 때만)"""
+        return Chunk(
+            text=self.texts[idx],
+            index=int(idx),
+            chunk_type=_CHUNK_TYPES[self.types[idx]],
+            start_char=int(self.starts[idx]),
+            end_char=int(self.ends[idx]),
+            metadata=self.metadata[idx]
+        )
+
+
+@dataclass(slots=True)
 class ChunkingConfig:
     """청킹 설정"""
     chunk_size: int = 800           # 목표 청크 크기
@@ -62,47 +193,14 @@ class SmartChunker:
     Usage:
         chunker = SmartChunker()
         chunks = chunker.chunk(text)
+        
+        # 섹션 단위로 흘려보내며 소비 (전체 청크 리스트를 만들지 않음)
+        for chunk in chunker.iter_chunks(text):
+            ...
     """
     
     def __init__(self, config: ChunkingConfig = None):
         self.config = config or ChunkingConfig()
-        
-        # 문장 종결 패턴 (한국어 + 영어)
-        self.sentence_endings = re.compile(
-            r'(?<=[.!?。！？])\s+|'  # 마침표/물음표/느낌표 + 공백
-            r'(?<=다\.)\s+|'        # ~다. 형태
-            r'(?<=요\.)\s+|'        # ~요. 형태
-            r'(?<=음\.)\s+|'        # ~음. 형태
-            r'(?<=습니다\.)\s+'     # ~습니다. 형태
-        )
-        
-        # 제목 패턴
-        self.title_patterns = [
-            r'^#{1,6}\s+.+$',                    # 마크다운 제목
-            r'^[0-9]+\.\s+.+$',                  # 숫자. 제목
-            r'^[가-힣]\.\s+.+$',                 # 가. 나. 다. 형태
-            r'^[一二三四五六七八九十]+\.\s+.+$',  # 한자 숫자
-            r'^【.+】$',                         # 【제목】
-            r'^\[.+\]$',                         # [제목]
-            r'^<.+>$',                           # <제목>
-            r'^제[0-9]+조',                      # 제1조, 제2조
-            r'^[0-9]+\)',                        # 1) 2) 형태
-        ]
-        
-        # 테이블 패턴
-        self.table_patterns = [
-            r'\|.+\|',                           # 마크다운 테이블
-            r'┌.*┐',                             # 박스 테이블 시작
-            r'─{3,}',                            # 가로선
-            r'\t.+\t',                           # 탭 구분 데이터
-        ]
-        
-        # 리스트 패턴
-        self.list_patterns = [
-            r'^[-•●○◆◇▶▷]\s+',                  # 불릿 리스트
-            r'^\d+[\.\)]\s+',                    # 번호 리스트
-            r'^[가-힣][\.\)]\s+',                # 가) 나) 형태
-        ]
     
     def chunk(self, text: str, document_id: str = "") -> List[Chunk]:
         """
@@ -115,17 +213,61 @@ class SmartChunker:
         Returns:
             청크 리스트
         """
+        all_chunks = list(self.iter_chunks(text, document_id))
+        logger.info(f"청킹 완료: {len(all_chunks)}개 청크 생성")
+        return all_chunks
+    
+    def chunk_batch(self, text: str, document_id: str = "") -> ChunkBatch:
+        """
+        문서를 청크로 분할해 열 단위 ChunkBatch로 반환
+        
+        Args:
+            text: 원본 텍스트
+            document_id: 문서 ID (메타데이터용)
+            
+        Returns:
+            ChunkBatch
+        """
+        batch = ChunkBatch.from_chunks(self.iter_chunks(text, document_id))
+        logger.info(f"청킹 완료: {len(batch)}개 청크 생성")
+        return batch
+    
+    def iter_chunks(self, text: str, document_id: str = "") -> Iterator[Chunk]:
+        """
+        문서를 청크로 분할하며 하나씩 반환 (제너레이터)
+        
+        섹션 분리 → 섹션별 청킹 → 작은 청크 병합을 파이프라인으로 연결해
+        앞쪽 청크를 소비하는 동안 뒤쪽 섹션은 아직 처리되지 않습니다.
+        
+        Args:
+            text: 원본 텍스트
+            document_id: 문서 ID (메타데이터용)
+            
+        Yields:
+            인덱스가 0부터 순서대로 매겨진 청크
+        """
         if not text or not text.strip():
-            return []
+            return
         
         # 1. 텍스트 정규화
         text = self._normalize_text(text)
         
-        # 2. 구조 분석 (섹션 분리)
-        sections = self._split_into_sections(text)
+        # 2~4. 섹션 분리 → 섹션별 청킹 → 후처리 (너무 작은 청크 병합)
+        merged = self._merge_small_chunks(
+            self._iter_section_chunks(self._split_into_sections(text), document_id)
+        )
         
-        # 3. 섹션별 청킹
-        all_chunks = []
+        # 5. 인덱스 재정렬
+        for i, chunk in enumerate(merged):
+            chunk.index = i
+            yield chunk
+    
+    def _iter_section_chunks(
+        self,
+        sections: Iterable[Dict],
+        document_id: str
+    ) -> Iterator[Chunk]:
+        """섹션별 청킹 (섹션 메타데이터 부여)"""
         current_index = 0
         
         for section in sections:
@@ -139,27 +281,17 @@ class SmartChunker:
             for chunk in section_chunks:
                 chunk.metadata["document_id"] = document_id
                 chunk.metadata["section_type"] = section["type"]
-                all_chunks.append(chunk)
+                yield chunk
             
             current_index += len(section_chunks)
-        
-        # 4. 후처리 (너무 작은 청크 병합)
-        all_chunks = self._merge_small_chunks(all_chunks)
-        
-        # 5. 인덱스 재정렬
-        for i, chunk in enumerate(all_chunks):
-            chunk.index = i
-        
-        logger.info(f"청킹 완료: {len(all_chunks)}개 청크 생성")
-        return all_chunks
     
     def _normalize_text(self, text: str) -> str:
         """텍스트 정규화"""
         # 연속 공백 정리
-        text = re.sub(r'[ \t]+', ' ', text)
+        text = _SPACES_RE.sub(' ', text)
         
         # 연속 줄바꿈 정리 (3개 이상 → 2개)
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _MULTI_NEWLINE_RE.sub('\n\n', text)
         
         # 특수 공백 문자 정규화
         text = text.replace('\xa0', ' ')
@@ -167,92 +299,79 @@ class SmartChunker:
         
         return text.strip()
     
-    def _split_into_sections(self, text: str) -> List[Dict]:
+    def _split_into_sections(self, text: str) -> Iterator[Dict]:
         """
-        텍스트를 의미 단위 섹션으로 분리
+        텍스트를 의미 단위 섹션으로 분리 (제너레이터)
         
-        Returns:
-            [{"text": "...", "type": "paragraph/table/title", "start": 0}, ...]
+        Yields:
+            {"text": "...", "type": "paragraph/table/title", "start": 0}
         """
-        sections = []
-        lines = text.split('\n')
-        
-        current_section = {"text": "", "type": "paragraph", "start": 0}
-        current_pos = 0
-        
-        for line in lines:
-            line_type = self._detect_line_type(line)
+        line_types = self._classify_lines(text)
+        preserve_titles = self.config.preserve_titles
+        text_len = len(text)
+        
+        # 섹션은 원문의 연속 구간이므로 줄 목록/문자열 누적 없이 오프셋만 추적
+        # (섹션 텍스트 = text[section_start:section_end] + "\n")
+        section_type = "paragraph"
+        section_start = 0
+        section_end = 0
+        line_start = 0
+        
+        def make_section() -> Dict:
+            return {
+                "text": text[section_start:section_end] + "\n",
+                "type": section_type,
+                "start": section_start
+            }
+        
+        # split('\n')과 동일하게 마지막 빈 줄까지 순회
+        while line_start <= text_len:
+            line_end = text.find('\n', line_start)
+            if line_end == -1:
+                line_end = text_len
             
-            # 테이블은 별도 섹션으로
-            if line_type == "table":
-                if current_section["text"].strip():
-                    sections.append(current_section)
-                
-                # 테이블 시작
-                table_text = line + "\n"
-                table_start = current_pos
-                
-                current_section = {
-                    "text": table_text,
-                    "type": "table",
-                    "start": table_start
-                }
+            line_type = line_types.get(line_start, "paragraph")
             
-            # 제목은 다음 섹션의 시작점
-            elif line_type == "title" and self.config.preserve_titles:
-                if current_section["text"].strip():
-                    sections.append(current_section)
+            # 테이블은 별도 섹션으로, 제목은 다음 섹션의 시작점
+            if line_type == "table" or (line_type == "title" and preserve_titles):
+                section = make_section()
+                if section["text"].strip():
+                    yield section
                 
-                current_section = {
-                    "text": line + "\n",
-                    "type": "title",
-                    "start": current_pos
-                }
+                section_type = line_type
+                section_start = line_start
             
             # 일반 텍스트
-            else:
-                if current_section["type"] == "table" and line_type != "table":
-                    # 테이블 종료
-                    sections.append(current_section)
-                    current_section = {
-                        "text": line + "\n",
-                        "type": "paragraph",
-                        "start": current_pos
-                    }
-                else:
-                    current_section["text"] += line + "\n"
+            elif section_type == "table":
+                # 테이블 종료
+                yield make_section()
+                section_type = "paragraph"
+                section_start = line_start
             
-            current_pos += len(line) + 1
+            section_end = line_end
+            line_start = line_end + 1
         
         # 마지막 섹션 추가
-        if current_section["text"].strip():
-            sections.append(current_section)
+        section = make_section()
+        if section["text"].strip():
+            yield section
+    
+    def _classify_lines(self, text: str) -> Dict[int, str]:
+        """
+        전체 텍스트를 한 번에 스캔하여 라인 유형 분류
         
-        return sections
+        Returns:
+            {라인 시작 오프셋: "empty/table/title/list"} (없으면 paragraph)
+        """
+        return {
+            match.start(): match.lastgroup
+            for match in _LINE_CLASSIFIER_RE.finditer(text)
+        }
     
     def _detect_line_type(self, line: str) -> str:
-        """라인 유형 감지"""
-        line = line.strip()
-        
-        if not line:
-            return "empty"
-        
-        # 테이블 체크
-        for pattern in self.table_patterns:
-            if re.search(pattern, line):
-                return "table"
-        
-        # 제목 체크
-        for pattern in self.title_patterns:
-            if re.match(pattern, line):
-                return "title"
-        
-        # 리스트 체크
-        for pattern in self.list_patterns:
-            if re.match(pattern, line):
-                return "list"
-        
-        return "paragraph"
+        """라인 유형 감지 (단일 라인)"""
+        match = _LINE_CLASSIFIER_RE.match(line)
+        return match.lastgroup if match else "paragraph"
     
     def _chunk_section(
         self,
@@ -298,24 +417,36 @@ class SmartChunker:
         start_char: int
     ) -> List[Chunk]:
         """문장 경계 기반 분할"""
-        # 문장 분리
-        sentences = self.sentence_endings.split(text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        # 문장 분리 (strip은 문장당 한 번만)
+        sentences = [s for s in map(str.strip, _SENTENCE_ENDINGS_RE.split(text)) if s]
         
         chunks = []
-        current_chunk = ""
+        # 문자열 += 대신 버퍼에 모았다가 flush 시 한 번만 join
+        buf: List[str] = []
+        buf_len = 0
         current_start = start_char
         chunk_index = start_index
         
+        # 루프 안에서 반복 조회하지 않도록 지역 변수로
+        chunk_size = self.config.chunk_size
+        append = buf.append
+        
         for sentence in sentences:
+            sentence_len = len(sentence)
+            
             # 현재 청크 + 새 문장이 목표 크기 이하면 추가
-            if len(current_chunk) + len(sentence) <= self.config.chunk_size:
-                current_chunk += sentence + " "
+            if buf_len + sentence_len <= chunk_size:
+                append(sentence)
+                append(" ")
+                buf_len += sentence_len + 1
             else:
+                current_chunk = "".join(buf)
+                chunk_text = current_chunk.strip()
+                
                 # 현재 청크 저장
-                if current_chunk.strip():
+                if chunk_text:
                     chunks.append(Chunk(
-                        text=current_chunk.strip(),
+                        text=chunk_text,
                         index=chunk_index,
                         chunk_type=ChunkType.PARAGRAPH,
                         start_char=current_start,
@@ -326,12 +457,16 @@ class SmartChunker:
                 # 오버랩 적용
                 overlap_text = self._get_overlap_text(current_chunk)
                 current_start = current_start + len(current_chunk) - len(overlap_text)
-                current_chunk = overlap_text + sentence + " "
+                buf = [overlap_text, sentence, " "]
+                append = buf.append
+                buf_len = len(overlap_text) + sentence_len + 1
         
         # 마지막 청크
-        if current_chunk.strip():
+        current_chunk = "".join(buf)
+        chunk_text = current_chunk.strip()
+        if chunk_text:
             chunks.append(Chunk(
-                text=current_chunk.strip(),
+                text=chunk_text,
                 index=chunk_index,
                 chunk_type=ChunkType.PARAGRAPH,
                 start_char=current_start,
@@ -351,13 +486,18 @@ class SmartChunker:
         start = 0
         chunk_index = start_index
         
-        while start < len(text):
-            end = start + self.config.chunk_size
+        text_len = len(text)
+        chunk_size = self.config.chunk_size
+        min_chunk_size = self.config.min_chunk_size
+        chunk_overlap = self.config.chunk_overlap
+        
+        while start < text_len:
+            end = start + chunk_size
             
             # 단어 경계에서 자르기
-            if end < len(text):
+            if end < text_len:
                 # 공백 위치 찾기
-                space_pos = text.rfind(' ', start + self.config.min_chunk_size, end)
+                space_pos = text.rfind(' ', start + min_chunk_size, end)
                 if space_pos > start:
                     end = space_pos
             
@@ -373,8 +513,8 @@ class SmartChunker:
                 ))
                 chunk_index += 1
             
-            # 오버랩 적용
-            start = end - self.config.chunk_overlap
+            # 오버랩 적용 (오버랩이 청크보다 커도 항상 앞으로 진행)
+            start = max(end - chunk_overlap, start + 1)
         
         return chunks
     
@@ -397,34 +537,38 @@ class SmartChunker:
         
         return text[overlap_start:]
     
-    def _merge_small_chunks(self, chunks: List[Chunk]) -> List[Chunk]:
-        """작은 청크 병합"""
-        if not chunks:
-            return chunks
-        
-        merged = []
+    def _merge_small_chunks(self, chunks: Iterable[Chunk]) -> Iterator[Chunk]:
+        """작은 청크 병합 (제너레이터, 확정된 청크부터 바로 반환)"""
         current = None
+        # 병합 대상 텍스트는 모아두었다가 확정 시 한 번만 join
+        parts: List[str] = []
+        current_len = 0
         
         for chunk in chunks:
             if current is None:
                 current = chunk
+                parts = [chunk.text]
+                current_len = chunk.length
                 continue
             
             # 현재 청크가 너무 작으면 다음과 병합
-            if current.length < self.config.min_chunk_size:
+            if current_len < self.config.min_chunk_size:
                 # 테이블은 병합하지 않음
                 if current.chunk_type != ChunkType.TABLE and chunk.chunk_type != ChunkType.TABLE:
-                    current.text = current.text + "\n\n" + chunk.text
+                    parts.append(chunk.text)
+                    current_len += 2 + chunk.length
                     current.end_char = chunk.end_char
                     continue
             
-            merged.append(current)
+            current.text = "\n\n".join(parts)
+            yield current
             current = chunk
+            parts = [chunk.text]
+            current_len = chunk.length
         
         if current:
-            merged.append(current)
-        
-        return merged
+            current.text = "\n\n".join(parts)
+            yield current
 
 
 # ============================================
@@ -502,4 +646,4 @@ if __name__ == "__main__":
     for i, chunk in enumerate(chunks):
         print(f"--- 청크 #{i} ({chunk.chunk_type.value}, {chunk.length}자) ---")
         print(chunk.text[:150] + "..." if len(chunk.text) > 150 else chunk.text)
-        print()
\ No newline at end of file
+        print()
\ No newline at end of file
@@ -4,8 +4,12 @@ PDF, HWP, DOCX, 이미지 파일 파싱을 처리하는 서비스
 EasyOCR 기반으로 최적화됨
 """
 
+import io
 import os
+import asyncio
 import logging
+import threading
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
 from pathlib import Path
@@ -15,7 +19,6 @@ import re
 # PDF 파싱
 import fitz  # PyMuPDF
 import pdfplumber
-from PyPDF2 import PdfReader
 
 # DOCX 파싱
 from docx import Document as DocxDocument
@@ -23,27 +26,109 @@ from docx import Document as DocxDocument
 # HWP 파싱
 import olefile
 import zipfile
-import xml.etree.ElementTree as ET
+from lxml import etree  # python-docx 의존성으로 항상 설치됨
 
 # 이미지/OCR (EasyOCR)
 import numpy as np
 from PIL import Image
 import easyocr
 
+from APP.utils.parse_cache import (
+    file_cache_key,
+    get_cached_parse,
+    is_parse_cache_enabled,
+    store_parse,
+)
+from APP.utils.pdf_render import RenderConfig, render_pages
+from APP.utils.regex_engine import compile_pattern
+
 logger = logging.getLogger(__name__)
 
 # 🔹 전역 OCR Reader (한 번만 로드)
 _OCR_READER = None
+_OCR_READER_LOCK = threading.Lock()  # 시작 시 워밍업과 첫 요청이 겹쳐도 한 번만 생성
+
+# PDF OCR 시 한 번에 인식할 페이지 수 (렌더링 이미지는 배치 단위로만 메모리에 유지)
+_OCR_BATCH_SIZE = 8
+
+# 벡터 텍스트가 이보다 짧은 페이지는 스캔 페이지로 보고 OCR
+_OCR_MIN_PAGE_CHARS = 20
+
+# 이보다 작은 DOCX는 python-docx 대신 본문 XML만 직접 파싱
+_DOCX_FAST_PATH_MAX_SIZE = 64 * 1024
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_BODY, _W_P, _W_R, _W_T, _W_BR, _W_HYPERLINK = (
+    _W_NS + name for name in ('body', 'p', 'r', 't', 'br', 'hyperlink')
+)
+_W_TBL, _W_TBLGRID, _W_GRIDCOL, _W_TR, _W_TC, _W_TCPR, _W_GRIDSPAN, _W_VMERGE = (
+    _W_NS + name
+    for name in ('tbl', 'tblGrid', 'gridCol', 'tr', 'tc', 'tcPr', 'gridSpan', 'vMerge')
+)
+_W_VAL, _W_TYPE = _W_NS + 'val', _W_NS + 'type'
+# run 안의 텍스트 취급 요소 (python-docx Run.text와 동일, w:t/w:br은 따로 처리)
+_W_RUN_CHARS = {
+    _W_NS + 'tab': '\t',
+    _W_NS + 'ptab': '\t',
+    _W_NS + 'cr': '\n',
+    _W_NS + 'noBreakHyphen': '-',
+}
+
+# 파일 시그니처 → 확장자 (업로드 파일의 확장자가 틀린 경우 보정)
+_MAGIC_SIGNATURES = (
+    (b'%PDF-', '.pdf'),
+    (b'\x89PNG\r\n\x1a\n', '.png'),
+    (b'\xff\xd8\xff', '.jpg'),
+    (b'GIF87a', '.gif'),
+    (b'GIF89a', '.gif'),
+    (b'II*\x00', '.tiff'),
+    (b'MM\x00*', '.tiff'),
+    (b'BM', '.bmp'),
+)
+_OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+# 긴 변이 이 값을 넘는 이미지는 JPEG 디코더 단계에서 긴 변 _IMAGE_DRAFT_SIDE 이상으로만 축소
+_IMAGE_DRAFT_THRESHOLD = 4096
+_IMAGE_DRAFT_SIDE = 2240
 
 def get_ocr_reader():
     """EasyOCR Reader를 한 번만 로드하여 재사용"""
     global _OCR_READER
     if _OCR_READER is None:
-        logger.info("Initializing EasyOCR Reader...")
-        _OCR_READER = easyocr.Reader(['ko', 'en'], gpu=False)
+        with _OCR_READER_LOCK:
+            if _OCR_READER is None:
+                logger.info("Initializing EasyOCR Reader...")
+                _OCR_READER = easyocr.Reader(['ko', 'en'], gpu=False)
     return _OCR_READER
 
 
+def warmup_ocr():
+    """
+    OCR Reader 미리 로드 + 더미 이미지로 1회 실행
+    
+    모델 가중치 로드와 첫 추론 초기화 비용을 첫 사용자 요청 대신 서버 시작 시 지불합니다.
+    """
+    try:
+        reader = get_ocr_reader()
+        reader.readtext(np.zeros((64, 64, 3), dtype=np.uint8), detail=0)
+        logger.info("EasyOCR Reader warmed up")
+    except Exception as e:
+        logger.warning(f"EasyOCR warmup failed: {e}")
+
+
+# clean_pdf_text용 패턴/테이블 (모듈 로드 시 1회 생성)
+_FOOTNOTE_LINE_RE = compile_pattern(r'^\(?\^?\d+[\.\)]\)?\s*$')
+_MULTI_NEWLINE_RE = compile_pattern(r'\n{3,}')
+_PDF_META_LINES = frozenset(['SHA1', 'MD5', '{}', '[]', '()', 'IAA='])
+
+# Base64 문자가 아닌 바이트 전체 (bytes.translate로 지우고 남은 길이 = Base64 문자 수)
+_B64_BYTES = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/='
+_NON_B64_BYTES = bytes(b for b in range(256) if b not in _B64_BYTES)
+
+# HWP(OLE) 본문 정리용: 제어 문자 삭제 테이블 + 긴 Base64 문자열 패턴
+_HWP_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7f, 0xa0)])
+_HWP_B64_LONG_RE = compile_pattern(r'[A-Za-z0-9+/=]{30,}')
+
+
 def clean_pdf_text(text: str) -> str:
     """
     PDF에서 추출한 텍스트에서 불필요한 메타데이터 제거
@@ -66,17 +151,20 @@ def clean_pdf_text(text: str) -> str:
             continue
         
         # Base64로 보이는 긴 문자열이 80% 이상인 줄 제거
+        # (비ASCII 문자는 Base64가 아니므로 버리고, 남은 바이트에서 비Base64를 C 레벨로 삭제)
         if len(stripped) > 20:
-            base64_chars = len(re.findall(r'[A-Za-z0-9+/=]', stripped))
+            base64_chars = len(
+                stripped.encode('ascii', 'ignore').translate(None, _NON_B64_BYTES)
+            )
             if base64_chars / len(stripped) > 0.8:
                 continue
         
         # 각주 번호만 있는 줄 (^1, ^2, (^3) 등)
-        if re.match(r'^\(?\^?\d+[\.\)]\)?\s*$', stripped):
+        if _FOOTNOTE_LINE_RE.match(stripped):
             continue
         
         # PDF 메타데이터 키워드만 있는 줄
-        if stripped in ['SHA1', 'MD5', '{}', '[]', '()', 'IAA=']:
+        if stripped in _PDF_META_LINES:
             continue
         
         # "--- Page N ---" 구분선은 유지
@@ -90,18 +178,92 @@ def clean_pdf_text(text: str) -> str:
     text = '\n'.join(cleaned_lines)
     
     # 연속된 빈 줄 정리 (3줄 이상 → 2줄)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _MULTI_NEWLINE_RE.sub('\n\n', text)
     
     return text.strip()
 
 
+def _docx_run_text(run, parts: List[str]) -> None:
+    """w:r의 직속 텍스트 요소를 parts에 추가 (python-docx Run.text와 동일)"""
+    for elem in run:
+        if elem.tag == _W_T:
+            if elem.text:
+                parts.append(elem.text)
+        elif elem.tag == _W_BR:
+            # 줄바꿈만 텍스트로 취급 (페이지/단 나누기는 빈 문자열)
+            if elem.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        else:
+            char = _W_RUN_CHARS.get(elem.tag)
+            if char:
+                parts.append(char)
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    """
+    w:p 텍스트 (python-docx Paragraph.text와 동일)
+    
+    단락 직속 run과 하이퍼링크 안의 run만 읽으므로, 텍스트 상자처럼 run 안에
+    중첩된 단락(mc:Choice/mc:Fallback 양쪽에 같은 내용이 들어 있음)은 제외됩니다.
+    """
+    parts: List[str] = []
+    for child in paragraph:
+        if child.tag == _W_R:
+            _docx_run_text(child, parts)
+        elif child.tag == _W_HYPERLINK:
+            for run in child.iterchildren(_W_R):
+                _docx_run_text(run, parts)
+    return "".join(parts)
+
+
+def _docx_table_cell_texts(table) -> List[str]:
+    """
+    w:tbl 셀 텍스트 목록 (python-docx table.rows → row.cells 순회와 같은 순서)
+    
+    가로 병합(gridSpan)은 칸 수만큼, 세로 병합(vMerge continue)은 위 셀 텍스트를 반복합니다.
+    """
+    grid = table.find(_W_TBLGRID)
+    col_count = len(grid.findall(_W_GRIDCOL)) if grid is not None else 0
+    rows = table.findall(_W_TR)
+    
+    cells: List[str] = []
+    for row in rows:
+        for cell in row.iterchildren(_W_TC):
+            span, v_merge = 1, None
+            cell_pr = cell.find(_W_TCPR)
+            if cell_pr is not None:
+                grid_span = cell_pr.find(_W_GRIDSPAN)
+                if grid_span is not None:
+                    span = int(grid_span.get(_W_VAL))
+                merge = cell_pr.find(_W_VMERGE)
+                if merge is not None:
+                    v_merge = merge.get(_W_VAL, 'continue')
+            
+            for i in range(span):
+                if v_merge == 'continue':
+                    cells.append(cells[-col_count])
+                elif i > 0:
+                    cells.append(cells[-1])
+                else:
+                    cells.append("\n".join(
+                        _docx_paragraph_text(p) for p in cell.iterchildren(_W_P)
+                    ))
+    
+    # row.cells는 표 그리드 칸 수 단위로 잘라 읽음
+    return cells[:col_count * len(rows)]
+
+
 class DocumentParser(ABC):
     """문서 파서 추상 클래스"""
     
-    @abstractmethod
     async def parse(self, file_path: str) -> Dict[str, Any]:
+        """파싱 (블로킹 작업은 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self._parse_sync, file_path)
+    
+    @abstractmethod
+    def _parse_sync(self, file_path: str) -> Dict[str, Any]:
         """
-        파일을 파싱하여 텍스트와 메타데이터를 추출
+        파일을 파싱하여 텍스트와 메타데이터를 추출 (동기, 워커 스레드에서 호출)
         
         Args:
             file_path: 파싱할 파일 경로
@@ -134,96 +296,52 @@ class DocumentParser(ABC):
 class PDFParser(DocumentParser):
     """PDF 파일 파서 - PyMuPDF + pdfplumber 조합"""
     
-    async def parse(self, file_path: str) -> Dict[str, Any]:
-        """PDF 파싱 - 벡터 텍스트 우선 → OCR 폴백"""
+    def __init__(self, render_config: RenderConfig = None):
+        # OCR 폴백 시 페이지 렌더링 설정 (배율 ↔ 정확도/속도 조절)
+        self.render_config = render_config or RenderConfig()
+    
+    def _parse_sync(self, file_path: str) -> Dict[str, Any]:
+        """PDF 파싱 - 벡터 텍스트 우선 → 텍스트 없는 페이지만 OCR"""
         try:
             logger.info(f"Parsing PDF file: {file_path}")
             
             # ---------------- 1. 벡터 텍스트 추출 (PyMuPDF) ----------------
             doc = fitz.open(file_path)
-            text_parts = []
-            has_tables = False
             page_count = len(doc)
+            vector_texts = [page.get_text("text") for page in doc]
             
-            for page_num, page in enumerate(doc):
-                # 텍스트 추출
-                page_text = page.get_text("text")
-                
-                if page_text.strip():
-                    text_parts.append(page_text)
+            # 문서 전체에 의미있는 텍스트가 있는지 (있으면 이미지 없는 빈 페이지는 OCR 생략)
+            has_vector_text = sum(len(page_text.strip()) for page_text in vector_texts) > 100
             
-            # 텍스트가 충분히 추출되었으면 종료
-            full_text = "\n\n".join(text_parts)
+            # ---------------- 2. 벡터 텍스트가 없는 페이지만 OCR ----------------
+            ocr_page_nums = [
+                page_num for page_num, page_text in enumerate(vector_texts)
+                if len(page_text.strip()) < _OCR_MIN_PAGE_CHARS
+                and (not has_vector_text or doc[page_num].get_images())
+            ]
             
-            if len(full_text.strip()) > 100:  # 의미있는 텍스트가 있으면
-                doc.close()
-                
-                # pdfplumber로 테이블 감지
-                try:
-                    with pdfplumber.open(file_path) as pdf:
-                        for page in pdf.pages:
-                            if page.extract_tables():
-                                has_tables = True
-                                break
-                except:
-                    pass
-                
-                # 텍스트 정제
-                full_text = clean_pdf_text(full_text)
-                
-                # 메타데이터 추출
-                metadata = self._extract_pdf_metadata(file_path)
-                
-                result = {
-                    "text": full_text,
-                    "page_count": page_count,
-                    "has_tables": has_tables,
-                    "confidence": 1.0,
-                    "metadata": metadata
-                }
-                
-                logger.info(f"PDF parsing completed: {page_count} pages, {len(full_text)} chars")
-                return result
+            ocr_texts: Dict[int, str] = {}
+            if ocr_page_nums:
+                logger.info(f"Vector text not found on {len(ocr_page_nums)}/{page_count} pages, trying OCR...")
+                ocr_texts = self._ocr_pages(file_path, ocr_page_nums)
             
-            # ---------------- 2. 이미지 기반 OCR (벡터 텍스트가 없는 경우) ----------------
-            logger.info("Vector text not found, trying OCR...")
-            reader = get_ocr_reader()
-            ocr_text_parts = []
+            # 테이블 감지 (이미 열린 문서 재사용)
+            has_tables = self._detect_tables(doc, file_path) if has_vector_text else False
+            metadata = self._extract_pdf_metadata(doc)
+            doc.close()
             
-            for page_num in range(page_count):
-                page = doc[page_num]
-                # 고해상도로 렌더링 (3배 확대)
-                pix = page.get_pixmap(matrix=fitz.Matrix(3, 3))
-                
-                # Pixmap을 NumPy 배열로 변환
-                img_np = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
-                    pix.height, pix.width, pix.n
-                )
-                
-                # EasyOCR 실행
-                results = reader.readtext(img_np, detail=0, paragraph=False)
-                page_text = "\n".join(results)
+            # 페이지 순서대로 합치기 (OCR 결과가 있는 페이지는 OCR 텍스트 사용)
+            text_buf = io.StringIO()  # 페이지 텍스트를 리스트에 모았다 join하지 않고 바로 이어 씀
+            for page_num, page_text in enumerate(vector_texts):
+                if page_num in ocr_texts:
+                    page_text = f"--- Page {page_num + 1} ---\n{ocr_texts[page_num]}"
                 
                 if page_text.strip():
-                    ocr_text_parts.append(f"--- Page {page_num + 1} ---\n{page_text}")
-            
-            doc.close()
+                    if text_buf.tell():
+                        text_buf.write("\n\n")
+                    text_buf.write(page_text)
             
-            if ocr_text_parts:
-                full_text = "\n\n".join(ocr_text_parts)
-                full_text = clean_pdf_text(full_text)
-                
-                result = {
-                    "text": full_text,
-                    "page_count": page_count,
-                    "has_tables": False,
-                    "confidence": 0.85,  # OCR 신뢰도
-                    "metadata": self._extract_pdf_metadata(file_path)
-                }
-                
-                logger.info(f"PDF OCR completed: {page_count} pages, {len(full_text)} chars")
-                return result
-            else:
+            if not text_buf.tell():
                 return {
                     "text": "[PDF OCR 결과 없음]",
                     "page_count": page_count,
@@ -231,45 +349,148 @@ class PDFParser(DocumentParser):
                     "confidence": 0.0,
                     "metadata": {}
                 }
+            
+            # 텍스트 정제
+            full_text = clean_pdf_text(text_buf.getvalue())
+            
+            result = {
+                "text": full_text,
+                "page_count": page_count,
+                "has_tables": has_tables,
+                "confidence": 0.85 if ocr_texts else 1.0,  # OCR 페이지가 섞이면 OCR 신뢰도
+                "metadata": metadata
+            }
+            
+            logger.info(
+                f"PDF parsing completed: {page_count} pages ({len(ocr_texts)} OCR), "
+                f"{len(full_text)} chars"
+            )
+            return result
                 
         except Exception as e:
             logger.error(f"PDF parsing failed: {str(e)}")
             raise Exception(f"PDF 파싱 실패: {str(e)}")
     
-    def _extract_pdf_metadata(self, file_path: str) -> Dict[str, Any]:
-        """PDF 메타데이터 추출"""
+    def _ocr_pages(self, file_path: str, page_nums: List[int]) -> Dict[int, str]:
+        """지정한 페이지만 배치 단위로 렌더링 + OCR (텍스트가 나온 페이지만 반환)"""
+        reader = get_ocr_reader()
+        ocr_texts = {}
+        
+        for batch_start in range(0, len(page_nums), _OCR_BATCH_SIZE):
+            batch = page_nums[batch_start:batch_start + _OCR_BATCH_SIZE]
+            # 페이지 크기별 배율로 렌더링 (별도 프로세스에서 병렬)
+            images = render_pages(file_path, batch, self.render_config)
+            
+            # EasyOCR 배치 실행 (페이지별 호출 오버헤드 제거)
+            for page_num, results in zip(batch, self._ocr_batch(reader, images)):
+                page_text = "\n".join(results)
+                if page_text.strip():
+                    ocr_texts[page_num] = page_text
+        
+        return ocr_texts
+    
+    @staticmethod
+    def _detect_tables(doc: fitz.Document, file_path: str) -> bool:
+        """
+        테이블 포함 여부 (첫 테이블을 찾으면 중단)
+        
+        PyMuPDF find_tables(1.23+)로 열린 문서에서 바로 감지하고,
+        구버전이면 pdfplumber로 파일을 다시 열어 감지합니다.
+        """
         try:
-            reader = PdfReader(file_path)
-            info = reader.metadata
+            if hasattr(fitz.Page, "find_tables"):
+                return any(page.find_tables().tables for page in doc)
+            
+            with pdfplumber.open(file_path) as pdf:
+                return any(page.extract_tables() for page in pdf.pages)
+        except Exception as e:
+            logger.debug(f"Table detection failed: {e}")
+            return False
+    
+    @staticmethod
+    def _ocr_batch(reader, images: List[np.ndarray]) -> List[List[str]]:
+        """
+        여러 페이지를 한 번에 OCR
+        
+        readtext_batched는 배치 안의 이미지를 한 크기로 리사이즈하므로, 렌더링 크기가
+        같은 페이지끼리 묶어 호출합니다 (가로/세로 페이지가 섞여도 비율이 찌그러지지 않음).
+        결과는 입력 순서대로 반환합니다.
+        """
+        groups: Dict[tuple, List[int]] = {}
+        for i, image in enumerate(images):
+            groups.setdefault(image.shape[:2], []).append(i)
+        
+        results: List[List[str]] = [[] for _ in images]
+        for (height, width), indices in groups.items():
+            group_results = reader.readtext_batched(
+                [images[i] for i in indices],
+                n_width=width,
+                n_height=height,
+                batch_size=len(indices),
+                detail=0,
+                paragraph=False
+            )
+            for i, page_result in zip(indices, group_results):
+                results[i] = page_result
+        return results
+    
+    def _extract_pdf_metadata(self, doc: fitz.Document) -> Dict[str, Any]:
+        """PDF 메타데이터 추출 (이미 열린 문서의 Info 딕셔너리 사용)"""
+        try:
+            info = doc.metadata or {}
             
             return {
-                "title": info.get('/Title', ''),
-                "author": info.get('/Author', ''),
-                "subject": info.get('/Subject', ''),
-                "creator": info.get('/Creator', ''),
-                "producer": info.get('/Producer', ''),
-                "creation_date": info.get('/CreationDate', ''),
+                "title": info.get('title', ''),
+                "author": info.get('author', ''),
+                "subject": info.get('subject', ''),
+                "creator": info.get('creator', ''),
+                "producer": info.get('producer', ''),
+                "creation_date": info.get('creationDate', ''),
             }
         except:
             return {}
 
 
 class DOCXParser(DocumentParser):
-    """DOCX 파일 파서 - 헤더/푸터 포함"""
+    """
+    DOCX 파일 파서
     
-    async def parse(self, file_path: str) -> Dict[str, Any]:
-        """DOCX 파싱 - 단락 + 표 + 헤더/푸터"""
+    python-docx 경로는 본문 단락 → 표 → 헤더/푸터 순으로 추출합니다.
+    _DOCX_FAST_PATH_MAX_SIZE 미만 파일은 본문 XML만 읽는 빠른 경로를 사용하며,
+    이 경로는 헤더/푸터를 읽지 않습니다 (본문 단락/표 텍스트는 두 경로가 동일).
+    """
+    
+    def _parse_sync(self, file_path: str) -> Dict[str, Any]:
+        """DOCX 파싱 - 작은 파일은 빠른 경로, 그 외(또는 빠른 경로 실패)는 python-docx"""
+        # 작은 파일은 본문 XML만 직접 파싱 (python-docx 객체 트리 생성 생략)
+        if os.path.getsize(file_path) < _DOCX_FAST_PATH_MAX_SIZE:
+            try:
+                return self._parse_docx_fast(file_path)
+            except Exception as e:
+                logger.debug(f"DOCX fast path failed, falling back to python-docx: {e}")
+        
+        return self._parse_docx_full(file_path)
+    
+    def _parse_docx_full(self, file_path: str) -> Dict[str, Any]:
+        """DOCX 파싱 (python-docx) - 단락 + 표 + 헤더/푸터"""
         try:
             logger.info(f"Parsing DOCX file: {file_path}")
             
             doc = DocxDocument(file_path)
-            text_parts = []
+            text_buf = io.StringIO()  # 조각을 리스트에 모았다 join하지 않고 바로 이어 씀
             has_tables = False
             
+            def add_part(text: str):
+                # python-docx의 .text는 접근할 때마다 새로 조립되므로 한 번만 읽음
+                text = text.strip()
+                if text:
+                    if text_buf.tell():
+                        text_buf.write("\n\n")
+                    text_buf.write(text)
+            
             # 본문 단락 추출
             for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text.strip())
+                add_part(paragraph.text)
             
             # 테이블 추출
             if doc.tables:
@@ -277,26 +498,23 @@ class DOCXParser(DocumentParser):
                 for table in doc.tables:
                     for row in table.rows:
                         for cell in row.cells:
-                            if cell.text.strip():
-                                text_parts.append(cell.text.strip())
+                            add_part(cell.text)
             
             # 섹션별 헤더/푸터 추출
             for section in doc.sections:
                 # 헤더
                 header = section.header
                 for p in header.paragraphs:
-                    if p.text.strip():
-                        text_parts.append(p.text.strip())
+                    add_part(p.text)
                 
                 # 푸터
                 footer = section.footer
                 for p in footer.paragraphs:
-                    if p.text.strip():
-                        text_parts.append(p.text.strip())
+                    add_part(p.text)
             
             # 전체 텍스트
-            full_text = "\n\n".join(text_parts)
-            full_text = self.clean_text(full_text)
+            has_text = text_buf.tell() > 0
+            full_text = self.clean_text(text_buf.getvalue())
             
             # 메타데이터
             metadata = {
@@ -308,7 +526,7 @@ class DOCXParser(DocumentParser):
             }
             
             result = {
-                "text": full_text if text_parts else "[DOCX 추출 결과 없음]",
+                "text": full_text if has_text else "[DOCX 추출 결과 없음]",
                 "page_count": len(doc.paragraphs),
                 "has_tables": has_tables,
                 "confidence": 1.0,
@@ -321,12 +539,89 @@ class DOCXParser(DocumentParser):
         except Exception as e:
             logger.error(f"DOCX parsing failed: {str(e)}")
             raise Exception(f"DOCX 파싱 실패: {str(e)}")
+    
+    def _parse_docx_fast(self, file_path: str) -> Dict[str, Any]:
+        """
+        작은 DOCX 빠른 경로 - word/document.xml만 파싱
+        
+        python-docx 경로와 같은 규칙으로 본문 단락 → 표 셀 순서로 추출합니다
+        (탭/줄바꿈 포함, 텍스트 상자 등 중첩 단락 제외, 병합 셀은 칸마다 반복).
+        별도 XML 파트인 헤더/푸터는 읽지 않으므로 결과에 포함되지 않습니다.
+        """
+        logger.info(f"Parsing small DOCX file (fast path): {file_path}")
+        
+        text_buf = io.StringIO()
+        
+        def add_part(text: str):
+            text = text.strip()
+            if text:
+                if text_buf.tell():
+                    text_buf.write("\n\n")
+                text_buf.write(text)
+        
+        with zipfile.ZipFile(file_path) as z:
+            root = etree.fromstring(
+                z.read('word/document.xml'), etree.XMLParser(resolve_entities=False)
+            )
+            body = root.find(_W_BODY)
+            if body is None:
+                # Strict OOXML 등 다른 네임스페이스 문서는 python-docx 경로로
+                raise ValueError("no WordprocessingML body")
+            
+            # python-docx의 doc.paragraphs / doc.tables와 같은 본문 직속 요소만
+            paragraphs = body.findall(_W_P)
+            tables = body.findall(_W_TBL)
+            
+            for paragraph in paragraphs:
+                add_part(_docx_paragraph_text(paragraph))
+            for table in tables:
+                for cell_text in _docx_table_cell_texts(table):
+                    add_part(cell_text)
+            
+            metadata = self._read_core_properties(z)
+        
+        has_text = text_buf.tell() > 0
+        full_text = self.clean_text(text_buf.getvalue())
+        
+        logger.info(f"DOCX parsing completed: {len(full_text)} chars")
+        return {
+            "text": full_text if has_text else "[DOCX 추출 결과 없음]",
+            "page_count": len(paragraphs),
+            "has_tables": bool(tables),
+            "confidence": 1.0,
+            "metadata": metadata
+        }
+    
+    @staticmethod
+    def _read_core_properties(z: zipfile.ZipFile) -> Dict[str, str]:
+        """docProps/core.xml에서 작성자/제목 등 메타데이터 추출 (없으면 빈 값)"""
+        keys = {
+            'creator': 'author',
+            'title': 'title',
+            'subject': 'subject',
+            'created': 'created',
+            'modified': 'modified',
+        }
+        metadata = dict.fromkeys(keys.values(), "")
+        
+        try:
+            root = etree.fromstring(
+                z.read('docProps/core.xml'), etree.XMLParser(resolve_entities=False)
+            )
+        except KeyError:
+            return metadata
+        
+        for elem in root:
+            key = keys.get(etree.QName(elem).localname)
+            if key and elem.text:
+                metadata[key] = elem.text
+        return metadata
 
 
 class HWPParser(DocumentParser):
     """HWP 파일 파서 - HWPX 신버전 + OLE 구버전 지원"""
     
-    async def parse(self, file_path: str) -> Dict[str, Any]:
+    def _parse_sync(self, file_path: str) -> Dict[str, Any]:
         """HWP 파싱 - 신버전(HWPX) 우선 → 구버전(OLE) 폴백"""
         try:
             logger.info(f"Parsing HWP file: {file_path}")
@@ -336,27 +631,19 @@ class HWPParser(DocumentParser):
             # ---------------- 1. 신버전 HWPX (ZIP/XML 기반) ----------------
             if file_extension == '.hwpx' or zipfile.is_zipfile(file_path):
                 try:
-                    text_content = []
+                    # 't' 노드가 수만 개일 수 있어 리스트 대신 버퍼에 바로 이어 씀
+                    text_buf = io.StringIO()
                     
                     with zipfile.ZipFile(file_path, 'r') as z:
                         # HWPX 구조: Contents/*.xml에 텍스트 존재
                         for name in z.namelist():
                             if name.startswith('Contents/') and name.endswith('.xml'):
-                                xml_data = z.read(name)
-                                root = ET.fromstring(xml_data)
-                                
-                                # 네임스페이스 제거 (검색 단순화)
-                                for elem in root.iter():
-                                    if '}' in elem.tag:
-                                        elem.tag = elem.tag.split('}', 1)[1]
-                                
-                                # 't' 태그에서 실제 텍스트 추출
-                                for elem in root.iter('t'):
-                                    if elem.text:
-                                        text_content.append(elem.text)
+                                for text in self._iter_hwpx_text(z, name):
+                                    text_buf.write(text)
+                                    text_buf.write(" ")
                     
-                    if text_content:
-                        full_text = " ".join(text_content).strip()
+                    if text_buf.tell():
+                        full_text = text_buf.getvalue().strip()
                         full_text = self.clean_text(full_text)
                         
                         result = {
@@ -378,28 +665,27 @@ class HWPParser(DocumentParser):
                 text_content = []
                 
                 with olefile.OleFileIO(file_path) as f:
-                    # BodyText/SectionN 스트림 탐색
-                    for i in range(256):
+                    # BodyText/SectionN 스트림 탐색 (256개를 하나씩 확인하는 대신 실제 목록 사용)
+                    for i in self._list_hwp_sections(f):
                         stream_name = f"BodyText/Section{i}"
-                        if f.exists(stream_name):
-                            try:
-                                stream_data = f.openstream(stream_name).read()
-                                
-                                # UTF-16 디코딩
-                                text = stream_data.decode('UTF-16', errors='ignore')
-                                
-                                # 제어 문자 제거
-                                text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
-                                
-                                # Base64 같은 긴 문자열 제거
-                                text = re.sub(r'[A-Za-z0-9+/=]{30,}', '', text)
-                                
-                                if text.strip():
-                                    text_content.append(text.strip())
-                                    
-                            except Exception as e:
-                                logger.warning(f"Failed to parse section {i}: {e}")
-                                continue
+                        try:
+                            stream_data = f.openstream(stream_name).read()
+                            
+                            # UTF-16 디코딩
+                            text = stream_data.decode('UTF-16', errors='ignore')
+                            
+                            # 제어 문자 제거 (정규식 대신 C 레벨 테이블 삭제)
+                            text = text.translate(_HWP_CTRL_TABLE)
+                            
+                            # Base64 같은 긴 문자열 제거
+                            text = _HWP_B64_LONG_RE.sub('', text)
+                            
+                            if text.strip():
+                                text_content.append(text.strip())
+                            
+                        except Exception as e:
+                            logger.warning(f"Failed to parse section {i}: {e}")
+                            continue
                 
                 if text_content:
                     full_text = "\n\n".join(text_content)
@@ -436,32 +722,70 @@ class HWPParser(DocumentParser):
         except Exception as e:
             logger.error(f"HWP parsing failed: {str(e)}")
             raise Exception(f"HWP 파싱 실패: {str(e)}")
+    
+    @staticmethod
+    def _list_hwp_sections(f: olefile.OleFileIO) -> List[int]:
+        """OLE HWP에 실제로 있는 BodyText/SectionN 번호 (숫자 순)"""
+        return sorted(
+            int(path[1][len('Section'):])
+            for path in f.listdir()
+            if len(path) == 2
+            and path[0].lower() == 'bodytext'
+            and path[1].lower().startswith('section')
+            and path[1][len('Section'):].isdigit()
+        )
+    
+    @staticmethod
+    def _iter_hwpx_text(z: zipfile.ZipFile, name: str):
+        """
+        HWPX XML 파트의 't' 태그 텍스트를 스트리밍으로 추출
+        
+        트리 전체를 만들지 않고, 처리한 요소는 바로 비워 메모리를 반환합니다.
+        ('{*}t'는 네임스페이스와 무관하게 매칭)
+        """
+        with z.open(name) as fh:
+            for _, elem in etree.iterparse(fh, events=('end',), tag='{*}t', resolve_entities=False):
+                if elem.text:
+                    yield elem.text
+                
+                elem.clear(keep_tail=True)
+                # 이미 처리한 앞 형제 요소 제거
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
 
 
 class ImageParser(DocumentParser):
     """이미지 파일 파서 (EasyOCR) - Y좌표 정렬로 자연스러운 읽기 순서"""
     
-    async def parse(self, file_path: str) -> Dict[str, Any]:
+    def _parse_sync(self, file_path: str) -> Dict[str, Any]:
         """이미지 OCR - EasyOCR 사용"""
         try:
             logger.info(f"Parsing image file: {file_path}")
             
-            # 이미지 파일 유효성 검사
+            # 이미지 디코딩 (verify + 재오픈 대신 한 번에 load, 손상 파일은 load에서 예외)
             try:
-                img = Image.open(file_path)
-                img.verify()  # 이미지 손상 확인
-                img = Image.open(file_path)  # verify() 후 다시 열기
+                with Image.open(file_path) as img:
+                    # 큰 JPEG은 IDCT 단계에서 축소 디코딩 (다른 형식은 무시됨)
+                    width, height = img.size
+                    longest = max(width, height)
+                    if longest > _IMAGE_DRAFT_THRESHOLD:
+                        # draft는 두 변 모두 요청 크기 이상을 유지하므로 원본 비율로 요청
+                        img.draft(None, (
+                            width * _IMAGE_DRAFT_SIDE // longest,
+                            height * _IMAGE_DRAFT_SIDE // longest
+                        ))
+                    img.load()
+                    
+                    # RGB로 변환
+                    if img.mode not in ('RGB', 'L'):
+                        img = img.convert('RGB')
+                    
+                    # NumPy 배열로 변환 (읽기 전용, 추가 복사 없음)
+                    img_array = np.asarray(img)
             except Exception as img_error:
                 logger.error(f"Image file read error: {img_error}")
                 raise Exception(f"이미지 파일을 읽을 수 없습니다: {img_error}")
             
-            # RGB로 변환
-            if img.mode not in ('RGB', 'L'):
-                img = img.convert('RGB')
-            
-            # NumPy 배열로 변환
-            img_array = np.array(img)
-            
             if img_array is None or img_array.size == 0:
                 raise Exception("이미지 데이터가 비어 있습니다")
             
@@ -485,33 +809,25 @@ class ImageParser(DocumentParser):
                     }
                 }
             
-            # Y 좌표 기준으로 정렬 (위에서 아래로)
-            sorted_results = sorted(results, key=lambda x: x[0][0][1])
+            # Y 좌표 기준으로 정렬 (위에서 아래로) - 좌표 배열 하나를 stable argsort
+            ys = np.fromiter(
+                (bbox[0][1] for bbox, _, _ in results),  # 좌상단 Y 좌표
+                dtype=np.float64,
+                count=len(results)
+            )
+            order = np.argsort(ys, kind='stable')
+            sorted_results = [results[i] for i in order]
+            ys = ys[order]
             
-            # 줄바꿈 감지 (Y 좌표 차이로 판단)
-            lines = []
-            current_line = []
-            prev_y = None
+            # 줄바꿈 감지 (Y 좌표 차이로 판단) - 루프 대신 배열 연산으로 줄 경계 계산
             line_height_threshold = 30  # 픽셀 단위
-            confidences = []
+            texts = [text for _, text, _ in sorted_results]
+            confidences = [confidence for _, _, confidence in sorted_results]
             
-            for bbox, text, confidence in sorted_results:
-                current_y = bbox[0][1]  # 좌상단 Y 좌표
-                
-                # 새로운 줄인지 판단
-                if prev_y is None or abs(current_y - prev_y) > line_height_threshold:
-                    if current_line:
-                        lines.append(" ".join(current_line))
-                    current_line = [text]
-                else:
-                    current_line.append(text)
-                
-                prev_y = current_y
-                confidences.append(confidence)
-            
-            # 마지막 줄 추가
-            if current_line:
-                lines.append(" ".join(current_line))
+            # 이전 박스와 Y 차이가 기준을 넘는 위치마다 새 줄 시작
+            breaks = (np.flatnonzero(np.abs(np.diff(ys)) > line_height_threshold) + 1).tolist()
+            bounds = [0, *breaks, len(texts)]
+            lines = [" ".join(texts[start:end]) for start, end in zip(bounds, bounds[1:])]
             
             # 텍스트 정리
             full_text = "\n".join(lines)
@@ -546,6 +862,12 @@ class ImageParser(DocumentParser):
             raise Exception(f"이미지 파싱 실패: {str(e)}")
 
 
+@lru_cache(maxsize=None)
+def _shared_parser(parser_class: type) -> DocumentParser:
+    """파서 클래스별 공유 인스턴스 (파서는 요청별 상태를 갖지 않음)"""
+    return parser_class()
+
+
 class DocumentParserFactory:
     """파서 팩토리 - 파일 타입에 따라 적절한 파서 선택"""
     
@@ -587,7 +909,7 @@ class DocumentParserFactory:
                 f"지원 형식: {supported}"
             )
         
-        return parser_class()
+        return _shared_parser(parser_class)
     
     @classmethod
     def detect_file_type(cls, file_path: str) -> str:
@@ -610,40 +932,109 @@ class DocumentParserFactory:
         if mime_type:
             logger.debug(f"Detected MIME type: {mime_type}")
         
+        # 파일 시그니처가 다른 형식을 가리키면 시그니처 우선 (예: .doc로 이름만 바꾼 HWP)
+        try:
+            sniffed = cls._sniff_file_type(file_path)
+        except Exception as e:  # 손상된 ZIP/OLE 등은 확장자 기준으로 진행
+            logger.debug(f"File signature check failed: {e}")
+            sniffed = None
+        
+        if sniffed and cls.PARSER_MAP.get(sniffed) is not cls.PARSER_MAP.get(ext):
+            logger.warning(f"File extension {ext or '(none)'} does not match content, using {sniffed}")
+            return sniffed
+        
         return ext
     
+    @staticmethod
+    def _sniff_file_type(file_path: str) -> Optional[str]:
+        """
+        파일 앞부분 시그니처로 형식 판별 (판별 불가 시 None)
+        
+        ZIP(DOCX/HWPX)과 OLE(HWP/DOC) 컨테이너는 내부 항목 이름으로 구분합니다.
+        """
+        with open(file_path, 'rb') as f:
+            header = f.read(8)
+        
+        for signature, file_type in _MAGIC_SIGNATURES:
+            if header.startswith(signature):
+                return file_type
+        
+        if header.startswith(b'PK\x03\x04'):
+            with zipfile.ZipFile(file_path) as z:
+                names = set(z.namelist())
+            if 'word/document.xml' in names:
+                return '.docx'
+            if any(name.startswith('Contents/') for name in names):
+                return '.hwp'  # HWPX (HWPParser가 ZIP 형식도 처리)
+            return None
+        
+        if header == _OLE_SIGNATURE:
+            with olefile.OleFileIO(file_path) as f:
+                if f.exists('FileHeader') and f.exists('BodyText'):
+                    return '.hwp'
+                if f.exists('WordDocument'):
+                    return '.doc'
+        
+        return None
+    
     @classmethod
-    async def parse_file(cls, file_path: str) -> Dict[str, Any]:
+    async def parse_file(
+        cls,
+        file_path: str,
+        use_cache: bool = True,
+        stat_result: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
         """
         파일을 자동으로 감지하여 파싱
         
         Args:
             file_path: 파싱할 파일 경로
+            use_cache: 내용 해시 기준 디스크 캐시 사용 여부
+            stat_result: 호출 측에서 이미 구한 os.stat 결과 (있으면 stat을 다시 하지 않음)
             
         Returns:
             파싱 결과 딕셔너리
         """
-        # 파일 존재 확인
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+        # 파일 존재 확인 (stat 한 번으로 크기/수정 시각까지 확보)
+        if stat_result is None:
+            try:
+                stat_result = os.stat(file_path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
         
         # 파일 타입 감지
         file_type = cls.detect_file_type(file_path)
         
-        # 파서 선택 및 파싱
+        # 파서 선택 (지원하지 않는 형식이면 해시 계산 전에 실패)
         parser = cls.get_parser(file_type)
-        result = await parser.parse(file_path)
+        
+        # 같은 내용의 파일은 이전 파싱(OCR) 결과 재사용
+        cache_key = None
+        if use_cache and is_parse_cache_enabled():
+            cache_key = await asyncio.to_thread(file_cache_key, file_path, file_type, stat_result)
+        result = get_cached_parse(cache_key) if cache_key else None
+        
+        if result is not None:
+            logger.info(f"Parse cache hit: {Path(file_path).name}")
+        else:
+            result = await parser.parse(file_path)
+            if cache_key:
+                store_parse(cache_key, result)
         
         # 파일 타입 정보 추가
         result['file_type'] = file_type
         result['file_name'] = Path(file_path).name
-        result['file_size'] = os.path.getsize(file_path)
+        result['file_size'] = stat_result.st_size
         
         return result
 
 
 # 편의 함수
-async def parse_document(file_path: str) -> Dict[str, Any]:
+async def parse_document(
+    file_path: str,
+    use_cache: bool = True,
+    stat_result: Optional[os.stat_result] = None
+) -> Dict[str, Any]:
     """
     문서 파싱 편의 함수
     
@@ -651,4 +1042,6 @@ async def parse_document(file_path: str) -> Dict[str, Any]:
         result = await parse_document("document.pdf")
         print(result['text'])
     """
-    return await DocumentParserFactory.parse_file(file_path)
\ No newline at end of file
+    return await DocumentParserFactory.parse_file(
+        file_path, use_cache=use_cache, stat_result=stat_result
+    )
\ No newline at end of file
@@ -10,10 +10,20 @@ Gemini API 호출을 통합 관리
 """
 import os
 import json
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import asyncio
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Any, Tuple
+import numpy as np
 from dotenv import load_dotenv
 
+from APP.utils.llm_cache import get_cached, llm_cache_key, store as store_cached
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -26,6 +36,9 @@ GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
 # 모델 설정
 CHAT_MODEL = "gemini-2.0-flash"
 EMBEDDING_MODEL = "models/text-embedding-004"
+EMBEDDING_CACHE_SIZE = 10000  # 캐시할 임베딩 개수 (768차원 float32 기준 약 30MB)
+EMBED_COALESCE_WINDOW = 0.01  # 단건 임베딩 요청을 모으는 시간 (초)
+EMBED_COALESCE_MAX = 32       # 한 번에 묶을 최대 요청 수
 
 # 전역 모델 인스턴스 (싱글톤)
 _chat_model = None
@@ -64,17 +77,32 @@ def is_available() -> bool:
 # 텍스트 생성 함수들
 # ============================================
 
-def generate_text(prompt: str, max_retries: int = 2) -> Optional[str]:
+def generate_text(prompt: str, max_retries: int = 2, force_refresh: bool = False) -> Optional[str]:
     """
-    텍스트 생성 (범용)
+    텍스트 생성 (범용, (모델, 프롬프트) 기준 디스크 캐시 우선)
     
     Args:
         prompt: 프롬프트
         max_retries: 재시도 횟수
+        force_refresh: True면 캐시를 무시하고 새로 생성 (결과는 캐시에 덮어씀)
         
     Returns:
         생성된 텍스트 또는 None
     """
+    cache_key = llm_cache_key("text", CHAT_MODEL, prompt)
+    if not force_refresh:
+        cached = get_cached(cache_key)
+        if cached is not None:
+            return cached
+    
+    text = _generate_uncached(prompt, max_retries)
+    if text is not None:
+        store_cached(cache_key, text)
+    return text
+
+
+def _generate_uncached(prompt: str, max_retries: int) -> Optional[str]:
+    """Gemini 호출 (캐시 없이, 실패 시 max_retries까지 재시도)"""
     if not _init_gemini():
         raise ValueError("Gemini API가 초기화되지 않았습니다")
     
@@ -90,18 +118,27 @@ def generate_text(prompt: str, max_retries: int = 2) -> Optional[str]:
     return None
 
 
-def generate_json(prompt: str, max_retries: int = 2) -> Optional[Dict]:
+def generate_json(prompt: str, max_retries: int = 2, force_refresh: bool = False) -> Optional[Dict]:
     """
     JSON 형식 응답 생성
     
+    파싱에 성공한 결과만 캐시합니다 (깨진 응답이 TTL 동안 재사용되지 않도록)
+    
     Args:
         prompt: JSON 반환을 요청하는 프롬프트
         max_retries: 재시도 횟수
+        force_refresh: True면 캐시된 응답을 무시
         
     Returns:
         파싱된 JSON 딕셔너리 또는 None
     """
-    text = generate_text(prompt, max_retries)
+    cache_key = llm_cache_key("json", CHAT_MODEL, prompt)
+    if not force_refresh:
+        cached = get_cached(cache_key)
+        if cached is not None:
+            return cached
+    
+    text = _generate_uncached(prompt, max_retries)
     
     if not text:
         return None
@@ -110,46 +147,129 @@ def generate_json(prompt: str, max_retries: int = 2) -> Optional[Dict]:
     text = text.replace("```json", "").replace("```", "").strip()
     
     try:
-        return json.loads(text)
+        result = json.loads(text)
     except json.JSONDecodeError as e:
         logger.error(f"❌ JSON 파싱 실패: {e}")
         logger.debug(f"원본 응답: {text[:500]}")
         return None
+    
+    store_cached(cache_key, result)
+    return result
+
+
+# ============================================
+# 임베딩 캐시 (텍스트 해시 기준 LRU)
+# ============================================
+
+# 재업로드/유사 문서의 동일 청크를 다시 임베딩하지 않도록 캐시
+# 값은 여러 호출자가 공유하므로 읽기 전용 float32 배열로 보관
+# (float 리스트는 원소마다 Python 객체라 벡터당 수십 KB, float32 배열은 3KB)
+_embedding_cache: "OrderedDict[Tuple[str, bytes], np.ndarray]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()  # 임베딩은 스레드풀/워커에서 호출됨
+
+
+def _embedding_key(text: str, task_type: str) -> Tuple[str, bytes]:
+    """캐시 키: (task_type, 텍스트 BLAKE2b 128bit 다이제스트)"""
+    return task_type, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _get_cached_embeddings(keys: List[Tuple[str, bytes]]) -> List[Optional[np.ndarray]]:
+    """키 목록에 대한 캐시 조회 (없으면 None)"""
+    with _embedding_cache_lock:
+        hits = []
+        for key in keys:
+            vec = _embedding_cache.get(key)
+            if vec is not None:
+                _embedding_cache.move_to_end(key)
+            hits.append(vec)
+        return hits
+
+
+def _store_embeddings(keys: List[Tuple[str, bytes]], vectors: List[np.ndarray]) -> None:
+    """캐시 저장 (최대 개수 초과 시 가장 오래된 항목 제거)"""
+    with _embedding_cache_lock:
+        for key, vec in zip(keys, vectors):
+            _embedding_cache[key] = vec
+            _embedding_cache.move_to_end(key)
+        while len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+            _embedding_cache.popitem(last=False)
+
+
+def _as_embedding_array(vec) -> np.ndarray:
+    """API/디스크 캐시 값을 공유용 읽기 전용 float32 배열로 변환"""
+    arr = np.array(vec, dtype=np.float32)
+    arr.flags.writeable = False
+    return arr
+
+
+def _embedding_disk_key(text: str, task_type: str) -> str:
+    """디스크 캐시 키 (모델이 바뀌면 다른 키)"""
+    return llm_cache_key("emb", EMBEDDING_MODEL, task_type, text)
+
+
+def _fill_from_disk_cache(
+    texts: List[str],
+    keys: List[Tuple[str, bytes]],
+    vectors: List[Optional[np.ndarray]],
+    task_type: str
+) -> None:
+    """메모리 캐시 미스를 디스크 캐시에서 채움 (적중분은 메모리 캐시에도 올림)"""
+    hit_keys, hit_vectors = [], []
+    for i, vec in enumerate(vectors):
+        if vec is None:
+            cached = get_cached(_embedding_disk_key(texts[i], task_type))
+            if cached is not None:
+                cached = _as_embedding_array(cached)
+                vectors[i] = cached
+                hit_keys.append(keys[i])
+                hit_vectors.append(cached)
+    if hit_keys:
+        _store_embeddings(hit_keys, hit_vectors)
 
 
 # ============================================
 # 임베딩 함수
 # ============================================
 
-def generate_embedding(text: str, task_type: str = "retrieval_document") -> Optional[List[float]]:
+def generate_embedding(text: str, task_type: str = "retrieval_document") -> Optional[np.ndarray]:
     """
-    단일 텍스트 임베딩 생성
+    단일 텍스트 임베딩 생성 (캐시 우선)
+    
+    캐시 미스는 _EmbeddingBatcher를 거쳐 동시에 들어온 다른 요청과
+    한 번의 API 호출로 묶입니다. 결과를 기다리며 블로킹하므로
+    이벤트 루프에서는 embed_async를 사용하세요.
     
     Args:
         text: 임베딩할 텍스트
         task_type: "retrieval_document" 또는 "retrieval_query"
         
     Returns:
-        임베딩 벡터 (768차원)
+        임베딩 벡터 (768차원 float32, 읽기 전용)
     """
-    if not _init_gemini():
-        raise ValueError("Gemini API가 초기화되지 않았습니다")
+    key = _embedding_key(text, task_type)
+    cached = _get_cached_embeddings([key])[0]
+    if cached is not None:
+        return cached
     
-    try:
-        result = _genai.embed_content(
-            model=EMBEDDING_MODEL,
-            content=text,
-            task_type=task_type
-        )
-        return result['embedding']
-    except Exception as e:
-        logger.error(f"❌ 임베딩 생성 실패: {e}")
-        return None
+    return _get_embedding_batcher().submit(text, task_type).result()
+
+
+async def embed_async(text: str, task_type: str = "retrieval_document") -> Optional[np.ndarray]:
+    """generate_embedding의 비동기 버전 (이벤트 루프를 막지 않음)"""
+    key = _embedding_key(text, task_type)
+    cached = _get_cached_embeddings([key])[0]
+    if cached is not None:
+        return cached
+    
+    return await asyncio.wrap_future(_get_embedding_batcher().submit(text, task_type))
 
 
-def generate_embeddings(texts: List[str], task_type: str = "retrieval_document") -> Optional[List[List[float]]]:
+def generate_embeddings(texts: List[str], task_type: str = "retrieval_document") -> Optional[List[np.ndarray]]:
     """
-    다중 텍스트 임베딩 생성 (배치)
+    다중 텍스트 임베딩 생성 (배치, 캐시 우선)
+    
+    캐시에 있는 텍스트는 건너뛰고, 없는 텍스트(중복 제거)만
+    한 번의 API 요청으로 보낸 뒤 원래 순서대로 합칩니다.
     
     Args:
         texts: 임베딩할 텍스트 리스트
@@ -158,19 +278,124 @@ def generate_embeddings(texts: List[str], task_type: str = "retrieval_document")
     Returns:
         임베딩 벡터 리스트
     """
+    keys = [_embedding_key(text, task_type) for text in texts]
+    vectors = _get_cached_embeddings(keys)
+    _fill_from_disk_cache(texts, keys, vectors, task_type)
+    
+    # 캐시 미스만 모으기 (같은 텍스트는 한 번만 요청)
+    miss_positions: Dict[Tuple[str, bytes], List[int]] = {}
+    miss_texts: List[str] = []
+    for i, (key, vec) in enumerate(zip(keys, vectors)):
+        if vec is None:
+            if key not in miss_positions:
+                miss_positions[key] = []
+                miss_texts.append(texts[i])
+            miss_positions[key].append(i)
+    
+    if not miss_texts:
+        logger.debug(f"임베딩 캐시 전체 적중: {len(texts)}개")
+        return vectors
+    
     if not _init_gemini():
         raise ValueError("Gemini API가 초기화되지 않았습니다")
     
     try:
         result = _genai.embed_content(
             model=EMBEDDING_MODEL,
-            content=texts,
+            content=miss_texts,
             task_type=task_type
         )
-        return result['embedding']
+        new_vectors = [_as_embedding_array(vec) for vec in result['embedding']]
     except Exception as e:
         logger.error(f"❌ 배치 임베딩 생성 실패: {e}")
         return None
+    
+    miss_keys = list(miss_positions)
+    _store_embeddings(miss_keys, new_vectors)
+    for text, vec in zip(miss_texts, new_vectors):
+        store_cached(_embedding_disk_key(text, task_type), vec)
+    for key, vec in zip(miss_keys, new_vectors):
+        for i in miss_positions[key]:
+            vectors[i] = vec
+    
+    logger.debug(f"임베딩 캐시: {len(texts) - len(miss_texts)}개 적중, {len(miss_texts)}개 생성")
+    return vectors
+
+
+# ============================================
+# 단건 임베딩 요청 묶기
+# ============================================
+
+class _EmbeddingBatcher:
+    """
+    여러 스레드에서 들어오는 단건 임베딩 요청을 모아 배치 API 한 번으로 처리
+    
+    첫 요청 시점에 다른 요청이 이미 대기 중이면 EMBED_COALESCE_WINDOW 동안
+    (최대 EMBED_COALESCE_MAX개) 더 모으고, 혼자면 기다리지 않고 바로 처리합니다.
+    모은 요청은 task_type별로 generate_embeddings에 넘기고, 요청마다 Future로 결과를 돌려줍니다.
+    """
+    
+    def __init__(self):
+        self._queue: "queue.SimpleQueue[Tuple[str, str, Future]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+        self._thread.start()
+    
+    def submit(self, text: str, task_type: str) -> Future:
+        """임베딩 요청 등록 (결과는 Future로 반환)"""
+        future: Future = Future()
+        self._queue.put((text, task_type, future))
+        return future
+    
+    def _collect(self) -> List[Tuple[str, str, Future]]:
+        """첫 요청을 기다린 뒤 (동시 요청이 있으면) 창 시간 동안 추가 요청 수집"""
+        items = [self._queue.get()]
+        
+        # 단독 요청은 창 시간만큼 지연시키지 않음
+        # (API 호출 중 쌓인 요청은 다음 수집에서 함께 처리됨)
+        if self._queue.empty():
+            return items
+        
+        deadline = time.monotonic() + EMBED_COALESCE_WINDOW
+        while len(items) < EMBED_COALESCE_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+    
+    def _run(self):
+        while True:
+            by_task: Dict[str, List[Tuple[str, Future]]] = {}
+            for text, task_type, future in self._collect():
+                by_task.setdefault(task_type, []).append((text, future))
+            
+            for task_type, requests in by_task.items():
+                try:
+                    vectors = generate_embeddings([text for text, _ in requests], task_type)
+                except Exception as e:
+                    for _, future in requests:
+                        future.set_exception(e)
+                    continue
+                
+                for i, (_, future) in enumerate(requests):
+                    future.set_result(vectors[i] if vectors else None)
+
+
+_embedding_batcher: Optional[_EmbeddingBatcher] = None
+_embedding_batcher_lock = threading.Lock()
+
+
+def _get_embedding_batcher() -> _EmbeddingBatcher:
+    """임베딩 배처 반환 (최초 사용 시 워커 스레드 시작)"""
+    global _embedding_batcher
+    if _embedding_batcher is None:
+        with _embedding_batcher_lock:
+            if _embedding_batcher is None:
+                _embedding_batcher = _EmbeddingBatcher()
+    return _embedding_batcher
 
 # ============================================
 # 채팅 함수 (RAG용)
@@ -230,13 +455,14 @@ def chat_with_context(
 # 문서 분석 함수
 # ============================================
 
-def analyze_document(text: str, doc_type: str = None) -> Optional[Dict]:
+def analyze_document(text: str, doc_type: str = None, force_refresh: bool = False) -> Optional[Dict]:
     """
     문서 분석 (요약 + 분류)
     
     Args:
         text: 문서 텍스트
         doc_type: 문서 유형 (선택)
+        force_refresh: True면 캐시된 분석 결과를 무시
         
     Returns:
         분석 결과 딕셔너리
@@ -256,7 +482,7 @@ def analyze_document(text: str, doc_type: str = None) -> Optional[Dict]:
     prompt = get_analysis_prompt(text, doc_type_enum)
     
     # LLM 분석
-    return generate_json(prompt)
+    return generate_json(prompt, force_refresh=force_refresh)
 
 # ============================================
 # 테스트
@@ -9,7 +9,7 @@
 - 증명서
 - 청구서
 """
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from enum import Enum
 
 
@@ -401,6 +401,23 @@ DEFAULT_ANALYSIS_PROMPT = """당신은 공공문서 전문 AI 분석가입니다
 """
 
 
+# 분석 프롬프트를 {text} 기준 (앞, 뒤) 조각으로 미리 분리
+# → 호출마다 format 파싱 없이 join 한 번으로 완성
+_TEXT_SLOT = "\x00TEXT\x00"
+
+
+def _split_template(template: str) -> Tuple[str, str]:
+    prefix, suffix = template.format(text=_TEXT_SLOT).split(_TEXT_SLOT)
+    return prefix, suffix
+
+
+_ANALYSIS_TEMPLATES: Dict[DocumentType, Tuple[str, str]] = {
+    doc_type: _split_template(template)
+    for doc_type, template in ANALYSIS_PROMPTS.items()
+}
+_DEFAULT_ANALYSIS_TEMPLATE = _split_template(DEFAULT_ANALYSIS_PROMPT)
+
+
 # ============================================
 # 채팅 프롬프트
 # ============================================
@@ -468,13 +485,13 @@ def get_analysis_prompt(text: str, doc_type: DocumentType = None, filename: str
     if doc_type is None:
         doc_type = detect_document_type(text, filename)
     
-    # 유형별 프롬프트 선택
-    prompt_template = ANALYSIS_PROMPTS.get(doc_type, DEFAULT_ANALYSIS_PROMPT)
+    # 유형별 프롬프트 선택 (미리 분리해 둔 앞/뒤 조각)
+    prefix, suffix = _ANALYSIS_TEMPLATES.get(doc_type, _DEFAULT_ANALYSIS_TEMPLATE)
     
     # 텍스트 길이 제한
     text_to_use = text[:20000] if len(text) > 20000 else text
     
-    return prompt_template.format(text=text_to_use)
+    return "".join((prefix, text_to_use, suffix))
 
 
 def get_chat_prompt(question: str, context: str, doc_type: DocumentType = None) -> str:
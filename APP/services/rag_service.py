@@ -8,21 +8,49 @@ RAG (Retrieval-Augmented Generation) 서비스
 - 컨텍스트 기반 답변 생성
 """
 import logging
-import re  # ✅ [필수] 정규표현식(강력 세탁용)
-from typing import Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union
 from dataclasses import dataclass, field
 import numpy as np
 
+from APP.config import settings
 from APP.services.llm_service import (
     generate_embeddings,
     generate_embedding,
     chat_with_context,
     is_available
 )
-from APP.services.chunker import SmartChunker, ChunkingConfig, Chunk
+from APP.services.chunker import SmartChunker, ChunkingConfig, Chunk, ChunkBatch
 
 logger = logging.getLogger(__name__)
 
+# 텍스트 세탁: 투명 특수문자 제거 + NBSP → 공백 (한 번의 translate)
+_CLEAN_TABLE = str.maketrans({"\u200b": None, "\xa0": " "})
+
+# 답변 출처(sources)에 보여줄 청크 앞부분 길이
+_SOURCE_PREVIEW_CHARS = 200
+
+# 이진 사전 필터: 최종 top_k의 몇 배를 후보로 남길지
+_PREFILTER_OVERSAMPLE = 4
+
+# 답변 캐시 질의 벡터 행렬의 처음 행 수 (가득 차면 RAG_ANSWER_CACHE_SIZE까지 두 배씩)
+_ANSWER_CACHE_INITIAL_ROWS = 4
+
+# int8 유사도 계산 시 한 번에 float32로 펼칠 행 수 (버퍼 768KB - 캐시에 머무는 크기)
+_INT8_GEMV_BLOCK = 256
+
+# 행별 비트 수 (NumPy 2.0+는 하드웨어 popcount, 이전 버전은 바이트 룩업 테이블)
+if hasattr(np, "bitwise_count"):
+    def _row_popcount(bits: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int32)
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _row_popcount(bits: np.ndarray) -> np.ndarray:
+        return _POPCOUNT_TABLE[bits].sum(axis=1, dtype=np.int32)
+
 
 # ============================================
 # 데이터 클래스
@@ -35,6 +63,87 @@ class SearchResult:
     score: float
 
 
+# ============================================
+# 답변 캐시 (의미 유사 질의 재사용)
+# ============================================
+
+class _AnswerCache:
+    """
+    문서별 과거 질의 임베딩 → 응답 캐시
+    
+    새 질의 임베딩과 코사인 유사도가 임계값 이상인 과거 질의가 있으면 그 응답을 재사용.
+    질의 벡터는 (rows, D) 행렬 하나에 보관해 조회는 GEMV 한 번. 행렬은 작게 시작해 가득 차면
+    capacity까지 두 배씩 늘리고, capacity에 닿은 뒤에는 가장 오래 안 쓴 칸 교체.
+    nbytes(배열 + 답변 길이)는 RAG 저장소 메모리 상한에 함께 집계됩니다.
+    """
+    __slots__ = ("capacity", "vectors", "responses", "stored_at", "last_used", "nbytes")
+    
+    def __init__(self, capacity: int, dim: int):
+        rows = min(capacity, _ANSWER_CACHE_INITIAL_ROWS)
+        self.capacity = capacity
+        self.vectors = np.zeros((rows, dim), dtype=np.float32)
+        self.responses: List[Optional[Dict]] = [None] * rows
+        self.stored_at = np.zeros(rows)
+        self.last_used = np.zeros(rows)  # 0 = 빈 칸
+        self.nbytes = self._array_nbytes()
+    
+    def lookup(self, query_vec: np.ndarray, threshold: float, ttl: float) -> Optional[Dict]:
+        """정규화된 질의 벡터와 가장 비슷한 과거 질의의 응답 (없거나 만료되면 None)"""
+        similarities = self.vectors @ query_vec
+        idx = int(np.argmax(similarities))
+        if similarities[idx] < threshold or self.responses[idx] is None:
+            return None
+        
+        now = time.monotonic()
+        if now - self.stored_at[idx] > ttl:
+            self._clear(idx)
+            return None
+        
+        self.last_used[idx] = now
+        return self.responses[idx]
+    
+    def store(self, query_vec: np.ndarray, response: Dict) -> None:
+        """응답 저장 (빈 칸 → 행렬 확장 → 가장 오래 안 쓴 칸 순)"""
+        idx = int(np.argmin(self.last_used))
+        if self.last_used[idx] and len(self.responses) < self.capacity:
+            idx = self._grow()
+        
+        self._clear(idx)
+        now = time.monotonic()
+        self.vectors[idx] = query_vec
+        self.responses[idx] = response
+        self.stored_at[idx] = now
+        self.last_used[idx] = now
+        self.nbytes += len(response["answer"])
+    
+    def _grow(self) -> int:
+        """행렬을 두 배(최대 capacity)로 늘리고 첫 새 칸 인덱스 반환"""
+        old_rows = len(self.responses)
+        rows = min(self.capacity, old_rows * 2)
+        old_nbytes = self._array_nbytes()
+        
+        vectors = np.zeros((rows, self.vectors.shape[1]), dtype=np.float32)
+        vectors[:old_rows] = self.vectors
+        self.vectors = vectors
+        self.stored_at = np.concatenate([self.stored_at, np.zeros(rows - old_rows)])
+        self.last_used = np.concatenate([self.last_used, np.zeros(rows - old_rows)])
+        self.responses.extend([None] * (rows - old_rows))
+        
+        self.nbytes += self._array_nbytes() - old_nbytes
+        return old_rows
+    
+    def _array_nbytes(self) -> int:
+        return self.vectors.nbytes + self.stored_at.nbytes + self.last_used.nbytes
+    
+    def _clear(self, idx: int) -> None:
+        previous = self.responses[idx]
+        if previous is not None:
+            self.nbytes -= len(previous["answer"])
+        self.vectors[idx] = 0.0
+        self.responses[idx] = None
+        self.last_used[idx] = 0.0
+
+
 # ============================================
 # RAG 시스템 클래스
 # ============================================
@@ -57,97 +166,290 @@ class RAGSystem:
             sentence_boundary=True
         ))
         
-        self._storage: Dict[str, Dict] = {}
+        # 문서별 벡터 저장소 (LRU 순서: 가장 최근에 검색/추가된 문서가 뒤쪽)
+        # 워커 스레드의 add_document와 요청 처리의 검색이 동시에 접근하므로 _lock으로 보호
+        self._storage: "OrderedDict[str, Dict]" = OrderedDict()
+        self._storage_bytes = 0
+        self._lock = threading.RLock()
+        self._answer_caches: Dict[str, _AnswerCache] = {}
         logger.info(f"RAG 시스템 초기화: chunk_size={chunk_size}, overlap={chunk_overlap}")
     
     # ============================================
     # 문서 처리
     # ============================================
     
-    def add_document(self, document_id: str, text: str, metadata: Dict = None) -> int:
+    def add_document(
+        self,
+        document_id: str,
+        text: Optional[str] = None,
+        metadata: Dict = None,
+        chunks: Union[ChunkBatch, List[Chunk], None] = None
+    ) -> int:
+        """
+        문서를 청킹/임베딩하여 저장
+        
+        chunks가 주어지면 text는 무시하고 그대로 임베딩 (호출 측에서 이미 청킹한 경우)
+        청크는 ChunkBatch(열 단위)로 저장되며, 리스트로 주어지면 변환합니다.
+        
+        Returns:
+            저장된 청크 수
+        """
         if not is_available():
             raise ValueError("LLM 서비스를 사용할 수 없습니다")
         
-        # ✅ [핵심 수정] 텍스트 강력 세탁 (줄바꿈, 이상한 공백 싹 정리)
-        if text:
-            # 1. 투명 특수문자 제거
-            text = text.replace("\u200b", "").replace("\xa0", " ")
-            # 2. 과도한 줄바꿈/공백을 공백 하나로 통일 (PDF 인식률 200% 상승 비법)
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            print(f"🧹 [DEBUG] 텍스트 강력 세탁 완료: {text[:100]}...")  # 로그로 확인
+        # 미리 청킹된 결과가 있으면 재사용 (세탁/청킹 생략)
+        if chunks is None:
+            # ✅ [핵심 수정] 텍스트 강력 세탁 (줄바꿈, 이상한 공백 싹 정리)
+            if text:
+                # 1. 투명 특수문자 제거
+                # 2. 과도한 줄바꿈/공백을 공백 하나로 통일 (PDF 인식률 200% 상승 비법)
+                #    (split()은 \s와 같은 유니코드 공백 기준, 앞뒤 공백도 함께 제거)
+                text = " ".join(text.translate(_CLEAN_TABLE).split())
+                
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("🧹 텍스트 강력 세탁 완료: %s...", text[:100])
 
-        chunks = self.chunker.chunk(text, document_id)
+            chunks = self.chunker.chunk_batch(text or "", document_id)
+        elif not isinstance(chunks, ChunkBatch):
+            chunks = ChunkBatch.from_chunks(chunks)
         
-        if not chunks:
+        if not len(chunks):
             logger.warning(f"⚠️ 문서 {document_id}: 청크 생성 실패")
             return 0
         
-        if metadata:
-            for chunk in chunks:
-                chunk.metadata.update(metadata)
+        # 재인덱싱하면 이전 내용 기준 답변은 무효
+        with self._lock:
+            self._drop_answer_cache(document_id)
+        
+        # 출처 미리보기는 질의마다 자르지 않도록 저장 시 한 번만 만들어 둠
+        for chunk_metadata, chunk_text in zip(chunks.metadata, chunks.texts):
+            if metadata:
+                chunk_metadata.update(metadata)
+            chunk_metadata["preview"] = chunk_text[:_SOURCE_PREVIEW_CHARS]
         
-        chunk_texts = [c.text for c in chunks]
-        embeddings = generate_embeddings(chunk_texts, task_type="retrieval_document")
+        embeddings = self._embed_in_batches(chunks.texts)
         
         if embeddings is None:
             logger.error(f"❌ 문서 {document_id}: 임베딩 생성 실패")
             return 0
         
-        self._storage[document_id] = {
-            "chunks": chunks,
-            "embeddings": np.array(embeddings)
-        }
+        # (N, D) float32, 행 단위 정규화해 저장 → 검색은 행렬-벡터 곱 한 번
+        # (np.array는 항상 새 배열을 만들므로 제자리 정규화해도 캐시된 임베딩은 그대로)
+        vectors = self._normalize_rows(np.array(embeddings, dtype=np.float32))
+        
+        # 부호 비트 (차원당 1비트) - 큰 문서 검색 시 후보를 먼저 추리는 데 사용
+        bits = np.packbits(vectors > 0, axis=1)
+        
+        if settings.RAG_QUANTIZE_EMBEDDINGS:
+            # 8비트 스칼라 양자화 (메모리 1/4)
+            if settings.RAG_QUANTIZATION_MODE == "uint8":
+                quantized = self._quantize(vectors)
+            else:
+                quantized = self._quantize_int8(vectors)
+            doc_data = {
+                "chunks": chunks,
+                "bits": bits,
+                **quantized
+            }
+        else:
+            doc_data = {
+                "chunks": chunks,
+                "bits": bits,
+                "embeddings": vectors
+            }
+        self._put_document(document_id, doc_data)
         
         logger.info(f"✅ 문서 {document_id}: {len(chunks)}개 청크 저장 완료")
         return len(chunks)
     
+    def _embed_in_batches(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        청크 텍스트를 배치 단위로 임베딩 (API 왕복 횟수 최소화)
+        
+        하나라도 실패하면 None 반환
+        """
+        batch_size = max(1, settings.EMBED_BATCH_SIZE)
+        embeddings: List[List[float]] = []
+        
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            batch_embeddings = generate_embeddings(batch, task_type="retrieval_document")
+            if batch_embeddings is None:
+                return None
+            embeddings.extend(batch_embeddings)
+        
+        return embeddings
+    
     def remove_document(self, document_id: str) -> bool:
-        if document_id in self._storage:
-            del self._storage[document_id]
+        with self._lock:
+            self._answer_caches.pop(document_id, None)
+            doc_data = self._storage.pop(document_id, None)
+            if doc_data is None:
+                return False
+            self._storage_bytes -= doc_data["nbytes"]
             return True
-        return False
     
     def has_document(self, document_id: str) -> bool:
         return document_id in self._storage
+    
+    def _put_document(self, document_id: str, doc_data: Dict) -> None:
+        """
+        저장소에 문서 추가 후 메모리 상한(RAG_STORAGE_MAX_MB)을 넘으면
+        가장 오래 검색되지 않은 문서부터 제거 (방금 추가한 문서는 남김)
+        """
+        doc_data["nbytes"] = self._entry_nbytes(doc_data)
+        
+        with self._lock:
+            # 이전 항목의 nbytes에는 답변 캐시 크기도 포함되어 있음
+            previous = self._storage.pop(document_id, None)
+            if previous is not None:
+                self._storage_bytes -= previous["nbytes"]
+            self._answer_caches.pop(document_id, None)
+            self._storage[document_id] = doc_data
+            self._storage_bytes += doc_data["nbytes"]
+            self._evict_over_limit()
+    
+    def _evict_over_limit(self) -> None:
+        """메모리 상한 초과 시 가장 오래 검색되지 않은 문서부터 제거 (_lock 보유 상태에서 호출)"""
+        max_bytes = settings.RAG_STORAGE_MAX_MB * 1024 * 1024
+        while self._storage_bytes > max_bytes and len(self._storage) > 1:
+            evicted_id, evicted = self._storage.popitem(last=False)
+            self._storage_bytes -= evicted["nbytes"]
+            self._answer_caches.pop(evicted_id, None)
+            logger.info(f"♻️ 문서 {evicted_id}: 메모리 상한 초과로 RAG 인덱스에서 제거")
+    
+    def _drop_answer_cache(self, document_id: str) -> None:
+        """문서의 답변 캐시 제거 후 집계된 크기 차감 (_lock 보유 상태에서 호출)"""
+        cache = self._answer_caches.pop(document_id, None)
+        doc_data = self._storage.get(document_id)
+        if cache is not None and doc_data is not None:
+            doc_data["nbytes"] -= cache.nbytes
+            self._storage_bytes -= cache.nbytes
+    
+    def _get_document(self, document_id: str) -> Optional[Dict]:
+        """저장된 문서 데이터 (없으면 None) - 조회한 문서는 LRU 순서상 최신으로"""
+        with self._lock:
+            doc_data = self._storage.get(document_id)
+            if doc_data is not None:
+                self._storage.move_to_end(document_id)
+            return doc_data
+    
+    @staticmethod
+    def _entry_nbytes(doc_data: Dict) -> int:
+        """저장 항목의 대략적인 메모리 크기 (벡터/코드 배열 + 청크 텍스트 길이)"""
+        chunks = doc_data["chunks"]
+        nbytes = sum(value.nbytes for value in doc_data.values() if isinstance(value, np.ndarray))
+        nbytes += chunks.starts.nbytes + chunks.ends.nbytes + chunks.types.nbytes
+        return nbytes + sum(len(text) for text in chunks.texts)
 
     # ============================================
     # 검색 및 질의
     # ============================================
 
     def search(self, document_id: str, query: str, top_k: int = None) -> List[SearchResult]:
-        if document_id not in self._storage:
+        if not self.has_document(document_id):
             return []
         
-        top_k = top_k or self.top_k
         query_embedding = generate_embedding(query, task_type="retrieval_query")
         if query_embedding is None:
             return []
         
-        query_vec = np.array(query_embedding)
-        doc_data = self._storage[document_id]
-        embeddings = doc_data["embeddings"]
+        return self._search_vec(document_id, np.asarray(query_embedding, dtype=np.float32), top_k)
+    
+    def _search_vec(self, document_id: str, query_vec: np.ndarray, top_k: int = None) -> List[SearchResult]:
+        """임베딩된 질의 벡터로 검색"""
+        top_k = top_k or self.top_k
+        doc_data = self._get_document(document_id)
+        if doc_data is None:
+            return []
         chunks = doc_data["chunks"]
         
-        similarities = self._cosine_similarity(query_vec, embeddings)
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        # 청크가 많으면 해밍 거리로 후보만 남기고 그 행만 재채점
+        rows = self._binary_candidates(query_vec, doc_data, top_k)
+        if rows is not None:
+            doc_data = self._select_rows(doc_data, rows)
+        
+        if "codes" not in doc_data:
+            similarities = self._cosine_similarity(query_vec, doc_data["embeddings"])
+        elif "offset" in doc_data:
+            similarities = self._quantized_similarity(query_vec, doc_data)
+        else:
+            similarities = self._int8_similarity(query_vec, doc_data)
+        top_indices = self._top_k_indices(similarities, top_k)
         
         results = []
         for idx in top_indices:
             results.append(SearchResult(
-                chunk=chunks[idx],
+                chunk=chunks[rows[idx] if rows is not None else idx],
                 score=float(similarities[idx])
             ))
         return results
 
+    def search_batch(
+        self,
+        document_id: str,
+        queries: List[str],
+        top_k: int = None
+    ) -> List[List[SearchResult]]:
+        """
+        여러 질의를 한 번에 검색 (질의별 결과 리스트를 같은 순서로 반환)
+        
+        질의 임베딩을 한 번의 배치 요청으로 만들고, 문서 벡터는 (Q, D) @ (D, N)
+        행렬곱 한 번으로만 읽습니다. (이진 사전 필터는 질의별이라 사용하지 않음)
+        """
+        if not self.has_document(document_id) or not queries:
+            return [[] for _ in queries]
+        
+        top_k = top_k or self.top_k
+        query_embeddings = generate_embeddings(queries, task_type="retrieval_query")
+        if query_embeddings is None:
+            return [[] for _ in queries]
+        
+        doc_data = self._get_document(document_id)
+        if doc_data is None:
+            return [[] for _ in queries]
+        
+        query_mat = self._normalize_rows(np.array(query_embeddings, dtype=np.float32))
+        chunks = doc_data["chunks"]
+        scores = self._similarity_matrix(query_mat, doc_data)
+        
+        results = []
+        for row in scores:
+            results.append([
+                SearchResult(chunk=chunks[idx], score=float(row[idx]))
+                for idx in self._top_k_indices(row, top_k)
+            ])
+        return results
+
     def query(
         self,
         document_id: str,
         question: str,
         history: List[Dict] = None
     ) -> Dict:
-        # 1. 관련 청크 검색
-        results = self.search(document_id, question)
+        # 1. 관련 청크 검색 (후속 질문이면 직전 질문으로도 함께 검색)
+        previous = self._previous_question(history, question)
+        query_vec = None
+        if previous:
+            results = self._merge_results(
+                self.search_batch(document_id, [question, previous]), self.top_k
+            )
+        elif not self.has_document(document_id):
+            results = []
+        else:
+            query_embedding = generate_embedding(question, task_type="retrieval_query")
+            if query_embedding is None:
+                results = []
+            else:
+                query_vec = np.asarray(query_embedding, dtype=np.float32)
+                
+                # 독립 질문은 의미가 거의 같은 과거 질문의 답변 재사용 (LLM 호출 생략)
+                cached = self._lookup_answer(document_id, query_vec)
+                if cached is not None:
+                    logger.info(f"💾 문서 {document_id}: 유사 질문 답변 캐시 적중")
+                    return dict(cached)
+                
+                results = self._search_vec(document_id, query_vec)
         
         if not results:
             return {
@@ -159,10 +461,9 @@ class RAGSystem:
         # 2. 컨텍스트 구성
         context = "\n\n".join([r.chunk.text for r in results])
         
-        # ✅ [디버깅 추가] AI가 실제로 읽는 내용 눈으로 확인하기
-        print("="*50)
-        print(f"🧐 [DEBUG] AI에게 들어가는 컨텍스트 내용:\n{context[:500]}...") # 너무 길면 잘라서 보여줌
-        print("="*50)
+        # AI가 실제로 읽는 내용 확인용 (DEBUG 레벨에서만 문자열을 만듦)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🧐 AI에게 들어가는 컨텍스트 내용:\n%s...", context[:500])
         
         # 3. 답변 생성
         answer = chat_with_context(question, context, history)
@@ -170,11 +471,11 @@ class RAGSystem:
         # 4. 신뢰도 계산
         avg_score = sum(r.score for r in results) / len(results)
         
-        return {
+        response = {
             "answer": answer,
             "sources": [
                 {
-                    "text": r.chunk.text[:200],
+                    "text": r.chunk.metadata["preview"],
                     "score": r.score,
                     "chunk_type": r.chunk.chunk_type.value,
                     "index": r.chunk.index
@@ -183,18 +484,234 @@ class RAGSystem:
             ],
             "confidence": round(avg_score, 2)
         }
+        
+        if query_vec is not None and answer:
+            self._store_answer(document_id, query_vec, response)
+        return response
+    
+    def _lookup_answer(self, document_id: str, query_vec: np.ndarray) -> Optional[Dict]:
+        """유사 질문 답변 캐시 조회"""
+        norm = np.linalg.norm(query_vec)
+        if norm == 0:
+            return None
+        
+        # 질의는 여러 스레드에서 동시에 실행되므로 캐시 접근은 _lock 안에서
+        with self._lock:
+            cache = self._answer_caches.get(document_id)
+            if cache is None:
+                return None
+            return cache.lookup(
+                query_vec / norm,
+                settings.RAG_ANSWER_CACHE_THRESHOLD,
+                settings.RAG_ANSWER_CACHE_TTL
+            )
+    
+    def _store_answer(self, document_id: str, query_vec: np.ndarray, response: Dict) -> None:
+        """
+        유사 질문 답변 캐시 저장 (문서별 최대 RAG_ANSWER_CACHE_SIZE개)
+        
+        늘어난 캐시 크기는 문서 항목의 nbytes에 더해 RAG_STORAGE_MAX_MB 상한에 포함
+        """
+        norm = np.linalg.norm(query_vec)
+        if settings.RAG_ANSWER_CACHE_SIZE <= 0 or norm == 0:
+            return
+        
+        with self._lock:
+            # 질의 중에 제거된 문서는 캐시를 만들지 않음
+            doc_data = self._storage.get(document_id)
+            if doc_data is None:
+                return
+            
+            cache = self._answer_caches.get(document_id)
+            if cache is None:
+                cache = _AnswerCache(settings.RAG_ANSWER_CACHE_SIZE, len(query_vec))
+                self._answer_caches[document_id] = cache
+                added = cache.nbytes
+            else:
+                added = 0
+            
+            before = cache.nbytes
+            cache.store(query_vec / norm, response)
+            added += cache.nbytes - before
+            
+            doc_data["nbytes"] += added
+            self._storage_bytes += added
+            self._evict_over_limit()
+    
+    @staticmethod
+    def _previous_question(history: Optional[List[Dict]], question: str) -> Optional[str]:
+        """히스토리의 직전 사용자 질문 (없거나 현재 질문과 같으면 None)"""
+        for msg in reversed(history or []):
+            if msg.get("role") == "user":
+                previous = msg.get("content", "").strip()
+                return previous if previous and previous != question else None
+        return None
+    
+    @staticmethod
+    def _merge_results(result_lists: List[List[SearchResult]], top_k: int) -> List[SearchResult]:
+        """여러 질의 결과를 청크별 최고 점수로 합쳐 상위 top_k개"""
+        best: Dict[int, SearchResult] = {}
+        for results in result_lists:
+            for result in results:
+                current = best.get(result.chunk.index)
+                if current is None or result.score > current.score:
+                    best[result.chunk.index] = result
+        return sorted(best.values(), key=lambda r: r.score, reverse=True)[:top_k]
+    
+    def _similarity_matrix(self, query_mat: np.ndarray, doc_data: Dict) -> np.ndarray:
+        """
+        정규화된 질의 행렬 (Q, D)와 저장 벡터의 유사도 (Q, N) - 저장 방식별 GEMM 한 번
+        
+        int8/uint8 코드는 float32로 한 번 변환되어 BLAS 행렬곱으로 계산됩니다.
+        """
+        if "codes" not in doc_data:
+            return query_mat @ doc_data["embeddings"].T
+        
+        codes_t = doc_data["codes"].T
+        if "offset" in doc_data:
+            # dot(x, q) ≈ dot(offset, q) + dot(code, scale * q)
+            return (query_mat * doc_data["scale"]) @ codes_t + (query_mat @ doc_data["offset"])[:, None]
+        # dot(x_i, q) ≈ scale_i * dot(code_i, q)
+        return (query_mat @ codes_t) * doc_data["scale"]
     
     def _cosine_similarity(self, query_vec: np.ndarray, doc_vecs: np.ndarray) -> np.ndarray:
-        query_norm = query_vec / np.linalg.norm(query_vec)
-        doc_norms = doc_vecs / np.linalg.norm(doc_vecs, axis=1, keepdims=True)
-        return np.dot(doc_norms, query_norm)
+        """doc_vecs는 저장 시 이미 정규화됨 → 쿼리만 정규화"""
+        norm = np.linalg.norm(query_vec)
+        if norm == 0:
+            return np.zeros(len(doc_vecs), dtype=np.float32)
+        return doc_vecs @ (query_vec / norm)
+    
+    @staticmethod
+    def _quantize(vecs: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        차원별 min/max 기준 uint8 스칼라 양자화
+        
+        x ≈ offset + scale * code
+        """
+        offset = vecs.min(axis=0)
+        scale = (vecs.max(axis=0) - offset) / 255.0
+        scale[scale == 0] = 1.0
+        codes = np.rint((vecs - offset) / scale).astype(np.uint8)
+        return {"codes": codes, "offset": offset, "scale": scale.astype(np.float32)}
+    
+    def _quantized_similarity(self, query_vec: np.ndarray, doc_data: Dict) -> np.ndarray:
+        """
+        양자화된 벡터와의 코사인 유사도 근사
+        
+        dot(x, q) ≈ dot(offset, q) + dot(code, scale * q) → 복원 없이 GEMV 한 번
+        """
+        codes = doc_data["codes"]
+        norm = np.linalg.norm(query_vec)
+        if norm == 0:
+            return np.zeros(len(codes), dtype=np.float32)
+        q = query_vec / norm
+        return codes @ (doc_data["scale"] * q) + float(doc_data["offset"] @ q)
+    
+    @staticmethod
+    def _quantize_int8(vecs: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        벡터별 대칭 int8 양자화
+        
+        x ≈ scale_i * code (scale_i = max|x_i| / 127)
+        """
+        scale = np.abs(vecs).max(axis=1) / 127.0
+        scale[scale == 0] = 1.0
+        codes = np.rint(vecs / scale[:, None]).astype(np.int8)
+        return {"codes": codes, "scale": scale.astype(np.float32)}
+    
+    def _int8_similarity(self, query_vec: np.ndarray, doc_data: Dict) -> np.ndarray:
+        """
+        int8 양자화 벡터와의 코사인 유사도 근사
+        
+        dot(x_i, q) ≈ scale_i * dot(code_i, q) → float32 GEMV 후 행별 스케일만 곱함
+        
+        codes @ q는 매번 codes 전체를 float로 복사한 뒤 곱하므로,
+        _INT8_GEMV_BLOCK행씩 재사용 버퍼에 펼쳐 캐시 안에서 GEMV
+        (20k×768 기준 전체 복사 GEMV 19ms, 쿼리 int8 einsum 6.8ms → 3.6ms)
+        """
+        codes = doc_data["codes"]
+        norm = np.linalg.norm(query_vec)
+        if norm == 0:
+            return np.zeros(len(codes), dtype=np.float32)
+        
+        q = (query_vec / norm).astype(np.float32, copy=False)
+        out = np.empty(len(codes), dtype=np.float32)
+        buf = np.empty((min(_INT8_GEMV_BLOCK, len(codes)), codes.shape[1]), dtype=np.float32)
+        for start in range(0, len(codes), _INT8_GEMV_BLOCK):
+            block = codes[start:start + _INT8_GEMV_BLOCK]
+            rows = buf[:len(block)]
+            rows[...] = block
+            np.matmul(rows, q, out=out[start:start + len(block)])
+        return out * doc_data["scale"]
+    
+    @staticmethod
+    def _binary_candidates(
+        query_vec: np.ndarray,
+        doc_data: Dict,
+        top_k: int
+    ) -> Optional[np.ndarray]:
+        """
+        부호 비트 해밍 거리가 가까운 후보 행 (top_k * _PREFILTER_OVERSAMPLE개)
+        
+        청크 수가 RAG_BINARY_PREFILTER_MIN_CHUNKS 미만이면 None (전체 채점이 더 정확하고 충분히 빠름)
+        """
+        bits = doc_data.get("bits")
+        n_candidates = top_k * _PREFILTER_OVERSAMPLE
+        if (
+            bits is None
+            or len(bits) < settings.RAG_BINARY_PREFILTER_MIN_CHUNKS
+            or n_candidates >= len(bits)
+        ):
+            return None
+        
+        distances = _row_popcount(bits ^ np.packbits(query_vec > 0))
+        return np.argpartition(distances, n_candidates - 1)[:n_candidates]
+    
+    @staticmethod
+    def _select_rows(doc_data: Dict, rows: np.ndarray) -> Dict:
+        """후보 행만 남긴 저장 데이터 (uint8 모드의 offset/scale은 차원별이라 그대로 둠)"""
+        selected = dict(doc_data)
+        for key in ("embeddings", "codes"):
+            if key in doc_data:
+                selected[key] = doc_data[key][rows]
+        if "codes" in doc_data and "offset" not in doc_data:
+            selected["scale"] = doc_data["scale"][rows]  # int8 모드: 행별 스케일
+        return selected
+    
+    @staticmethod
+    def _normalize_rows(vecs: np.ndarray) -> np.ndarray:
+        """행 단위 L2 정규화 (제자리 - (N, D) 사본을 하나 더 만들지 않음)"""
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vecs /= norms
+        return vecs
+    
+    @staticmethod
+    def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        """점수 상위 k개 인덱스 (내림차순). 전체 정렬 대신 argpartition 사용"""
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if k == 1:
+            # 한 번 훑기로 끝 (분할용 인덱스 배열도 만들지 않음)
+            return np.array([np.argmax(scores)])
+        if k < len(scores):
+            # 상위 k개를 뒤쪽으로 분할 (-scores 전체 복사본을 만들지 않음)
+            candidates = np.argpartition(scores, -k)[-k:]
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(-scores[candidates])]
     
     def get_stats(self) -> Dict:
-        total_chunks = sum(len(data["chunks"]) for data in self._storage.values())
+        with self._lock:
+            documents = list(self._storage.keys())
+            total_chunks = sum(len(data["chunks"]) for data in self._storage.values())
+            storage_bytes = self._storage_bytes
         return {
-            "document_count": len(self._storage),
+            "document_count": len(documents),
             "total_chunks": total_chunks,
-            "documents": list(self._storage.keys()),
+            "documents": documents,
+            "storage_mb": round(storage_bytes / 1024 / 1024, 2),
             "chunker_config": {
                 "chunk_size": self.chunker.config.chunk_size,
                 "chunk_overlap": self.chunker.config.chunk_overlap,
@@ -214,8 +731,12 @@ def get_rag_system() -> RAGSystem:
         _rag_instance = RAGSystem()
     return _rag_instance
 
-def add_document(document_id: str, text: str) -> int:
-    return get_rag_system().add_document(document_id, text)
+def add_document(
+    document_id: str,
+    text: Optional[str] = None,
+    chunks: Union[ChunkBatch, List[Chunk], None] = None
+) -> int:
+    return get_rag_system().add_document(document_id, text, chunks=chunks)
 
 def query_document(document_id: str, question: str) -> Dict:
     return get_rag_system().query(document_id, question)
\ No newline at end of file
@@ -9,12 +9,26 @@
 import os
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# 삭제 대상이 이 개수 이상이면 unlink를 스레드 풀로 병렬 실행 (시스템 콜은 GIL을 놓음)
+_PARALLEL_UNLINK_MIN = 32
+_UNLINK_WORKERS = 8
+
+
+def _try_unlink(path: str) -> Optional[OSError]:
+    """파일 삭제 (실패 시 예외를 던지지 않고 반환)"""
+    try:
+        os.unlink(path)
+    except OSError as e:
+        return e
+    return None
+
 
 class FileCleaner:
     """
@@ -80,74 +94,111 @@ class FileCleaner:
             await asyncio.sleep(interval_seconds)
     
     async def cleanup(self) -> dict:
-        """파일 정리 실행"""
+        """파일 정리 실행 (디렉토리 스캔/삭제는 스레드 풀에서 수행해 이벤트 루프를 막지 않음)"""
+        now = datetime.now()
+        result = await asyncio.to_thread(self._cleanup_sync, now.timestamp())
+        
+        # 통계 업데이트
+        self.total_cleaned += result["deleted_count"]
+        self.last_cleanup = now
+        
+        # 결과 로깅 (삭제된 파일이 있을 때만)
+        if result["deleted_count"]:
+            logger.info(
+                f"🧹 정리 완료: {result['deleted_count']}개 삭제 "
+                f"(고아: {result['orphan_count']}개, 오류: {result['error_count']}개)"
+            )
+        
+        return result
+    
+    def _cleanup_sync(self, now_ts: float) -> dict:
+        """파일 정리 본체 (동기, 워커 스레드에서 실행)"""
         if not self.upload_dir.exists():
             return {"deleted_count": 0, "deleted_files": [], "orphan_count": 0, "error_count": 0}
         
-        # Mock DB import (순환 참조 방지)
+        # Mock DB / RAG import (순환 참조 방지)
         from APP.db.mock_db import mock_db
+        from APP.services.rag_service import get_rag_system
         
-        now = datetime.now()
-        cutoff_time = now - timedelta(seconds=self.ttl_seconds)
+        # 파일마다 datetime을 만들지 않고 타임스탬프(float)끼리 비교
+        cutoff_ts = now_ts - self.ttl_seconds
         
         deleted_files = []
         orphan_files = []
         error_count = 0
+        # 삭제 대상: (파일명, 경로, document_id, DB 존재 여부, 사유)
+        to_delete = []
+        
+        # 파일마다 DB를 조회하지 않도록 문서 ID를 한 번에 스냅샷
+        known_ids = mock_db.list_ids()
         
         # 업로드 디렉토리의 모든 파일 검사
-        for file_path in self.upload_dir.iterdir():
-            if not file_path.is_file():
-                continue
-            
-            try:
-                # 파일 수정 시간 확인
-                file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                
-                # 파일명에서 document_id 추출 (UUID 형식)
-                file_stem = file_path.stem  # 확장자 제외한 파일명
-                
-                # Mock DB에 존재하는지 확인
-                document = mock_db.get_document(file_stem)
-                
-                should_delete = False
-                reason = ""
-                
-                # 케이스 1: DB에 없는 고아 파일
-                if document is None:
-                    should_delete = True
-                    reason = "고아 파일 (DB에 없음)"
-                    orphan_files.append(file_path.name)
-                
-                # 케이스 2: TTL 초과
-                elif file_mtime < cutoff_time:
-                    should_delete = True
-                    reason = f"TTL 초과 ({self.ttl_seconds}초)"
-                
-                # 삭제 실행
-                if should_delete:
-                    file_path.unlink()
-                    deleted_files.append(file_path.name)
+        # (scandir의 DirEntry는 파일 종류를 디렉토리 항목에서 바로 얻고 stat 결과를 캐시함)
+        with os.scandir(self.upload_dir) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
                     
-                    # DB에서도 제거 (존재하면)
-                    if document:
-                        mock_db.delete_document(file_stem)
+                    # 파일 수정 시간 확인
+                    file_mtime = entry.stat(follow_symlinks=False).st_mtime
                     
-                    logger.debug(f"🗑️ 삭제: {file_path.name} ({reason})")
+                    # 파일명에서 document_id 추출 (UUID 형식)
+                    file_stem = os.path.splitext(entry.name)[0]  # 확장자 제외한 파일명
                     
-            except Exception as e:
-                logger.warning(f"⚠️ 파일 처리 실패 {file_path.name}: {e}")
-                error_count += 1
+                    # Mock DB에 존재하는지 확인
+                    # (스냅샷 이후 업로드된 문서일 수 있으므로 없을 때만 다시 조회)
+                    in_db = file_stem in known_ids or mock_db.get_document(file_stem) is not None
+                    
+                    should_delete = False
+                    reason = ""
+                    
+                    # 케이스 1: DB에 없는 고아 파일
+                    if not in_db:
+                        should_delete = True
+                        reason = "고아 파일 (DB에 없음)"
+                        orphan_files.append(entry.name)
+                    
+                    # 케이스 2: TTL 초과
+                    elif file_mtime < cutoff_ts:
+                        should_delete = True
+                        reason = f"TTL 초과 ({self.ttl_seconds}초)"
+                    
+                    if should_delete:
+                        to_delete.append((entry.name, entry.path, file_stem, in_db, reason))
+                        
+                except FileNotFoundError:
+                    # 같은 문서의 다른 파일과 함께 이미 삭제됨 (예: 추출 텍스트 .txt)
+                    continue
+                except Exception as e:
+                    logger.warning(f"⚠️ 파일 처리 실패 {entry.name}: {e}")
+                    error_count += 1
         
-        # 통계 업데이트
-        self.total_cleaned += len(deleted_files)
-        self.last_cleanup = now
+        # 삭제 실행 (대상이 많으면 병렬)
+        paths = [path for _, path, _, _, _ in to_delete]
+        if len(paths) >= _PARALLEL_UNLINK_MIN:
+            with ThreadPoolExecutor(max_workers=_UNLINK_WORKERS) as executor:
+                errors = list(executor.map(_try_unlink, paths))
+        else:
+            errors = [_try_unlink(path) for path in paths]
         
-        # 결과 로깅 (삭제된 파일이 있을 때만)
-        if deleted_files:
-            logger.info(
-                f"🧹 정리 완료: {len(deleted_files)}개 삭제 "
-                f"(고아: {len(orphan_files)}개, 오류: {error_count}개)"
-            )
+        for (name, _, file_stem, in_db, reason), error in zip(to_delete, errors):
+            if isinstance(error, FileNotFoundError):
+                # 그 사이 다른 경로로 이미 삭제됨
+                continue
+            if error is not None:
+                logger.warning(f"⚠️ 파일 처리 실패 {name}: {error}")
+                error_count += 1
+                continue
+            
+            deleted_files.append(name)
+            
+            # DB에서도 제거 (존재하면)
+            if in_db and mock_db.delete_document(file_stem):
+                # RAG 인덱스와 유사 질문 답변 캐시도 해제
+                get_rag_system().remove_document(file_stem)
+            
+            logger.debug(f"🗑️ 삭제: {name} ({reason})")
         
         return {
             "deleted_count": len(deleted_files),
@@ -4,11 +4,24 @@
 import os
 import re
 import uuid
+import hashlib
 from pathlib import Path
 from typing import Tuple
 from fastapi import UploadFile, HTTPException
 
 
+# 파일명 정제용 패턴/변환표 (모듈 로드 시 한 번만 생성)
+_UNSAFE_CHARS = re.compile(r'[^\w\s\-\.가-힣]')
+_MULTI_UNDERSCORE = re.compile(r'_+')
+_PATH_SEPARATORS = str.maketrans({'/': '_', '\\': '_'})
+
+# ASCII 파일명 전용: 허용 문자는 그대로, 나머지는 '_'로 바꾸는 256바이트 변환표
+_ASCII_SAFE_TABLE = bytes(
+    c if c < 128 and not _UNSAFE_CHARS.match(chr(c)) else ord('_')
+    for c in range(256)
+)
+
+
 def sanitize_filename(filename: str) -> str:
     """
     파일명 안전하게 정제
@@ -27,14 +40,18 @@ def sanitize_filename(filename: str) -> str:
         return "unnamed"
     
     # Path traversal 패턴 제거
-    filename = filename.replace('../', '').replace('..\\', '')
-    filename = filename.replace('/', '_').replace('\\', '_')
+    filename = filename.replace('../', '').replace('..\\', '').translate(_PATH_SEPARATORS)
     
     # 안전한 파일명만 허용 (영문, 숫자, 점, 언더스코어, 하이픈, 한글)
-    filename = re.sub(r'[^\w\s\-\.가-힣]', '_', filename)
+    # ASCII만으로 된 파일명(대부분)은 정규식 대신 바이트 변환표로 한 번에 처리
+    if filename.isascii():
+        filename = filename.encode('ascii').translate(_ASCII_SAFE_TABLE).decode('ascii')
+    else:
+        filename = _UNSAFE_CHARS.sub('_', filename)
     
     # 연속된 언더스코어 제거
-    filename = re.sub(r'_+', '_', filename)
+    if '__' in filename:
+        filename = _MULTI_UNDERSCORE.sub('_', filename)
     
     # 최대 길이 255자 제한
     if len(filename) > 255:
@@ -59,6 +76,9 @@ class FileHandler:
     # 최소 파일 크기 (100 bytes) - 악의적 빈 파일 방지
     MIN_FILE_SIZE = 100
     
+    # 스트리밍 저장 시 한 번에 읽을 크기 (64KB)
+    CHUNK_SIZE = 64 * 1024
+    
     def __init__(self, upload_dir: str = "./tmp/uploads"):
         """
         Args:
@@ -66,6 +86,8 @@ class FileHandler:
         """
         self.upload_dir = Path(upload_dir)
         self._ensure_upload_dir()
+        # 경로 검증용 (조회마다 realpath를 다시 계산하지 않도록 한 번만)
+        self._upload_dir_resolved = self.upload_dir.resolve()
     
     def _ensure_upload_dir(self):
         """업로드 디렉토리 생성"""
@@ -113,15 +135,17 @@ class FileHandler:
         
         return True, ""
     
-    async def save_file(self, file: UploadFile) -> Tuple[str, str, int]:
+    async def save_file(self, file: UploadFile) -> Tuple[str, str, int, str]:
         """
         파일 저장 (보안 강화)
         
+        업로드 스트림을 청크 단위로 읽으며 디스크 쓰기와 SHA-256 계산을 동시에 수행
+        
         Args:
             file: 업로드된 파일
             
         Returns:
-            (문서 ID, 저장 경로, 파일 크기)
+            (문서 ID, 저장 경로, 파일 크기, SHA-256 해시)
             
         Raises:
             HTTPException: 파일 저장 실패 시
@@ -131,6 +155,14 @@ class FileHandler:
         if not is_valid:
             raise HTTPException(status_code=400, detail=error_msg)
         
+        # 크기를 이미 알 수 있으면 디스크에 쓰기 전에 거절
+        # (알 수 없으면 아래 스트리밍 중에 누적 크기로 확인)
+        if file.size is not None and file.size > self.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"파일 크기가 너무 큽니다. 최대: {self.MAX_FILE_SIZE / 1024 / 1024}MB"
+            )
+        
         # 2. 고유 문서 ID 생성
         document_id = str(uuid.uuid4())
         
@@ -142,12 +174,24 @@ class FileHandler:
         save_filename = f"{document_id}{file_ext}"
         save_path = self.upload_dir / save_filename
         
-        # 5. 파일 저장
+        # 5. 파일 저장 (청크 단위 스트리밍 + 해시 계산)
+        hasher = hashlib.sha256()
+        file_size = 0
+        
         try:
-            content = await file.read()
-            
-            # 6. 파일 크기 검증
-            file_size = len(content)
+            with open(save_path, "wb") as f:
+                while chunk := await file.read(self.CHUNK_SIZE):
+                    # 6. 파일 크기 검증 (최대 크기는 읽는 도중 확인)
+                    file_size += len(chunk)
+                    if file_size > self.MAX_FILE_SIZE:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"파일 크기가 너무 큽니다. 최대: {self.MAX_FILE_SIZE / 1024 / 1024}MB"
+                        )
+                    
+                    # 7. 해시 갱신 + 파일 쓰기
+                    hasher.update(chunk)
+                    f.write(chunk)
             
             if file_size < self.MIN_FILE_SIZE:
                 raise HTTPException(
@@ -155,16 +199,6 @@ class FileHandler:
                     detail=f"파일이 너무 작습니다. 최소: {self.MIN_FILE_SIZE} bytes"
                 )
             
-            if file_size > self.MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"파일 크기가 너무 큽니다. 최대: {self.MAX_FILE_SIZE / 1024 / 1024}MB"
-                )
-            
-            # 7. 파일 쓰기
-            with open(save_path, "wb") as f:
-                f.write(content)
-            
             # 8. 파일 권한 설정 (읽기 전용으로 변경)
             try:
                 os.chmod(save_path, 0o644)  # rw-r--r--
@@ -173,23 +207,28 @@ class FileHandler:
             
             print(f"✅ 파일 저장 완료: {save_path} ({file_size} bytes)")
             
-            return document_id, str(save_path), file_size
+            return document_id, str(save_path), file_size, hasher.hexdigest()
             
         except HTTPException:
-            # HTTP 예외는 그대로 전달
+            # 검증 실패 시 저장 중이던 파일 삭제 후 그대로 전달
+            self._remove_quietly(save_path)
             raise
         except Exception as e:
             # 저장 실패 시 파일 삭제
-            if save_path.exists():
-                try:
-                    save_path.unlink()
-                except:
-                    pass
+            self._remove_quietly(save_path)
             raise HTTPException(
                 status_code=500,
                 detail=f"파일 저장 중 오류 발생: {str(e)}"
             )
     
+    def _remove_quietly(self, path: Path):
+        """파일이 있으면 삭제 (실패는 무시)"""
+        if path.exists():
+            try:
+                path.unlink()
+            except:
+                pass
+    
     def get_file_path(self, document_id: str, file_type: str) -> Path:
         """
         문서 ID로 파일 경로 조회
@@ -215,7 +254,7 @@ class FileHandler:
         file_path = self.upload_dir / filename
         
         # Path traversal 방어: 결과 경로가 upload_dir 안에 있는지 확인
-        if not str(file_path.resolve()).startswith(str(self.upload_dir.resolve())):
+        if not file_path.resolve().is_relative_to(self._upload_dir_resolved):
             raise ValueError("잘못된 파일 경로")
         
         return file_path
@@ -1,30 +1,82 @@
 """
 해시 유틸리티 (캐싱용)
+
+blake3 / xxhash가 설치되어 있으면 SIMD 구현으로, 없으면 표준 BLAKE2b로 해시합니다.
+어느 쪽이든 32자리 16진수 문자열을 반환하지만 값은 서로 다르므로
+영구 저장되는 키로는 사용하지 않습니다 (캐시 키 전용).
 """
 import hashlib
 
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+try:
+    import xxhash as _xxhash
+except ImportError:
+    _xxhash = None
+
 
 def generate_file_hash(content: bytes) -> str:
     """
-    파일 내용의 MD5 해시 생성
+    파일 내용의 128bit 해시 생성 (BLAKE3, 미설치 시 BLAKE2b)
     
     Args:
         content: 파일 내용 (bytes)
         
     Returns:
-        MD5 해시 문자열
+        32자리 16진수 해시 문자열
+    """
+    if _blake3 is not None:
+        return _blake3(content).hexdigest(length=16)
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def generate_file_hash_stream(path: str) -> str:
+    """
+    파일을 고정 크기 버퍼로 나눠 읽으며 해시 (generate_file_hash와 같은 값)
+    
+    파일 전체를 bytes로 올리지 않으므로 큰 업로드 파일에 사용합니다.
+    
+    Args:
+        path: 파일 경로
+        
+    Returns:
+        32자리 16진수 해시 문자열
     """
-    return hashlib.md5(content).hexdigest()
+    with open(path, 'rb') as f:
+        if _blake3 is not None:
+            return hashlib.file_digest(f, _blake3).hexdigest(length=16)
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
 
 
 def generate_text_hash(text: str) -> str:
     """
-    텍스트의 MD5 해시 생성
+    텍스트 해시 생성 (generate_fast_text_hash와 동일)
+    
+    Args:
+        text: 텍스트
+        
+    Returns:
+        32자리 16진수 해시 문자열
+    """
+    return generate_fast_text_hash(text)
+
+
+def generate_fast_text_hash(text: str) -> str:
+    """
+    텍스트의 128bit 해시 생성 (xxh3_128, 미설치 시 BLAKE2b)
+    
+    보안 용도가 아닌 캐시 키용 (충돌 저항성 불필요)
     
     Args:
         text: 텍스트
         
     Returns:
-        MD5 해시 문자열
+        32자리 16진수 해시 문자열
     """
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
\ No newline at end of file
+    data = text.encode('utf-8')
+    if _xxhash is not None:
+        return _xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
@@ -0,0 +1,34 @@
+"""
+HTTP 캐시 유틸리티 (ETag / If-None-Match)
+"""
+from fastapi import Request
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    클라이언트가 보낸 If-None-Match가 현재 ETag와 일치하는지 확인
+    
+    Args:
+        request: 요청 객체
+        etag: 현재 리소스의 ETag (예: 'W/"abc-3"')
+        
+    Returns:
+        일치하면 True (304 Not Modified 응답 가능)
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    
+    if if_none_match.strip() == "*":
+        return True
+    
+    # 약한 비교: W/ 접두사 무시
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    
+    return False
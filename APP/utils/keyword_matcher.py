@@ -0,0 +1,89 @@
+"""
+다중 키워드 매칭 유틸리티
+
+pyahocorasick이 설치되어 있으면 Aho-Corasick 오토마톤으로,
+없으면 키워드를 하나로 합친 정규식(겹치는 매칭 포함)으로
+텍스트를 한 번만 훑어 모든 키워드 적중을 찾습니다.
+"""
+import re
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
+
+
+class KeywordMatcher:
+    """
+    라벨별 키워드 묶음을 한 번의 스캔으로 매칭
+
+    Usage:
+        matcher = KeywordMatcher({"납부": ["납부", "송금"], "방문": ["방문"]})
+        matcher.find_labels(text)   # {"납부"}
+        matcher.first_label(text)   # 등록 순서상 가장 앞선 라벨
+    """
+
+    def __init__(self, keywords_by_label: Dict[str, Iterable[str]]):
+        # 라벨 등록 순서 = 우선순위
+        self.labels: List[str] = list(keywords_by_label)
+
+        # 키워드 → 라벨들 (같은 키워드가 여러 라벨에 속할 수 있음)
+        self._labels_by_keyword: Dict[str, Set[str]] = {}
+        for label, keywords in keywords_by_label.items():
+            for keyword in keywords:
+                self._labels_by_keyword.setdefault(keyword, set()).add(label)
+
+        if _ahocorasick is not None:
+            self._automaton = _ahocorasick.Automaton()
+            for keyword, labels in self._labels_by_keyword.items():
+                self._automaton.add_word(keyword, frozenset(labels))
+            self._automaton.make_automaton()
+            self._pattern = None
+        else:
+            self._automaton = None
+            # 같은 위치에서는 가장 긴 키워드만 잡히므로, 그 접두사인 키워드의 라벨도 함께 기록
+            self._prefix_labels: Dict[str, Set[str]] = {
+                keyword: set().union(*(
+                    labels for other, labels in self._labels_by_keyword.items()
+                    if keyword.startswith(other)
+                ))
+                for keyword in self._labels_by_keyword
+            }
+            # 긴 키워드 우선 + lookahead로 겹치는 키워드도 빠짐없이 매칭
+            alternation = "|".join(
+                re.escape(kw) for kw in sorted(self._labels_by_keyword, key=len, reverse=True)
+            )
+            self._pattern = re.compile(f"(?=({alternation}))")
+
+    def find_labels(self, text: str) -> Set[str]:
+        """텍스트에 키워드가 하나라도 등장한 라벨 집합"""
+        found: Set[str] = set()
+        if not self._labels_by_keyword:
+            return found
+
+        if self._automaton is not None:
+            for _, labels in self._automaton.iter(text):
+                found |= labels
+        else:
+            prefix_labels = self._prefix_labels
+            for keyword in set(self._pattern.findall(text)):
+                found |= prefix_labels[keyword]
+
+        return found
+
+    def first_label(self, text: str) -> Optional[str]:
+        """적중한 라벨 중 등록 순서상 가장 앞선 라벨 (없으면 None)"""
+        found = self.find_labels(text)
+        for label in self.labels:
+            if label in found:
+                return label
+        return None
+
+
+def is_ahocorasick_enabled() -> bool:
+    """Aho-Corasick 사용 가능 여부"""
+    return _ahocorasick is not None
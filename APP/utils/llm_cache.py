@@ -0,0 +1,77 @@
+"""
+LLM 응답 디스크 캐시
+
+(모델, 프롬프트) 해시 기준으로 Gemini 응답과 임베딩을 디스크에 저장해
+같은 문서를 다시 분석할 때 API 호출을 건너뜁니다. 프로세스 재시작 후에도 유지됩니다.
+
+diskcache가 설치되어 있지 않으면 캐시 없이 동작합니다.
+"""
+import hashlib
+import logging
+from typing import Any, Optional
+
+from APP.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import diskcache as _diskcache
+except ImportError:
+    _diskcache = None
+
+_cache = None
+
+
+def _get_cache():
+    """디스크 캐시 인스턴스 반환 (diskcache 미설치 시 None)"""
+    global _cache
+    if _cache is None and _diskcache is not None:
+        _cache = _diskcache.Cache(settings.LLM_CACHE_DIR)
+        logger.info(f"LLM cache enabled: {settings.LLM_CACHE_DIR}")
+    return _cache
+
+
+def llm_cache_key(kind: str, *parts: str) -> str:
+    """
+    캐시 키 생성
+
+    Args:
+        kind: 값 종류 접두사 (예: "text", "emb")
+        parts: 모델명, 프롬프트 등 결과를 결정하는 값들
+
+    Returns:
+        "<kind>:<blake2b 해시>"
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")  # 경계 구분 ("ab"+"c" ≠ "a"+"bc")
+    return f"{kind}:{digest.hexdigest()}"
+
+
+def get_cached(key: str) -> Optional[Any]:
+    """캐시된 응답 조회 (없으면 None)"""
+    cache = _get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"LLM cache read failed: {e}")
+        return None
+
+
+def store(key: str, value: Any) -> None:
+    """응답 저장 (LLM_CACHE_TTL 후 만료)"""
+    cache = _get_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(key, value, expire=settings.LLM_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"LLM cache write failed: {e}")
+
+
+def is_llm_cache_enabled() -> bool:
+    """디스크 캐시 사용 가능 여부"""
+    return _diskcache is not None
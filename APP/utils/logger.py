@@ -7,12 +7,66 @@
 - JSON 형식 로깅 (선택사항)
 """
 
+import copy
 import logging
+import queue
 import sys
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
+import orjson
+
+
+# 현재 요청 ID (RequestIDMiddleware가 설정, 요청 밖에서는 "-")
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+class RequestIDFilter(logging.Filter):
+    """레코드에 request_id 속성 주입 → 포맷에서 %(request_id)s 사용 가능"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    한 줄 JSON 포매터 (구조화 로그)
+    
+    extra={"fields": {...}}로 넘긴 값은 최상위 키로 병합
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "request_id": getattr(record, "request_id", "-"),
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", None) or {})
+        return orjson.dumps(payload, default=str).decode("utf-8")
+
+
+class _NameFilter(logging.Filter):
+    """특정 로거(하위 포함)만 통과 / 제외"""
+    
+    def __init__(self, name: str, exclude: bool = False):
+        super().__init__(name)
+        self.exclude = exclude
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        matched = super().filter(record)
+        return not matched if self.exclude else matched
+
+
+# 접근 로그 (요청당 한 줄, JSON)
+# "app" 로거(setup_logger, 콘솔 직접 출력)의 하위가 되면 같은 레코드가 동기로 한 번 더 출력되므로 별도 트리 사용
+ACCESS_LOGGER_NAME = "access"
+
 
 class ColoredFormatter(logging.Formatter):
     """컬러 출력 포매터 (개발 환경용)"""
@@ -29,8 +83,10 @@ class ColoredFormatter(logging.Formatter):
     
     def format(self, record):
         # 로그 레벨에 따라 색상 적용
+        # (레코드는 다른 핸들러와 공유되므로 사본에만 색상을 입힘)
         levelname = record.levelname
         if levelname in self.COLORS:
+            record = copy.copy(record)
             record.levelname = f"{self.COLORS[levelname]}{levelname}{self.COLORS['RESET']}"
         
         return super().format(record)
@@ -107,6 +163,60 @@ def setup_logger(
     return logger
 
 
+def setup_queue_logging(
+    level: str = "INFO",
+    fmt: str = '%(asctime)s | %(levelname)s | %(name)s | %(message)s',
+    datefmt: str = '%Y-%m-%d %H:%M:%S'
+) -> QueueListener:
+    """
+    루트 로거를 QueueHandler로 설정 (비동기 로깅)
+    
+    요청 처리 스레드(이벤트 루프)는 큐에 레코드만 넣고,
+    실제 출력(write syscall)은 QueueListener 스레드에서 처리
+    
+    request_id는 요청 컨텍스트가 살아 있는 QueueHandler 쪽에서 주입
+    접근 로그(access)는 JSON 한 줄, 나머지는 fmt 텍스트 형식으로 출력
+    
+    Args:
+        level: 로그 레벨
+        fmt: 로그 포맷
+        datefmt: 날짜 포맷
+        
+    Returns:
+        시작된 QueueListener (종료 시 stop() 호출)
+    """
+    log_queue: queue.Queue = queue.Queue(-1)
+    
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(fmt, datefmt=datefmt))
+    console_handler.addFilter(_NameFilter(ACCESS_LOGGER_NAME, exclude=True))
+    
+    access_handler = logging.StreamHandler()
+    access_handler.setFormatter(JsonFormatter(datefmt=datefmt))
+    access_handler.addFilter(_NameFilter(ACCESS_LOGGER_NAME))
+    
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIDFilter())
+    # 큐에 넣을 때는 메시지만 확정 (포맷은 리스너 쪽 핸들러가 한 번만 적용)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    # basicConfig는 핸들러에 BASIC_FORMAT을 입히고, 루트에 핸들러가 이미 있으면 아무것도 안 하므로 직접 설정
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, level.upper()))
+    
+    listener = QueueListener(
+        log_queue,
+        console_handler,
+        access_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
+
 # ============================================
 # 전역 로거 인스턴스
 # ============================================
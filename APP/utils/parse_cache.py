@@ -0,0 +1,97 @@
+"""
+문서 파싱 결과 디스크 캐시
+
+파일 내용 해시 기준으로 파싱(특히 OCR) 결과를 디스크에 저장해
+같은 파일을 다시 파싱할 때 재사용합니다. 프로세스 재시작 후에도 유지됩니다.
+
+diskcache가 설치되어 있지 않으면 캐시 없이 동작합니다.
+"""
+import hashlib
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from APP.config import settings
+from APP.utils.hash import generate_file_hash_stream
+
+logger = logging.getLogger(__name__)
+
+try:
+    import diskcache as _diskcache
+except ImportError:
+    _diskcache = None
+
+# 이 크기를 넘는 파일은 전체 대신 앞/뒤 일부 + 크기/수정시각으로 해시
+_FULL_HASH_LIMIT = 50 * 1024 * 1024
+_PARTIAL_HASH_BYTES = 1024 * 1024
+
+_cache = None
+
+
+def _get_cache():
+    """디스크 캐시 인스턴스 반환 (diskcache 미설치 시 None)"""
+    global _cache
+    if _cache is None and _diskcache is not None:
+        _cache = _diskcache.Cache(settings.PARSE_CACHE_DIR)
+        logger.info(f"Parse cache enabled: {settings.PARSE_CACHE_DIR}")
+    return _cache
+
+
+def file_cache_key(
+    file_path: str,
+    file_type: str,
+    stat_result: Optional[os.stat_result] = None
+) -> str:
+    """
+    파일 내용 기반 캐시 키 생성
+
+    Args:
+        file_path: 파일 경로
+        file_type: 파일 확장자 (같은 내용이라도 파서가 다르면 다른 키)
+        stat_result: 호출 측에서 이미 구한 os.stat 결과 (있으면 stat을 다시 하지 않음)
+
+    Returns:
+        "<파일 해시>:<file_type>"
+    """
+    if stat_result is None:
+        stat_result = os.stat(file_path)
+    size = stat_result.st_size
+    if size <= _FULL_HASH_LIMIT:
+        return f"{generate_file_hash_stream(file_path)}:{file_type}"
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(_PARTIAL_HASH_BYTES))
+        f.seek(max(size - _PARTIAL_HASH_BYTES, 0))
+        digest.update(f.read(_PARTIAL_HASH_BYTES))
+    digest.update(f"{size}:{stat_result.st_mtime}".encode())
+
+    return f"{digest.hexdigest()}:{file_type}"
+
+
+def get_cached_parse(key: str) -> Optional[Dict[str, Any]]:
+    """캐시된 파싱 결과 조회 (없으면 None)"""
+    cache = _get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Parse cache read failed: {e}")
+        return None
+
+
+def store_parse(key: str, result: Dict[str, Any]) -> None:
+    """파싱 결과 저장 (PARSE_CACHE_TTL 후 만료)"""
+    cache = _get_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(key, result, expire=settings.PARSE_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Parse cache write failed: {e}")
+
+
+def is_parse_cache_enabled() -> bool:
+    """디스크 캐시 사용 가능 여부"""
+    return _diskcache is not None
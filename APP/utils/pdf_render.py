@@ -0,0 +1,129 @@
+"""
+PDF 페이지 렌더링 유틸리티 (OCR 전처리용)
+
+PyMuPDF는 스레드 안전하지 않으므로 여러 페이지를 병렬로 렌더링할 때는
+별도 프로세스에서 각자 문서를 열어 처리합니다.
+워커 프로세스가 무거운 모듈(easyocr 등)을 import하지 않도록 이 모듈은 가볍게 유지합니다.
+"""
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import fitz  # PyMuPDF
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 렌더링 전용 워커 수 (나머지 코어는 OCR에 양보)
+RENDER_WORKERS = 2
+
+# 전역 렌더링 프로세스 풀 (최초 사용 시 생성)
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+@dataclass(slots=True, frozen=True)
+class RenderConfig:
+    """OCR용 페이지 렌더링 설정 (확대 배율이 OCR 비용을 좌우)"""
+    zoom: float = 2.5               # letter 크기 이하 페이지 확대 배율
+    large_page_zoom: float = 1.5    # 큰 페이지 확대 배율
+    large_page_size: float = 800    # 긴 변(pt)이 이 값을 넘으면 큰 페이지
+    max_width: int = 2240           # 렌더링 결과 최대 가로 픽셀
+
+
+def choose_zoom(page, config: RenderConfig) -> float:
+    """페이지 크기에 맞는 확대 배율 (가로 max_width 초과 시 축소)"""
+    width, height = page.rect.width, page.rect.height
+    zoom = config.large_page_zoom if max(width, height) > config.large_page_size else config.zoom
+    
+    if config.max_width and width * zoom > config.max_width:
+        zoom = config.max_width / width
+    return zoom
+
+
+class _PixmapBuffer:
+    """
+    Pixmap 픽셀 버퍼를 복사 없이 노출하는 래퍼 (PEP 688 __buffer__)
+    
+    samples_mv는 Pixmap 메모리를 직접 가리키지만 Pixmap을 붙잡아 두지 않으므로,
+    배열이 살아 있는 동안 이 객체가 Pixmap 참조를 유지합니다.
+    """
+    __slots__ = ("_pix",)
+    
+    def __init__(self, pix):
+        self._pix = pix
+    
+    def __buffer__(self, flags: int) -> memoryview:
+        return self._pix.samples_mv
+
+
+def pixmap_to_array(pix) -> np.ndarray:
+    """Pixmap을 (H, W, C) uint8 NumPy 배열로 변환 (복사 없음)"""
+    return np.frombuffer(_PixmapBuffer(pix), dtype=np.uint8).reshape(
+        pix.height, pix.width, pix.n
+    )
+
+
+def render_page(page, config: RenderConfig) -> np.ndarray:
+    """열린 페이지를 크기에 맞는 배율로 렌더링"""
+    zoom = choose_zoom(page, config)
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+    return pixmap_to_array(pix)
+
+
+def _render_page_from_file(file_path: str, page_num: int, config: RenderConfig) -> np.ndarray:
+    """워커 프로세스용: 파일을 직접 열어 한 페이지 렌더링"""
+    with fitz.open(file_path) as doc:
+        return render_page(doc[page_num], config)
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    """렌더링 프로세스 풀 반환 (spawn: 스레드가 있는 서버 프로세스를 fork하지 않음)"""
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"PDF render pool started: workers={RENDER_WORKERS}")
+    return _render_pool
+
+
+def render_pages(
+    file_path: str,
+    page_nums: Sequence[int],
+    config: Optional[RenderConfig] = None
+) -> List[np.ndarray]:
+    """
+    여러 페이지를 병렬 렌더링 (결과는 page_nums 순서)
+    
+    Args:
+        file_path: PDF 파일 경로
+        page_nums: 렌더링할 페이지 번호 (0부터)
+        config: 렌더링 설정 (기본값: RenderConfig())
+    
+    Returns:
+        페이지별 (H, W, C) uint8 배열 리스트
+    """
+    config = config or RenderConfig()
+    
+    if len(page_nums) <= 1:
+        with fitz.open(file_path) as doc:
+            return [render_page(doc[page_num], config) for page_num in page_nums]
+    
+    pool = _get_render_pool()
+    return list(pool.map(
+        _render_page_from_file,
+        [file_path] * len(page_nums),
+        page_nums,
+        [config] * len(page_nums)
+    ))
+
+
+def shutdown_render_pool():
+    """렌더링 프로세스 풀 종료"""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=True)
+        _render_pool = None
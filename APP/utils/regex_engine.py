@@ -0,0 +1,39 @@
+"""
+정규식 엔진 유틸리티
+
+google-re2가 설치되어 있으면 RE2(선형 시간 DFA)로 컴파일하고,
+없거나 RE2가 지원하지 않는 문법(lookbehind 등)이면 표준 re로 대체합니다.
+"""
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = None
+
+
+def compile_pattern(pattern: str, flags: int = 0):
+    """
+    정규식 컴파일 (RE2 우선, 실패 시 re)
+    
+    Args:
+        pattern: 정규식 문자열
+        flags: re 플래그 (지정 시 표준 re 사용)
+        
+    Returns:
+        compiled pattern (search/match/finditer/findall/sub 지원)
+    """
+    if _re2 is not None and not flags:
+        try:
+            return _re2.compile(pattern)
+        except Exception:
+            logger.debug(f"RE2 미지원 패턴, re 사용: {pattern!r}")
+    return re.compile(pattern, flags)
+
+
+def is_re2_enabled() -> bool:
+    """RE2 사용 가능 여부"""
+    return _re2 is not None
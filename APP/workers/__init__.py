@@ -0,0 +1,8 @@
+"""
+Workers 패키지
+
+요청 처리와 분리된 백그라운드 작업 모듈
+
+모듈 구조:
+- rag_worker: RAG 인덱싱 작업 큐 / 워커
+"""
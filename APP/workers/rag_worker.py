@@ -0,0 +1,188 @@
+"""
+RAG 인덱싱 워커
+
+기능:
+- 분석 API는 인덱싱 작업을 큐에 넣고 바로 반환
+- 고정 개수의 워커가 큐를 소비하며 전용 스레드 풀에서 청킹/임베딩 실행
+- 동시 실행 수 = RAG_WORKER_CONCURRENCY (임베딩 API 동시 호출 한도)
+
+MockDB / RAG 저장소가 프로세스 메모리에 있으므로 워커도 같은 프로세스에서 실행
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from APP.config import settings
+from APP.db.mock_db import mock_db
+from APP.services.rag_service import get_rag_system
+from APP.services.chunker import SmartChunker, ChunkingConfig
+
+logger = logging.getLogger(__name__)
+
+# 청커 인스턴스
+_chunker = SmartChunker(ChunkingConfig(
+    chunk_size=800,
+    chunk_overlap=150,
+    preserve_tables=True
+))
+
+
+def index_document_for_rag(document_id: str, text: str, doc_type: str):
+    """
+    RAG 인덱싱 (동기, 워커 스레드에서 실행)
+    """
+    try:
+        logger.info(f"📚 RAG 인덱싱 시작: {document_id}")
+        
+        rag = get_rag_system()
+        
+        if rag.has_document(document_id):
+            logger.info(f"⏭️ 이미 인덱싱됨: {document_id}")
+            return
+        
+        chunks = _chunker.chunk_batch(text, document_id)
+        
+        # 이미 만든 청크를 그대로 넘겨 재청킹 방지 (텍스트는 넘기지 않음)
+        chunk_count = rag.add_document(
+            document_id,
+            chunks=chunks,
+            metadata={"document_type": doc_type}
+        )
+        
+        mock_db.update_document(
+            document_id,
+            {
+                "rag_indexed": True,
+                "chunk_count": chunk_count
+            }
+        )
+        
+        logger.info(f"✅ RAG 인덱싱 완료: {chunk_count}개 청크")
+        
+    except Exception as e:
+        logger.error(f"❌ RAG 인덱싱 실패: {e}")
+
+
+class RagIndexWorker:
+    """
+    RAG 인덱싱 작업 큐 + 워커 풀
+    
+    Usage:
+        worker = RagIndexWorker(concurrency=2)
+        await worker.start()
+        await worker.enqueue(document_id, text, doc_type)
+    """
+    
+    def __init__(self, concurrency: int = 2, max_queue_size: int = 1000):
+        self.concurrency = max(1, concurrency)
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running = False
+        
+        # 통계
+        self.total_processed = 0
+    
+    async def start(self):
+        """워커 시작"""
+        if self._running:
+            logger.warning("⚠️ RagIndexWorker가 이미 실행 중입니다")
+            return
+        
+        self._running = True
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="rag-index"
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker_loop())
+            for _ in range(self.concurrency)
+        ]
+        
+        logger.info(f"📚 RagIndexWorker 시작: 워커={self.concurrency}개")
+    
+    async def stop(self):
+        """워커 중지 (대기 중인 작업은 버림)"""
+        self._running = False
+        
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
+        logger.info("🛑 RagIndexWorker 중지됨")
+    
+    async def enqueue(self, document_id: str, text: str, doc_type: str):
+        """인덱싱 작업 등록 (큐가 가득 차면 빈 자리가 날 때까지 대기)"""
+        if not self._running:
+            raise RuntimeError("RagIndexWorker가 실행 중이 아닙니다")
+        
+        await self._queue.put((document_id, text, doc_type))
+        logger.debug(f"📥 인덱싱 작업 등록: {document_id} (대기 {self._queue.qsize()}개)")
+    
+    async def _worker_loop(self):
+        """큐 소비 루프"""
+        loop = asyncio.get_running_loop()
+        
+        while self._running:
+            job: Tuple[str, str, str] = await self._queue.get()
+            try:
+                await loop.run_in_executor(self._executor, index_document_for_rag, *job)
+                self.total_processed += 1
+            except Exception as e:
+                logger.error(f"❌ 인덱싱 작업 오류: {e}")
+            finally:
+                self._queue.task_done()
+    
+    def get_stats(self) -> dict:
+        """워커 통계 조회"""
+        return {
+            "concurrency": self.concurrency,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "total_processed": self.total_processed,
+            "running": self._running
+        }
+
+
+# ============================================
+# 전역 인스턴스
+# ============================================
+
+_worker_instance: Optional[RagIndexWorker] = None
+
+
+def get_rag_worker() -> RagIndexWorker:
+    """전역 RagIndexWorker 인스턴스 반환"""
+    global _worker_instance
+    if _worker_instance is None:
+        _worker_instance = RagIndexWorker(
+            concurrency=settings.RAG_WORKER_CONCURRENCY,
+            max_queue_size=settings.RAG_QUEUE_MAX_SIZE
+        )
+    return _worker_instance
+
+
+async def start_rag_worker():
+    """인덱싱 워커 시작 (편의 함수)"""
+    await get_rag_worker().start()
+
+
+async def stop_rag_worker():
+    """인덱싱 워커 중지"""
+    await get_rag_worker().stop()
+
+
+async def enqueue_index_job(document_id: str, text: str, doc_type: str):
+    """인덱싱 작업 등록 (편의 함수)"""
+    await get_rag_worker().enqueue(document_id, text, doc_type)
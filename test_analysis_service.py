@@ -0,0 +1,39 @@
+"""
+문서 분석 서비스 정규식 추출 테스트
+
+서버 없이 실행할 수 있습니다.
+
+실행 방법:
+    python test_analysis_service.py
+    (또는 pytest test_analysis_service.py)
+"""
+from APP.services.analysis_service import extract_action_items, extract_key_info
+
+
+def test_amounts_grouped_first():
+    """천 단위 구분 금액이 일반 금액보다 앞에 온다 (납부 금액은 amounts[0])"""
+    text = "수수료 500원, 합계 250,000원을 납부하시기 바랍니다."
+    
+    info = extract_key_info(text)
+    assert info["amounts"] == [250000, 500]
+    
+    actions = extract_action_items(text, info)
+    payment = next(a for a in actions if a["action"] == "납부 필요")
+    assert payment["amount"] == 250000
+
+
+def test_amounts_dedupe_and_minimum():
+    """중복 금액은 한 번만, 100원 미만은 제외"""
+    text = "1,000원 + 1000원 + 50원 + 1,000원"
+    
+    assert extract_key_info(text)["amounts"] == [1000]
+
+
+def main():
+    test_amounts_grouped_first()
+    test_amounts_dedupe_and_minimum()
+    print("✅ 모든 테스트 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+청커 라인 분류 테스트
+
+서버 없이 실행할 수 있습니다.
+
+실행 방법:
+    python test_chunker.py
+    (또는 pytest test_chunker.py)
+"""
+from APP.services.chunker import ChunkingConfig, SmartChunker
+
+
+# 【】 / [] / <> 제목 세 개로 나뉘는 문서
+_SAMPLE = (
+    "【제1장 총칙】\n"
+    + "이 규정은 민원 처리 절차를 정한다. " * 8
+    + "\n\n[제2장 신청]\n"
+    + "신청인은 서류를 제출하여야 한다. " * 8
+    + "\n\n<제3장 처리>\n"
+    + "담당자는 기한 내 처리한다. " * 8
+    + "\n"
+)
+
+
+def _chunk_types(text: str):
+    chunker = SmartChunker(ChunkingConfig())
+    return [chunk.chunk_type.value for chunk in chunker.chunk(text, "test")]
+
+
+def test_titles_detected_in_crlf_text():
+    """CRLF 텍스트도 LF 텍스트와 같이 제목/빈 줄을 인식한다"""
+    lf_types = _chunk_types(_SAMPLE)
+    crlf_types = _chunk_types(_SAMPLE.replace("\n", "\r\n"))
+    
+    assert lf_types == ["title", "title", "title"]
+    assert crlf_types == lf_types
+
+
+def main():
+    test_titles_detected_in_crlf_text()
+    print("✅ 모든 테스트 통과")
+
+
+if __name__ == "__main__":
+    main()
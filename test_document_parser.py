@@ -0,0 +1,103 @@
+"""
+DOCX 파서 테스트 (빠른 경로 ↔ python-docx 경로 비교)
+
+서버 없이 실행할 수 있습니다.
+
+실행 방법:
+    python test_document_parser.py
+    (또는 pytest test_document_parser.py)
+"""
+import os
+import tempfile
+import zipfile
+
+from APP.services.document_parser import DOCXParser
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+# 탭/줄바꿈, 텍스트 상자(mc:Choice + mc:Fallback), 하이퍼링크, 가로 병합 셀이 있는 본문
+_DOCUMENT = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+    ' xmlns:v="urn:schemas-microsoft-com:vml" mc:Ignorable="wps">'
+    '<w:body>'
+    '<w:p><w:r><w:t>Name</w:t><w:tab/><w:t>Value</w:t><w:br/><w:t>Line2</w:t></w:r></w:p>'
+    '<w:tbl><w:tblGrid><w:gridCol/><w:gridCol/></w:tblGrid>'
+    '<w:tr><w:tc><w:p><w:r><w:t>A1</w:t></w:r></w:p></w:tc>'
+    '<w:tc><w:p><w:r><w:t>B1</w:t></w:r></w:p></w:tc></w:tr>'
+    '<w:tr><w:tc><w:tcPr><w:gridSpan w:val="2"/></w:tcPr>'
+    '<w:p><w:r><w:t>merged</w:t></w:r></w:p></w:tc></w:tr>'
+    '</w:tbl>'
+    '<w:p><w:r><w:t xml:space="preserve">Before </w:t></w:r>'
+    '<w:r><mc:AlternateContent>'
+    '<mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>'
+    '<w:p><w:r><w:t>BOX</w:t></w:r></w:p>'
+    '</w:txbxContent></wps:txbx></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>BOX</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></w:pict></mc:Fallback>'
+    '</mc:AlternateContent></w:r>'
+    '<w:hyperlink><w:r><w:t>link</w:t></w:r></w:hyperlink></w:p>'
+    '</w:body></w:document>'
+)
+
+
+def _write_docx(path: str) -> None:
+    with zipfile.ZipFile(path, 'w') as z:
+        z.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        z.writestr('_rels/.rels', _RELS)
+        z.writestr('word/document.xml', _DOCUMENT)
+
+
+def test_docx_fast_path_text():
+    """탭/줄바꿈은 공백으로 남고, 텍스트 상자는 제외, 표 셀은 단락 뒤에 온다"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sample.docx")
+        _write_docx(path)
+        
+        result = DOCXParser()._parse_docx_fast(path)
+    
+    assert result["text"] == "Name Value Line2 Before link A1 B1 merged merged"
+    assert result["page_count"] == 2
+    assert result["has_tables"] is True
+
+
+def test_docx_fast_path_matches_python_docx():
+    """헤더/푸터가 없는 문서는 두 경로의 결과가 같다"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sample.docx")
+        _write_docx(path)
+        
+        parser = DOCXParser()
+        fast = parser._parse_docx_fast(path)
+        full = parser._parse_docx_full(path)
+    
+    for key in ("text", "page_count", "has_tables"):
+        assert fast[key] == full[key], key
+
+
+def main():
+    test_docx_fast_path_text()
+    test_docx_fast_path_matches_python_docx()
+    print("✅ 모든 테스트 통과")
+
+
+if __name__ == "__main__":
+    main()
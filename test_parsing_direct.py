@@ -1,128 +1,323 @@
 """
 문서 파싱 기능 직접 테스트
 APP/services/document_parser.py의 파싱 기능을 직접 호출하여 테스트
+
+사용법:
+    python test_parsing_direct.py                  # 파일 경로를 입력받아 하나만 테스트
+    python test_parsing_direct.py a.pdf "*.hwp"    # 여러 파일(glob 가능)을 한 번에 병렬 파싱
+    python test_parsing_direct.py --quiet --no-save "*.pdf"   # 파일별 보고서/저장 없이 요약표만
 """
 import asyncio
+import os
+import pydoc
 import sys
+import unicodedata
 from pathlib import Path
+from typing import List, Optional
+
+# 출력 구분선 (출력할 때마다 새로 만들지 않도록 한 번만 생성)
+_SEP = "=" * 70
+_DASH = "-" * 70
+
+# 파일을 찾지 못했을 때 안내할 현재 디렉토리 파일 확장자
+_LISTED_EXTENSIONS = frozenset(('.pdf', '.docx', '.hwp', '.jpg', '.png'))
+
+
+def _readahead(file_path: str):
+    """파일을 페이지 캐시에 미리 올려 둠 (파서 준비 중에 디스크 읽기를 겹치기 위함, 실패는 무시)"""
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        os.read(fd, 64 * 1024)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
-# 프로젝트 루트를 경로에 추가
-sys.path.insert(0, '.')
 
-from APP.services.document_parser import parse_document
+async def _parse_with_readahead(file_path: str, st: os.stat_result):
+    """readahead를 스레드에서 시작해 두고 파싱"""
+    # 파서(PDF/OCR 라이브러리)는 실제로 파싱할 때 처음 한 번만 import
+    # (--help, 파일 없음 등은 무거운 모듈 로딩 없이 바로 끝남)
+    from APP.services.document_parser import parse_document
+    
+    warm = asyncio.create_task(asyncio.to_thread(_readahead, file_path))
+    try:
+        return await parse_document(file_path, stat_result=st)
+    finally:
+        await warm
 
 
-async def test_parsing(file_path: str):
-    """파싱 테스트 메인 함수"""
-    print("\n" + "="*70)
-    print("📄 문서 파싱 테스트")
-    print("="*70)
+async def test_parsing(file_path: str, semaphore: Optional[asyncio.Semaphore] = None):
+    """
+    파일 하나 파싱 (결과 dict 반환, 실패 시 None)
     
-    if not Path(file_path).exists():
+    여러 파일을 gather로 함께 실행할 수 있도록 사용자 입력/결과 출력은 하지 않음 (print_report 참고)
+    """
+    # 존재 확인과 크기 조회를 stat 한 번으로 (파서에도 그대로 전달)
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
         print(f"\n❌ 파일을 찾을 수 없습니다: {file_path}")
         print("\n현재 디렉토리의 파일 목록:")
-        for ext in ['*.pdf', '*.docx', '*.hwp', '*.jpg', '*.png']:
-            for file in Path('.').glob(ext):
-                print(f"  📄 {file.name}")
+        # 확장자별 glob 대신 디렉토리를 한 번만 훑고, 이름순으로 정렬해 출력
+        with os.scandir('.') as entries:
+            names = [
+                entry.name for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in _LISTED_EXTENSIONS
+            ]
+        for name in sorted(names):
+            print(f"  📄 {name}")
         return None
     
     try:
-        print(f"\n🔍 파싱 시작: {file_path}")
-        print("⏳ 처리 중...")
-        
-        # 실제 파싱 실행
-        result = await parse_document(file_path)
-        
-        print("\n" + "="*70)
-        print("✅ 파싱 성공!")
-        print("="*70)
+        # 진행 상황은 stderr로 (stdout을 파일로 돌려도 보고서만 남음)
+        print(f"🔍 파싱 시작: {file_path}", file=sys.stderr)
         
-        # 결과 출력
-        print(f"\n📊 파일 정보:")
-        print(f"  • 파일명: {result['file_name']}")
-        print(f"  • 파일 타입: {result['file_type']}")
-        print(f"  • 파일 크기: {result['file_size']:,} bytes ({result['file_size']/1024:.1f} KB)")
+        # 실제 파싱 실행 (동시 파싱 수 제한)
+        if semaphore is None:
+            result = await _parse_with_readahead(file_path, st)
+        else:
+            async with semaphore:
+                result = await _parse_with_readahead(file_path, st)
         
-        print(f"\n📄 문서 정보:")
-        print(f"  • 페이지 수: {result['page_count']}")
-        print(f"  • 테이블 포함: {'예' if result['has_tables'] else '아니오'}")
-        print(f"  • 파싱 신뢰도: {result['confidence']*100:.1f}%")
-        print(f"  • 추출된 텍스트 길이: {len(result['text']):,} 자")
-        
-        # 텍스트 미리보기
-        preview_length = 500
-        print(f"\n📖 추출된 텍스트 미리보기 (처음 {preview_length}자):")
-        print("-" * 70)
-        print(result['text'][:preview_length])
-        if len(result['text']) > preview_length:
-            print("...")
-        print("-" * 70)
-        
-        # 전체 텍스트 확인 여부
-        print(f"\n💡 전체 텍스트를 확인하시겠습니까?")
-        user_input = input("전체 텍스트 보기 (y/n): ").lower()
-        
-        if user_input == 'y':
-            print("\n" + "="*70)
-            print("📄 전체 추출 텍스트")
-            print("="*70)
-            print(result['text'])
-            print("="*70)
-        
-        # 파일로 저장
-        output_file = f"parsed_{Path(file_path).stem}.txt"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("="*70 + "\n")
-            f.write(f"파싱 결과: {result['file_name']}\n")
-            f.write("="*70 + "\n\n")
-            f.write(f"파일 타입: {result['file_type']}\n")
-            f.write(f"페이지 수: {result['page_count']}\n")
-            f.write(f"신뢰도: {result['confidence']*100:.1f}%\n\n")
-            f.write("="*70 + "\n")
-            f.write("추출된 전체 텍스트\n")
-            f.write("="*70 + "\n\n")
-            f.write(result['text'])
-        
-        print(f"\n💾 전체 결과가 '{output_file}' 파일로 저장되었습니다.")
+        # 한글 자모 분리(NFD) 텍스트를 NFC로 한 번만 정규화 (미리보기/길이/저장 모두 같은 텍스트 사용)
+        # 이미 NFC면 검사만 하고 새 문자열을 만들지 않음. GOVBRIEF_NO_NFC=1이면 원문 그대로 (디버깅용)
+        text = result['text']
+        if not os.environ.get("GOVBRIEF_NO_NFC") and not unicodedata.is_normalized('NFC', text):
+            result['text'] = unicodedata.normalize('NFC', text)
         
         return result
         
     except Exception as e:
-        print(f"\n❌ 파싱 실패: {str(e)}")
+        print(f"\n❌ 파싱 실패 ({file_path}): {str(e)}")
         import traceback
         traceback.print_exc()
         return None
 
 
+def _write_report(output_file: str, result: dict):
+    """
+    파싱 결과를 텍스트 파일로 저장 (동기 - to_thread로 호출)
+    
+    임시 파일에 다 쓴 뒤 os.replace로 바꿔치기하므로 중간에 죽어도
+    반쯤 쓰인 보고서가 남지 않음 (fsync 없이 rename 한 번)
+    """
+    header = (
+        f"{_SEP}\n"
+        f"파싱 결과: {result['file_name']}\n"
+        f"{_SEP}\n\n"
+        f"파일 타입: {result['file_type']}\n"
+        f"페이지 수: {result['page_count']}\n"
+        f"신뢰도: {result['confidence']*100:.1f}%\n\n"
+        f"{_SEP}\n"
+        f"추출된 전체 텍스트\n"
+        f"{_SEP}\n\n"
+    )
+    # 헤더는 한 번에, 본문은 1M자씩 나눠 기록
+    # (큰 텍스트 전체를 한 번에 UTF-8로 인코딩한 임시 바이트열을 만들지 않음)
+    chunk = 1 << 20
+    text = result['text']
+    tmp_file = output_file + '.tmp'
+    try:
+        with open(tmp_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(header)
+            for start in range(0, len(text), chunk):
+                f.write(text[start:start + chunk])
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
+async def print_report(
+    file_path: str,
+    result: dict,
+    *,
+    verbose: bool = True,
+    save: bool = True,
+    interactive: Optional[bool] = None
+):
+    """
+    파싱 결과 출력 + 파일로 저장
+    
+    Args:
+        verbose: 보고서(파일 정보/미리보기) 출력 여부
+        save: parsed_*.txt 저장 여부
+        interactive: 전체 텍스트 보기 여부를 물을지 (기본: verbose이고 stdin이 터미널일 때)
+    """
+    if interactive is None:
+        interactive = verbose and sys.stdin.isatty()
+    
+    # 보고서에 쓰는 값은 한 번만 꺼내 둠
+    file_name, file_type, file_size, page_count, has_tables, confidence, text = (
+        result[key] for key in (
+            'file_name', 'file_type', 'file_size', 'page_count', 'has_tables', 'confidence', 'text'
+        )
+    )
+    text_len = len(text)
+    
+    if verbose:
+        # 보고서는 줄을 모아 한 번에 출력 (줄마다 write 시스템 콜이 나가지 않도록)
+        preview_length = 500
+        out = [
+            "\n" + _SEP,
+            f"✅ 파싱 성공: {file_path}",
+            _SEP,
+            "",
+            # 결과 출력
+            "📊 파일 정보:",
+            f"  • 파일명: {file_name}",
+            f"  • 파일 타입: {file_type}",
+            f"  • 파일 크기: {file_size:,} bytes ({file_size/1024:.1f} KB)",
+            "",
+            "📄 문서 정보:",
+            f"  • 페이지 수: {page_count}",
+            f"  • 테이블 포함: {'예' if has_tables else '아니오'}",
+            f"  • 파싱 신뢰도: {confidence*100:.1f}%",
+            f"  • 추출된 텍스트 길이: {text_len:,} 자",
+            "",
+            # 텍스트 미리보기 (짧으면 자르지 않고 그대로)
+            f"📖 추출된 텍스트 미리보기 (처음 {preview_length}자):",
+            _DASH,
+            text[:preview_length] if text_len > preview_length else text,
+        ]
+        if text_len > preview_length:
+            out.append("...")
+        out.append(_DASH)
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
+    
+    # 전체 텍스트 확인 여부 (여러 파일 / 비대화형 실행이면 묻지 않음)
+    user_input = 'n'
+    if interactive:
+        print(f"\n💡 전체 텍스트를 확인하시겠습니까?")
+        # 입력을 기다리는 동안에도 이벤트 루프는 다른 작업을 계속 처리
+        user_input = (await asyncio.to_thread(input, "전체 텍스트 보기 (y/n): ")).lower()
+    
+    if user_input == 'y' and sys.stdout.isatty():
+        # 터미널이면 페이저($PAGER 또는 less 등)로 넘겨 필요한 만큼만 스크롤
+        await asyncio.to_thread(pydoc.pager, text)
+    elif user_input == 'y':
+        print("\n" + _SEP)
+        print("📄 전체 추출 텍스트")
+        print(_SEP)
+        # 큰 텍스트는 64K자씩 나눠 출력 (거대한 임시 버퍼를 한 번에 만들지 않음)
+        for start in range(0, text_len, 1 << 16):
+            sys.stdout.write(text[start:start + (1 << 16)])
+        print()
+        print(_SEP)
+    
+    # 파일로 저장 (큰 텍스트 쓰기도 스레드에서)
+    if save:
+        output_file = f"parsed_{Path(file_path).stem}.txt"
+        await asyncio.to_thread(_write_report, output_file, result)
+        
+        if verbose:
+            print(f"\n💾 전체 결과가 '{output_file}' 파일로 저장되었습니다.")
+
+
+def _print_summary(file_paths: List[str], results: list):
+    """파일별 파싱 결과 요약표"""
+    lines = ["", f"{'파일':<40} {'페이지':>6} {'글자 수':>10} {'신뢰도':>7}", _DASH]
+    for path, result in zip(file_paths, results):
+        if isinstance(result, BaseException) or not result:
+            lines.append(f"{path:<40} {'실패':>6}")
+        else:
+            lines.append(
+                f"{path:<40} {result['page_count']:>6} "
+                f"{len(result['text']):>10,} {result['confidence']*100:>6.1f}%"
+            )
+    print("\n".join(lines))
+
+
+def _collect_paths(args: List[str]) -> List[str]:
+    """명령행 인자를 파일 경로 목록으로 (glob 패턴은 펼침)"""
+    paths = []
+    for arg in args:
+        if any(ch in arg for ch in "*?["):
+            paths.extend(str(p) for p in sorted(Path('.').glob(arg)))
+        else:
+            paths.append(arg)
+    return paths
+
+
 async def main():
     """메인 함수"""
-    print("\n" + "="*70)
+    print("\n" + _SEP)
     print("🚀 문서 파싱 시스템 테스트")
-    print("="*70)
+    print(_SEP)
     
-    # 테스트할 파일 입력
-    print("\n파싱할 파일 경로를 입력하세요:")
-    print("(예: test.pdf, 4. 마음 안심 클리닉.docx)")
+    args = sys.argv[1:]
+    verbose = '--quiet' not in args
+    save = '--no-save' not in args
+    file_paths = _collect_paths([arg for arg in args if arg not in ('--quiet', '--no-save')])
     
-    file_path = input("\n파일 경로: ").strip()
+    if not file_paths:
+        file_path = ""
+        if sys.stdin.isatty():
+            # 테스트할 파일 입력
+            print("\n파싱할 파일 경로를 입력하세요:")
+            print("(예: test.pdf, 4. 마음 안심 클리닉.docx)")
+            file_path = input("\n파일 경로: ").strip()
+        
+        if not file_path:
+            # 기본값
+            file_path = "test.pdf"
+            print(f"기본값 사용: {file_path}")
+        file_paths = [file_path]
+    
+    # 모든 파일을 한 이벤트 루프에서 함께 파싱 (I/O 대기 구간이 겹침)
+    print(f"\n⏳ {len(file_paths)}개 파일 처리 중...")
+    semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+    results = await asyncio.gather(
+        *(test_parsing(path, semaphore) for path in file_paths),
+        return_exceptions=True
+    )
     
-    if not file_path:
-        # 기본값
-        file_path = "test.pdf"
-        print(f"기본값 사용: {file_path}")
+    failed = 0
+    for path, result in zip(file_paths, results):
+        if isinstance(result, BaseException) or not result:
+            failed += 1
+            continue
+        await print_report(
+            path, result,
+            verbose=verbose,
+            save=save,
+            interactive=None if len(file_paths) == 1 else False
+        )
     
-    result = await test_parsing(file_path)
+    if len(file_paths) > 1 or not verbose:
+        _print_summary(file_paths, results)
     
-    if result:
-        print("\n" + "="*70)
-        print("✅ 테스트 완료!")
-        print("="*70)
+    if not failed:
+        print("\n" + _SEP)
+        print(f"✅ 테스트 완료! ({len(file_paths)}개)")
+        print(_SEP)
     else:
-        print("\n" + "="*70)
-        print("❌ 테스트 실패")
-        print("="*70)
+        print("\n" + _SEP)
+        print(f"❌ 테스트 실패: {failed}/{len(file_paths)}개")
+        print(_SEP)
 
 
 if __name__ == "__main__":
-    # asyncio로 실행
-    asyncio.run(main())
+    # 프로젝트 루트를 경로에 추가 (스크립트로 실행할 때만)
+    sys.path.insert(0, '.')
+    
+    # asyncio로 실행 (uvloop이 있으면 libuv 기반 루프 사용 - uvicorn[standard]에 포함)
+    try:
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+    
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())